@@ -3,9 +3,20 @@
 This package provides tools and utilities for interacting with the Steadysun API,
 which facilitates operations such as retrieving forecasts and managing photovoltaic systems.
 The package consists of the following submodules:
+- `archive`: Archives long forecast histories compactly (quantized, delta-encoded and compressed).
+- `dask_forecast`: Fetches the forecasts of large fleets as a lazy, partitioned Dask DataFrame, on a cluster.
+- `fleet`: Represents large fleets of PV systems compactly, with vectorized filters.
 - `forecast`: Fetches forecast data for specific systems.
+- `forecast_cache`: Caches forecasts in memory field by field, serving field subsets.
+- `forecast_store`: Stores historical forecasts on disk, with fast time range queries.
+- `prefetch`: Keeps the forecasts of a set of sites warm in memory, refreshed in the background.
+- `pvmodel`: Computes the power of PV systems locally, vectorized over time steps and systems.
 - `pvsystem`: Handles the creation, updating, and deletion of PV systems via the API.
+- `shared_forecast`: Shares forecast data between processes through shared memory.
+- `snapshot`: Saves PV systems and cached forecasts to binary snapshot files, for warm starts.
 - `steadysun_api`: Provides low-level utilities for making authenticated API requests.
+- `sweep`: Evaluates many variants of a PV system configuration locally, for sizing studies.
+- `validation`: Validates PV system configurations in bulk, and provisions the valid ones.
 
 Attributes:
     __version__ (str): The current version of the steadysun package
@@ -13,11 +24,41 @@ Attributes:
 
 from importlib.metadata import PackageNotFoundError, version
 
-from . import forecast, pvsystem, steadysun_api
+from . import (
+    archive,
+    dask_forecast,
+    fleet,
+    forecast,
+    forecast_cache,
+    forecast_store,
+    prefetch,
+    pvmodel,
+    pvsystem,
+    shared_forecast,
+    snapshot,
+    steadysun_api,
+    sweep,
+    validation,
+)
 
 try:
     __version__ = version("steadysun")
 except PackageNotFoundError:
     __version__ = "unknown version"
 
-__all__ = ["forecast", "pvsystem", "steadysun_api"]
+__all__ = [
+    "archive",
+    "dask_forecast",
+    "fleet",
+    "forecast",
+    "forecast_cache",
+    "forecast_store",
+    "prefetch",
+    "pvmodel",
+    "pvsystem",
+    "shared_forecast",
+    "snapshot",
+    "steadysun_api",
+    "sweep",
+    "validation",
+]
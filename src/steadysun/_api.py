@@ -46,6 +46,22 @@ class APIResponseHandler:
         except requests.exceptions.HTTPError as http_err:
             self._handle_error(http_err)
 
+    def handle_raw(self) -> requests.Response:
+        """Check the response status, raise errors for non-success status codes, but leave the body unparsed.
+
+        Returns:
+            requests.Response: The API response (or raise if an error occurred).
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status code indicates an error.
+        """
+        try:
+            self.response.raise_for_status()
+        except requests.exceptions.HTTPError as http_err:
+            self._handle_error(http_err)
+        logger.info(f"Request succeeded with status {self.status_code} ({self.response.headers.get('Content-Type')}).")
+        return self.response
+
     def _handle_success(self) -> dict:
         """Handle successful responses (2xx status codes).
 
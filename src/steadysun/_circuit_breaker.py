@@ -0,0 +1,138 @@
+"""Circuit breaker module. Used to fail fast instead of waiting for timeouts while the API is unhealthy."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+import requests
+
+from ._deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+UNHEALTHY_STATUS_CODES = {500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+
+def is_unhealthy_error(error: BaseException) -> bool:
+    """Check if an error means that the API is unhealthy (5xx, connection errors or timeouts).
+
+    Args:
+        error (BaseException): The error raised by an API call.
+
+    Returns:
+        bool: True if the API is unhealthy.
+    """
+    if isinstance(error, (CircuitOpenError, DeadlineExceeded)):
+        return False
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in UNHEALTHY_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class CircuitBreaker:
+    """Stops calling the API after consecutive failures, and probes it again after a recovery timeout.
+
+    - closed: calls are made, `failure_threshold` consecutive failures open the circuit.
+    - open: calls fail immediately with `CircuitOpenError`, until `recovery_timeout` is elapsed.
+    - half_open: one probe call is made, its success closes the circuit and its failure opens it again.
+
+    Attributes:
+        failure_threshold (int): Number of consecutive failures opening the circuit.
+        recovery_timeout (float): Time (in seconds) before probing the API again once the circuit is open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """Initializes a closed circuit breaker.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures opening the circuit (default is 5).
+            recovery_timeout (float): Time (in seconds) before probing the API again once the circuit is open
+                (default is 30 seconds).
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """The current state of the circuit ("closed", "open" or "half_open")."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def _before_call(self) -> bool:
+        """Check if a call can be made, raise CircuitOpenError otherwise.
+
+        Returns:
+            bool: Whether the call is the probe of a half-open circuit.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return False
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            raise CircuitOpenError("The Steadysun API seems unavailable, the call was not made (circuit open).")
+
+    def _after_call(self, failed: bool, probe: bool):
+        """Update the state of the circuit with the outcome of a call.
+
+        Only the probe moves the circuit out of half-open: the calls started before the circuit opened only count
+        while it is closed.
+        """
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+            elif self._state != self.CLOSED:
+                return
+            if not failed:
+                if self._state != self.CLOSED:
+                    logger.info("The Steadysun API is available again (circuit closed).")
+                self._state = self.CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if probe or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"The Steadysun API seems unavailable, failing fast for {self.recovery_timeout}s.")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Make a call through the circuit breaker.
+
+        Args:
+            function (Callable[..., Any]): The function making the API call.
+            *args (Any): The positional arguments of the function.
+            **kwargs (Any): The keyword arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        probe = self._before_call()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            self._after_call(failed=is_unhealthy_error(error), probe=probe)
+            raise
+        self._after_call(failed=False, probe=probe)
+        return result
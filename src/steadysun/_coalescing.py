@@ -0,0 +1,100 @@
+"""Request coalescing module. Used to share one in-flight API call between identical concurrent calls."""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def normalize_params(params: Optional[dict]) -> Tuple[Tuple[str, Any], ...]:
+    """Convert request parameters to a hashable and order-independent key.
+
+    None values are dropped (as `requests` does when encoding the URL) and lists are converted to tuples.
+
+    Args:
+        params (Optional[dict]): The request URL parameters.
+
+    Returns:
+        Tuple[Tuple[str, Any], ...]: The sorted (name, value) pairs.
+    """
+    if not params:
+        return ()
+    return tuple(
+        sorted(
+            (str(name), tuple(value) if isinstance(value, (list, tuple)) else value)
+            for name, value in params.items()
+            if value is not None
+        )
+    )
+
+
+class _InFlightCall:
+    """A call currently executed by a leader thread, waited for by follower threads."""
+
+    def __init__(self):
+        """Initializes an unfinished call."""
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.n_followers = 0
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a JSON container result (dict or list), so that each caller can modify its own copy."""
+    return copy.deepcopy(result) if isinstance(result, (dict, list)) else result
+
+
+class SingleFlight:
+    """Executes only one call at a time per key, concurrent callers with the same key share its result.
+
+    When a call is shared, every caller (the leader included) receives its own deep copy of dict and list results,
+    so a caller can modify its result without affecting the others. Other results are shared as is.
+    """
+
+    def __init__(self):
+        """Initializes an empty registry of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+
+    def do(self, key: Hashable, function: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Execute the function, or wait for the in-flight call with the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            function (Callable[[], Any]): The call to execute.
+            timeout (Optional[float], optional): Maximal time to wait for an in-flight call (default is no limit).
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            TimeoutError: If the in-flight call is not finished before the timeout.
+            Exception: Any exception raised by the call (re-raised in every waiting thread).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _InFlightCall()
+            else:
+                call.n_followers += 1
+
+        if is_leader:
+            try:
+                call.result = function()
+            except BaseException as error:
+                call.error = error
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    # No follower can join the call anymore
+                    is_shared = call.n_followers > 0
+                call.done.set()
+            # The followers copy the result after the release: the leader must not return the shared result
+            return _copy_result(call.result) if is_shared else call.result
+
+        if not call.done.wait(timeout):
+            raise TimeoutError("The identical in-flight call did not finish in time.")
+        if call.error is not None:
+            raise call.error
+        return _copy_result(call.result)
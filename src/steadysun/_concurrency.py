@@ -0,0 +1,161 @@
+"""Adaptive concurrency module. Used to self-tune the number of concurrent API calls to what the API can handle."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import requests
+
+from ._deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Check if an error means that the API is overloaded (429, 5xx, connection errors or timeouts).
+
+    Args:
+        error (BaseException): The error raised by an API call.
+
+    Returns:
+        bool: True if the API is overloaded.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in OVERLOAD_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of concurrent API calls with an AIMD (additive increase, multiplicative decrease) algorithm.
+
+    The limit grows by one every `limit` successful calls while the latency stays close to the lowest latency
+    observed, slowly decreases when the latency rises, and is cut by `backoff_ratio` on 429/5xx responses,
+    connection errors and timeouts. Calls started before a decrease can't trigger another one.
+
+    Attributes:
+        min_limit (int): The minimal number of concurrent calls.
+        max_limit (int): The maximal number of concurrent calls.
+        latency_tolerance (float): Ratio to the lowest latency above which the latency is considered as rising.
+        backoff_ratio (float): Ratio applied to the limit when the API is overloaded.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+    ):
+        """Initializes the limiter.
+
+        Args:
+            initial_limit (int): The initial number of concurrent calls (default is 4).
+            min_limit (int): The minimal number of concurrent calls (default is 1).
+            max_limit (int): The maximal number of concurrent calls (default is 64).
+            latency_tolerance (float): Ratio to the lowest latency above which the latency is considered as rising
+                (default is 2).
+            backoff_ratio (float): Ratio applied to the limit when the API is overloaded (default is 0.5).
+
+        Raises:
+            ValueError: If the limits are not consistent.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("The limits must verify: 1 <= min_limit <= initial_limit <= max_limit.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._epoch = 0
+        self._min_latency = None
+        self._smoothed_latency = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current maximal number of concurrent calls."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """The current number of concurrent calls."""
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """Wait until a call can be made.
+
+        Returns:
+            int: A token to give back to `release`.
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, token: int, latency: Optional[float] = None, overloaded: bool = False):
+        """Report the end of a call and adapt the limit.
+
+        Args:
+            token (int): The token returned by `acquire`.
+            latency (Optional[float], optional): The duration of a successful call in seconds
+                (None to not adapt the limit).
+            overloaded (bool, optional): Whether the call failed because the API is overloaded.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease(token, self.backoff_ratio)
+            elif latency is not None:
+                self._on_success(token, latency)
+            self._condition.notify_all()
+
+    def _on_success(self, token: int, latency: float):
+        """Adapt the limit after a successful call (the condition lock must be held)."""
+        # The lowest latency slowly drifts up, to follow a lasting change of the API latency
+        self._min_latency = latency if self._min_latency is None else min(latency, self._min_latency * 1.01)
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        self._smoothed_latency = 0.8 * self._smoothed_latency + 0.2 * latency
+        if self._smoothed_latency <= self._min_latency * self.latency_tolerance:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        else:
+            self._decrease(token, 0.9)
+
+    def _decrease(self, token: int, ratio: float):
+        """Decrease the limit, once for all the calls started before the previous decrease (lock must be held)."""
+        if token != self._epoch:
+            return
+        limit = max(self.min_limit, self._limit * ratio)
+        if int(limit) != self.limit:
+            logger.info(f"Concurrency limit decreased from {self.limit} to {int(limit)}")
+        self._limit = limit
+        self._epoch += 1
+
+    def call(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Make a call within the concurrency limit and use its outcome to adapt the limit.
+
+        Args:
+            function (Callable[..., Any]): The function making the API call.
+            *args (Any): The positional arguments of the function.
+            **kwargs (Any): The keyword arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        token = self.acquire()
+        start = time.monotonic()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            self.release(token, overloaded=is_overload_error(error))
+            raise
+        self.release(token, latency=time.monotonic() - start)
+        return result
@@ -0,0 +1,70 @@
+"""Deadline module. Used to bound the total duration of operations made of several API calls."""
+
+import time
+from typing import Optional, Tuple, Union
+
+import requests
+
+Timeout = Optional[Union[float, Tuple[Optional[float], Optional[float]]]]
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when an operation is not finished before its deadline."""
+
+
+class Deadline:
+    """A point in time before which an operation (possibly made of several API calls) must be finished.
+
+    Attributes:
+        expires_at (float): The `time.monotonic()` value of the deadline.
+    """
+
+    def __init__(self, seconds: float):
+        """Initializes a deadline expiring in the given number of seconds.
+
+        Args:
+            seconds (float): The time budget of the operation, in seconds.
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_value(cls, deadline: Optional[Union[float, "Deadline"]]) -> Optional["Deadline"]:
+        """Get a deadline from a time budget in seconds, or an existing deadline.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): The time budget in seconds, a deadline, or None.
+
+        Returns:
+            Optional[Deadline]: The deadline (None if no deadline was given).
+        """
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        """The remaining time before the deadline, in seconds (0 if expired)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline is passed."""
+        return self.remaining() <= 0
+
+    def cap(self, timeout: Timeout) -> Timeout:
+        """Cap a request timeout (single value or (connect, read) tuple) to the remaining time.
+
+        Args:
+            timeout (Timeout): The request timeout.
+
+        Returns:
+            Timeout: The capped timeout.
+
+        Raises:
+            DeadlineExceeded: If the deadline is passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("The deadline of the operation is exceeded, the API call was not made.")
+        if isinstance(timeout, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
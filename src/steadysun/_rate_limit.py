@@ -0,0 +1,86 @@
+"""Rate limiting module. Used to keep the API calls of a client within its request quota."""
+
+import threading
+import time
+from typing import Optional
+
+from ._deadline import DeadlineExceeded
+
+
+class TokenBucket:
+    """A thread-safe token bucket: `rate` calls per second on average, with bursts of up to `capacity` calls.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximal number of tokens in the bucket.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initializes a full bucket.
+
+        Args:
+            rate (float): The number of calls allowed per second.
+            capacity (Optional[float]): The maximal burst of calls (default is `rate`, and at least 1).
+
+        Raises:
+            ValueError: If the rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"The rate must be positive (got {rate}).")
+        self.rate = rate
+        self.capacity = max(1.0, rate if capacity is None else capacity)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self):
+        """Add the tokens earned since the last update (the lock must be held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1, reserve: float = 0) -> float:
+        """Take tokens if they are available.
+
+        Args:
+            tokens (float): The number of tokens to take (default is 1).
+            reserve (float): The number of tokens that must remain in the bucket after taking them, kept for other
+                calls (default is 0, capped so that a full bucket always allows the call).
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the time to wait (in seconds) before they are available.
+        """
+        with self._lock:
+            self._refill()
+            needed = tokens + max(0.0, min(reserve, self.capacity - tokens))
+            if self._tokens >= needed:
+                self._tokens -= tokens
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None, reserve: float = 0):
+        """Wait until tokens are available and take them.
+
+        Args:
+            tokens (float): The number of tokens to take (default is 1).
+            timeout (Optional[float]): Maximal time to wait in seconds (default is no limit).
+            reserve (float): The number of tokens that must remain in the bucket (see `try_acquire`).
+
+        Raises:
+            DeadlineExceeded: If the tokens are not available before the timeout.
+        """
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens, reserve)
+            if wait == 0:
+                return
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                raise DeadlineExceeded("The request quota of the client is exhausted until the deadline.")
+            time.sleep(wait)
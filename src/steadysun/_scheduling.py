@@ -0,0 +1,126 @@
+"""Priority scheduling module. Used to keep interactive API calls fast while batch work is running."""
+
+import threading
+import time
+from typing import Dict, Literal, Optional
+
+from ._deadline import DeadlineExceeded
+
+Priority = Literal["interactive", "batch"]
+
+INTERACTIVE: Priority = "interactive"
+BATCH: Priority = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class PriorityScheduler:
+    """Dispatches the API calls of a client in two lanes: interactive (high priority) and batch (low priority).
+
+    At most `max_concurrency` calls are in flight. The batch calls can't use the `reserved_concurrency` last slots,
+    kept for the interactive calls, and a queued batch call only starts if no interactive call is waiting: an
+    interactive call never waits behind queued batch calls (the batch calls in flight are not interrupted). If the
+    client has a rate limit, the batch calls leave `reserved_rate_share` of its burst capacity to the interactive
+    calls.
+
+    Attributes:
+        max_concurrency (int): The maximal number of concurrent calls.
+        reserved_concurrency (int): The number of concurrent calls reserved for the interactive calls.
+        reserved_rate_share (float): The share of the rate limit burst capacity reserved for the interactive calls.
+    """
+
+    def __init__(self, max_concurrency: int = 16, reserved_concurrency: int = 4, reserved_rate_share: float = 0.25):
+        """Initializes the scheduler.
+
+        Args:
+            max_concurrency (int): The maximal number of concurrent calls (default is 16).
+            reserved_concurrency (int): The number of concurrent calls reserved for the interactive calls
+                (default is 4).
+            reserved_rate_share (float): The share of the rate limit burst capacity reserved for the interactive
+                calls (default is 0.25).
+
+        Raises:
+            ValueError: If the limits are not consistent.
+        """
+        if not 0 <= reserved_concurrency < max_concurrency:
+            raise ValueError("The limits must verify: 0 <= reserved_concurrency < max_concurrency.")
+        if not 0 <= reserved_rate_share < 1:
+            raise ValueError(f"The reserved rate share must be in [0, 1) (got {reserved_rate_share}).")
+        self.max_concurrency = max_concurrency
+        self.reserved_concurrency = reserved_concurrency
+        self.reserved_rate_share = reserved_rate_share
+        self._in_flight = dict.fromkeys(PRIORITIES, 0)
+        self._waiting = dict.fromkeys(PRIORITIES, 0)
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> Dict[str, int]:
+        """The current number of calls in flight, by priority."""
+        with self._condition:
+            return dict(self._in_flight)
+
+    @property
+    def waiting(self) -> Dict[str, int]:
+        """The current number of queued calls, by priority."""
+        with self._condition:
+            return dict(self._waiting)
+
+    def _can_start(self, priority: Priority) -> bool:
+        """Check if a call can start now (the lock must be held)."""
+        if sum(self._in_flight.values()) >= self.max_concurrency:
+            return False
+        if priority == INTERACTIVE:
+            return True
+        return (
+            self._waiting[INTERACTIVE] == 0
+            and self._in_flight[BATCH] < self.max_concurrency - self.reserved_concurrency
+        )
+
+    def acquire(self, priority: Priority, timeout: Optional[float] = None):
+        """Wait until a call of this priority can start.
+
+        Args:
+            priority (Priority): The priority of the call ("interactive" or "batch").
+            timeout (Optional[float]): Maximal time to wait in seconds (default is no limit).
+
+        Raises:
+            ValueError: If the priority is unknown.
+            DeadlineExceeded: If the call can't start before the timeout.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (expected one of {list(PRIORITIES)}).")
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while not self._can_start(priority):
+                    remaining = None if give_up_at is None else give_up_at - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise DeadlineExceeded(f"No {priority} slot of the client is available until the deadline.")
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting[priority] -= 1
+                # Queued batch calls may be waiting for the interactive queue to be empty
+                self._condition.notify_all()
+            self._in_flight[priority] += 1
+
+    def release(self, priority: Priority):
+        """Report the end of a call.
+
+        Args:
+            priority (Priority): The priority given to `acquire`.
+        """
+        with self._condition:
+            self._in_flight[priority] -= 1
+            self._condition.notify_all()
+
+    def rate_reserve(self, priority: Priority, capacity: float) -> float:
+        """Get the number of rate limit tokens a call of this priority must leave in the bucket.
+
+        Args:
+            priority (Priority): The priority of the call.
+            capacity (float): The burst capacity of the rate limit.
+
+        Returns:
+            float: The tokens reserved for the interactive calls (0 for interactive calls).
+        """
+        return 0.0 if priority == INTERACTIVE else self.reserved_rate_share * capacity
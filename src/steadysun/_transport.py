@@ -0,0 +1,211 @@
+"""HTTP transports of the API clients.
+
+A transport sends the HTTP requests of a `SteadysunAPI` client and returns `requests.Response` objects, raising
+`requests` exceptions, so that the response handling (`APIResponseHandler`), the circuit breaker and the retries
+are identical whatever the transport.
+
+- `RequestsTransport` (the default) uses a `requests.Session`: HTTP/1.1, one request in flight per connection.
+- `HTTPXTransport` uses an `httpx.Client` with HTTP/2, multiplexing concurrent requests over a few connections.
+  It needs the optional `http2` dependencies (`pip install steadysun[http2]`).
+"""
+
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ._deadline import Timeout
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class Transport(ABC):
+    """Base class of the HTTP transports."""
+
+    name = "base"
+
+    # pylint: disable=too-many-arguments
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict],
+        json: Optional[Any],
+        headers: dict,
+        timeout: Timeout,
+    ) -> requests.Response:
+        """Send an HTTP request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            params (Optional[dict]): URL parameters (None values are dropped).
+            json (Optional[Any]): JSON payload.
+            headers (dict): Headers of the request.
+            timeout (Timeout): Timeout in seconds, or (connect, read) timeouts.
+
+        Returns:
+            requests.Response: The response, whatever its status code.
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed (connection error, timeout, ...).
+        """
+
+    @abstractmethod
+    def reset(self):
+        """Use new connections, without closing the current ones (e.g. in a forked process)."""
+
+    @abstractmethod
+    def close(self):
+        """Close the connections of the transport."""
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 transport based on a `requests.Session` (connection pool).
+
+    Attributes:
+        session (requests.Session): The HTTP session, reusing its connections.
+    """
+
+    name = "requests"
+
+    def __init__(self):
+        """Initializes the transport with a new session."""
+        self.session = requests.Session()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict],
+        json: Optional[Any],
+        headers: dict,
+        timeout: Timeout,
+    ) -> requests.Response:
+        """Send an HTTP request with the session (see `Transport.request`)."""
+        return self.session.request(method=method, url=url, params=params, json=json, headers=headers, timeout=timeout)
+
+    def reset(self):
+        """Use a new session, without closing the current one."""
+        self.session = requests.Session()
+
+    def close(self):
+        """Close the session."""
+        self.session.close()
+
+
+class HTTPXTransport(Transport):
+    """HTTP/2 transport based on an `httpx.Client`, multiplexing concurrent requests over a few connections.
+
+    Attributes:
+        client (httpx.Client): The HTTP client.
+    """
+
+    name = "http2"
+
+    def __init__(self, max_connections: int = 10, **client_kwargs: Any):
+        """Initializes the transport with a new HTTP/2 client.
+
+        Args:
+            max_connections (int): The maximal number of connections (default is 10). Each connection carries
+                many concurrent requests.
+            **client_kwargs (Any): Any other parameter of `httpx.Client` (e.g. `verify`, `proxy`).
+
+        Raises:
+            ImportError: If httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("The HTTP/2 transport needs httpx and h2: pip install steadysun[http2]")
+        self._client_kwargs = {"http2": True, "limits": httpx.Limits(max_connections=max_connections), **client_kwargs}
+        self.client = httpx.Client(**self._client_kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict],
+        json: Optional[Any],
+        headers: dict,
+        timeout: Timeout,
+    ) -> requests.Response:
+        """Send an HTTP request with the client (see `Transport.request`)."""
+        params = None if params is None else {key: value for key, value in params.items() if value is not None}
+        try:
+            response = self.client.request(
+                method, url, params=params, json=json, headers=headers, timeout=_to_httpx_timeout(timeout)
+            )
+        except httpx.HTTPError as error:
+            raise _to_requests_exception(error) from error
+        return _to_requests_response(response)
+
+    def reset(self):
+        """Use a new client, without closing the current one."""
+        self.client = httpx.Client(**self._client_kwargs)
+
+    def close(self):
+        """Close the client."""
+        self.client.close()
+
+
+def _to_httpx_timeout(timeout: Timeout) -> "httpx.Timeout":
+    """Convert a requests timeout (seconds, or (connect, read) tuple) to an httpx timeout."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _to_requests_response(response: "httpx.Response") -> requests.Response:
+    """Convert an httpx response (read) to a requests response."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.headers = CaseInsensitiveDict(response.headers.items())
+    converted._content = response.content  # pylint: disable=protected-access
+    converted.encoding = response.encoding
+    converted.reason = response.reason_phrase
+    converted.url = str(response.url)
+    try:
+        converted.elapsed = response.elapsed
+    except RuntimeError:  # only set once the response is closed (not by all the httpx transports)
+        converted.elapsed = timedelta(0)
+    return converted
+
+
+def _to_requests_exception(error: "httpx.HTTPError") -> requests.exceptions.RequestException:
+    """Convert an httpx exception to the equivalent requests exception."""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(str(error))
+    if isinstance(error, httpx.TransportError):
+        return requests.exceptions.ConnectionError(str(error))
+    return requests.exceptions.RequestException(str(error))
+
+
+def create_transport(transport: Union[None, str, Transport] = None) -> Transport:
+    """Create the transport of a client.
+
+    Args:
+        transport (Union[None, str, Transport]): A transport, or the name of a transport ("requests" or "http2").
+            Default is "requests".
+
+    Returns:
+        Transport: The transport.
+
+    Raises:
+        ValueError: If the transport name is unknown.
+        ImportError: If the dependencies of the transport are not installed.
+    """
+    if isinstance(transport, Transport):
+        return transport
+    if transport in (None, RequestsTransport.name):
+        return RequestsTransport()
+    if transport == HTTPXTransport.name:
+        return HTTPXTransport()
+    raise ValueError(f"Unknown transport '{transport}' (expected 'requests', 'http2' or a Transport).")
@@ -0,0 +1,343 @@
+"""This module provides a compact archive format for long forecast histories.
+
+Forecasts fetched with a given `precision` have at most `precision` decimal places, so the archive stores them as
+fixed-point integers (value * 10**precision) without loss. Each forecast (a frame) is delta-encoded against the
+previous forecast of the same site, aligned on target time: consecutive runs mostly agree, so the deltas are small.
+The integers of each column are stored in the smallest of int16/int32/int64 fitting that column (the dtype of
+each column is in the frame metadata), and the frame is compressed with zlib. Every `keyframe_interval` frames, a
+keyframe is stored without deltas, to bound the number of frames decoded to read a given issue time.
+
+Each site has one append-only archive file, a sequence of frames made of an uncompressed header (magic, issue time,
+payload length and flags) followed by the compressed payload (JSON metadata, target times and values).
+
+Classes:
+    ForecastArchive: An append-only, quantized and delta-encoded forecast archive.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Literal, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .forecast import _to_datetime_index
+from .forecast_store import TimeLike, _check_name, _time_to_nanoseconds, _to_nanoseconds
+
+ARCHIVE_FILE_SUFFIX = ".fca"
+
+_MAGIC = b"FCA1"
+_FRAME_HEADER = struct.Struct("<4sqIB")
+_META_LENGTH = struct.Struct("<I")
+_KEYFRAME_FLAG = 1
+_INTEGER_DTYPES = [np.dtype("<i2"), np.dtype("<i4"), np.dtype("<i8")]
+_TIME_DTYPE = np.dtype("<i8")
+
+
+class _FrameLocation(NamedTuple):
+    """The position of a frame in an archive file."""
+
+    issue: int
+    offset: int
+    length: int
+    keyframe: bool
+
+
+class _Frame(NamedTuple):
+    """A decoded frame: fixed-point values by field (rows are target times), with their missing values."""
+
+    issue: int
+    targets: np.ndarray
+    fields: List[str]
+    precision: int
+    values: np.ndarray  # int64, shape (n_fields, n_rows)
+    missing: np.ndarray  # bool, shape (n_fields, n_rows)
+
+
+def _aligned_previous(frame: _Frame, previous: Optional[_Frame]) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the previous fixed-point values at the target times of a frame, and where they are available."""
+    shape = (len(frame.fields), len(frame.targets))
+    values = np.zeros(shape, dtype=np.int64)
+    available = np.zeros(shape, dtype=bool)
+    if previous is None or previous.precision != frame.precision or not len(previous.targets):
+        return values, available
+    positions = np.searchsorted(previous.targets, frame.targets).clip(max=len(previous.targets) - 1)
+    matched = previous.targets[positions] == frame.targets
+    previous_fields = {field: index for index, field in enumerate(previous.fields)}
+    for index, field in enumerate(frame.fields):
+        if field in previous_fields:
+            values[index] = previous.values[previous_fields[field], positions]
+            available[index] = matched & ~previous.missing[previous_fields[field], positions]
+    return values, available
+
+
+def _encode_frame(frame: _Frame, previous: Optional[_Frame]) -> bytes:
+    """Encode a frame (delta-encoded against the previous one if given) to a compressed payload."""
+    previous_values, available = _aligned_previous(frame, previous)
+    use_delta = available & ~frame.missing
+    stored = np.where(use_delta, frame.values - previous_values, frame.values)
+    max_abs = np.abs(np.where(frame.missing, 0, stored)).max(axis=1, initial=0)
+    dtypes = [next(dtype for dtype in _INTEGER_DTYPES if column_max < np.iinfo(dtype).max) for column_max in max_abs]
+    columns = [
+        np.where(column_missing, np.iinfo(dtype).min, column).astype(dtype).tobytes()
+        for column, column_missing, dtype in zip(stored, frame.missing, dtypes)
+    ]
+
+    meta = json.dumps(
+        {
+            "fields": frame.fields,
+            "precision": frame.precision,
+            "dtypes": [dtype.str for dtype in dtypes],
+            "n_rows": len(frame.targets),
+        }
+    ).encode()
+    target_deltas = np.diff(frame.targets, prepend=np.int64(0)).astype(_TIME_DTYPE)
+    payload = b"".join([_META_LENGTH.pack(len(meta)), meta, target_deltas.tobytes(), *columns])
+    return zlib.compress(payload, 6)
+
+
+def _decode_frame(issue: int, payload: bytes, previous: Optional[_Frame]) -> _Frame:
+    """Decode a compressed payload (delta-encoded against the previous frame if given)."""
+    payload = zlib.decompress(payload)
+    (meta_length,) = _META_LENGTH.unpack_from(payload)
+    meta_start = _META_LENGTH.size
+    offset = meta_start + meta_length
+    meta = json.loads(payload[meta_start:offset])
+    n_rows, n_fields = meta["n_rows"], len(meta["fields"])
+    # The first archives stored all the columns of a frame with one dtype
+    dtypes = [np.dtype(dtype) for dtype in meta["dtypes"]] if "dtypes" in meta else [np.dtype(meta["dtype"])] * n_fields
+    targets = np.cumsum(np.frombuffer(payload, dtype=_TIME_DTYPE, count=n_rows, offset=offset))
+    offset += n_rows * _TIME_DTYPE.itemsize
+
+    values = np.empty((n_fields, n_rows), dtype=np.int64)
+    missing = np.empty((n_fields, n_rows), dtype=bool)
+    for index, dtype in enumerate(dtypes):
+        column = np.frombuffer(payload, dtype=dtype, count=n_rows, offset=offset)
+        offset += n_rows * dtype.itemsize
+        values[index] = column
+        missing[index] = column == np.iinfo(dtype).min
+    frame = _Frame(issue, targets, meta["fields"], meta["precision"], values, missing)
+    previous_values, available = _aligned_previous(frame, previous)
+    use_delta = available & ~missing
+    frame.values[use_delta] += previous_values[use_delta]
+    return frame
+
+
+def _frame_to_dataframe(frame: _Frame) -> pd.DataFrame:
+    """Convert a decoded frame to float values (NaN for missing values), indexed by (issue_time, target_time)."""
+    values = frame.values / 10.0**frame.precision
+    values[frame.missing] = np.nan
+    index = pd.MultiIndex.from_arrays(
+        [
+            pd.to_datetime(np.full(len(frame.targets), frame.issue), utc=True),
+            pd.to_datetime(frame.targets, utc=True),
+        ],
+        names=["issue_time", "target_time"],
+    )
+    return pd.DataFrame(dict(zip(frame.fields, values)), index=index, columns=frame.fields)
+
+
+class ForecastArchive:
+    """An append-only archive of forecasts, stored as compressed, delta-encoded fixed-point integers.
+
+    The archive is safe to use from several threads of one process, but only one process should append to it.
+
+    Attributes:
+        root (Path): The root directory of the archive.
+        keyframe_interval (int): The number of frames between two keyframes.
+
+    Example:
+        Archive every new forecast (fetched with 2 decimal places), then read the forecasts of January::
+
+            archive = ForecastArchive("archive/")
+            archive.append("SITE_UUID", get_forecast("SITE_UUID", precision=2), precision=2)
+
+            history_df = archive.read("SITE_UUID", issue_start="2025-01-01", issue_end="2025-02-01")
+    """
+
+    def __init__(self, root: Union[str, os.PathLike], keyframe_interval: int = 96):
+        """Initializes the archive, creating its root directory if needed.
+
+        Args:
+            root (Union[str, os.PathLike]): The root directory of the archive.
+            keyframe_interval (int): The number of frames between two keyframes (default is 96, one day of
+                forecasts issued every 15 minutes).
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self._lock = threading.Lock()
+        self._locations: Dict[str, List[_FrameLocation]] = {}
+        self._last_frames: Dict[str, _Frame] = {}
+
+    def _path(self, site_uuid: str) -> Path:
+        """Get the archive file of a site."""
+        return self.root / f"{_check_name(str(site_uuid))}{ARCHIVE_FILE_SUFFIX}"
+
+    def _frame_locations(self, site_uuid: str) -> List[_FrameLocation]:
+        """Get the locations of the complete frames of a site, only scanning the frames appended since last time."""
+        path = self._path(site_uuid)
+        locations = self._locations.setdefault(site_uuid, [])
+        if not path.exists():
+            locations.clear()
+            return locations
+        offset = locations[-1].offset + locations[-1].length if locations else 0
+        size = path.stat().st_size
+        with open(path, "rb") as file:
+            while offset + _FRAME_HEADER.size <= size:
+                file.seek(offset)
+                magic, issue, length, flags = _FRAME_HEADER.unpack(file.read(_FRAME_HEADER.size))
+                if magic != _MAGIC:
+                    raise ValueError(f"The archive of '{site_uuid}' is corrupted (at byte {offset}).")
+                if offset + _FRAME_HEADER.size + length > size:  # interrupted append
+                    break
+                keyframe = bool(flags & _KEYFRAME_FLAG)
+                locations.append(_FrameLocation(issue, offset + _FRAME_HEADER.size, length, keyframe))
+                offset += _FRAME_HEADER.size + length
+        return locations
+
+    def _decode(self, site_uuid: str, start: int, stop: int) -> List[_Frame]:
+        """Decode the frames of a site in [start, stop), starting from the keyframe preceding `start`."""
+        locations = self._frame_locations(site_uuid)
+        first = start
+        while first > 0 and not locations[first].keyframe:
+            first -= 1
+        frames = []
+        previous = None
+        with open(self._path(site_uuid), "rb") as file:
+            for position in range(first, stop):
+                location = locations[position]
+                file.seek(location.offset)
+                payload = file.read(location.length)
+                previous = _decode_frame(location.issue, payload, None if location.keyframe else previous)
+                if position >= start:
+                    frames.append(previous)
+        return frames
+
+    def sites(self) -> List[str]:
+        """List the sites available in the archive.
+
+        Returns:
+            List[str]: The site uuids.
+        """
+        return sorted(path.name[: -len(ARCHIVE_FILE_SUFFIX)] for path in self.root.glob(f"*{ARCHIVE_FILE_SUFFIX}"))
+
+    def issue_times(self, site_uuid: str) -> pd.DatetimeIndex:
+        """Get the issue times of the archived forecasts of a site.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+
+        Returns:
+            pd.DatetimeIndex: The issue times (UTC).
+        """
+        with self._lock:
+            issues = [location.issue for location in self._frame_locations(site_uuid)]
+        return pd.DatetimeIndex(pd.to_datetime(np.array(issues, dtype=np.int64), utc=True), name="issue_time")
+
+    def append(  # pylint: disable=too-many-arguments
+        self,
+        site_uuid: str,
+        forecast_df: pd.DataFrame,
+        precision: int,
+        issue_time: Optional[TimeLike] = None,
+        time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+    ) -> int:
+        """Append a forecast to the archive of a site.
+
+        Values are rounded to `precision` decimal places: there is no loss if the forecast was fetched with the same
+        (or a lower) `precision`.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+            forecast_df (pd.DataFrame): The forecast data, as returned by `get_forecast`.
+            precision (int): The number of decimal places kept.
+            issue_time (Optional[TimeLike], optional): When the forecast was issued (default is now).
+            time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the index (if made of time stamps).
+
+        Returns:
+            int: The size of the appended frame, in bytes.
+
+        Raises:
+            ValueError: If the forecast was issued before the last archived one, if it has infinite (or too large)
+                values, or if a name is not valid.
+        """
+        targets = _to_nanoseconds(_to_datetime_index(forecast_df.index, time_stamp_unit))
+        order = np.argsort(targets, kind="stable")
+        values = forecast_df.to_numpy(dtype=np.float64).T[:, order]
+        missing = np.isnan(values)
+        scaled = np.round(np.where(missing, 0, values) * 10.0**precision)
+        if not np.all(np.abs(scaled) < 2**62):
+            raise ValueError("Infinite values, or values too large for this precision, can't be archived.")
+        frame = _Frame(
+            issue=_time_to_nanoseconds(pd.Timestamp.now(tz="UTC") if issue_time is None else issue_time),
+            targets=targets[order],
+            fields=[str(field) for field in forecast_df.columns],
+            precision=precision,
+            values=scaled.astype(np.int64),
+            missing=missing,
+        )
+
+        path = self._path(site_uuid)
+        with self._lock:
+            locations = self._frame_locations(site_uuid)
+            if locations and locations[-1].issue > frame.issue:
+                raise ValueError(f"Forecasts of '{site_uuid}' must be appended in issue time order.")
+            previous = self._last_frames.get(site_uuid)
+            if previous is None and locations:
+                previous = self._decode(site_uuid, len(locations) - 1, len(locations))[0]
+            since_keyframe = next(
+                (count for count, location in enumerate(reversed(locations)) if location.keyframe), len(locations)
+            )
+            keyframe = not locations or since_keyframe + 1 >= self.keyframe_interval
+            payload = _encode_frame(frame, None if keyframe else previous)
+            end = locations[-1].offset + locations[-1].length if locations else 0
+            with open(path, "ab") as file:
+                file.truncate(end)  # drop an interrupted append
+                file.write(_FRAME_HEADER.pack(_MAGIC, frame.issue, len(payload), _KEYFRAME_FLAG if keyframe else 0))
+                file.write(payload)
+            locations.append(_FrameLocation(frame.issue, end + _FRAME_HEADER.size, len(payload), keyframe))
+            self._last_frames[site_uuid] = frame
+        return _FRAME_HEADER.size + len(payload)
+
+    def read(
+        self,
+        site_uuid: str,
+        issue_start: Optional[TimeLike] = None,
+        issue_end: Optional[TimeLike] = None,
+        fields: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Read the archived forecasts of a site within an issue time range.
+
+        The range includes its start and excludes its end, naive times are considered as UTC.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+            issue_start (Optional[TimeLike], optional): Minimal issue time.
+            issue_end (Optional[TimeLike], optional): Maximal issue time (excluded).
+            fields (Optional[List[str]], optional): The fields to read (default is all archived fields, fields
+                missing from some forecasts are NaN).
+
+        Returns:
+            pd.DataFrame: The forecasts, indexed by ("issue_time", "target_time").
+        """
+        with self._lock:
+            locations = self._frame_locations(site_uuid)
+            issues = np.array([location.issue for location in locations], dtype=np.int64)
+            start = 0 if issue_start is None else int(np.searchsorted(issues, _time_to_nanoseconds(issue_start)))
+            stop = len(issues) if issue_end is None else int(np.searchsorted(issues, _time_to_nanoseconds(issue_end)))
+            frames = self._decode(site_uuid, start, stop) if stop > start else []
+
+        if not frames:
+            index = pd.MultiIndex.from_arrays(
+                [pd.DatetimeIndex([], tz="UTC"), pd.DatetimeIndex([], tz="UTC")], names=["issue_time", "target_time"]
+            )
+            return pd.DataFrame(index=index, columns=fields or [], dtype=np.float64)
+        history_df = pd.concat([_frame_to_dataframe(frame) for frame in frames])
+        if fields is not None:
+            history_df = history_df.reindex(columns=fields)
+        return history_df
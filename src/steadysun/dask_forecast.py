@@ -0,0 +1,195 @@
+"""This module exposes the forecasts of a fleet as a lazy, partitioned Dask DataFrame, fetched on a cluster.
+
+Each partition is a batch of sites. Its forecasts are fetched when the partition is computed, on the worker it is
+scheduled on, so the forecast ingestion of a large fleet scales out across the workers of a cluster, and the
+downstream computations consume the partitions where they are (without collecting them on the driver).
+
+On each worker process, the API clients are pooled: the partitions of a worker share one client (and its
+connections, rate limit and adaptive concurrency limit) per set of client parameters. The concurrent API calls
+of the whole cluster can be bounded too, with a `distributed.Semaphore` shared by all the workers.
+
+This module needs the optional `dask` dependencies (`pip install steadysun[dask]`).
+
+Attributes:
+    SITE_UUID_COLUMN (str): The column of the site UUIDs in the forecasts DataFrame.
+
+Functions:
+    read_forecasts: Builds the lazy Dask DataFrame of the forecasts of many sites.
+"""
+
+import contextlib
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._scheduling import BATCH
+from .forecast import ResponseFormat, _fetch_forecast, _get_forecast_parameters
+from .steadysun_api import SteadysunAPI, get_default_client
+
+try:
+    import dask.dataframe as dd
+except ImportError:
+    dd = None
+
+try:
+    import distributed
+except ImportError:
+    distributed = None
+
+SITE_UUID_COLUMN = "site_uuid"
+
+# Clients of the current worker process, by client parameters
+_WORKER_CLIENTS: Dict[Tuple[int, Tuple[Tuple[str, Any], ...]], SteadysunAPI] = {}
+_WORKER_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_worker_client(client_kwargs: Optional[Dict[str, Any]]) -> SteadysunAPI:
+    """Get the client of the current process for these client parameters (created on first use)."""
+    if client_kwargs is None:
+        return get_default_client()
+    key = (os.getpid(), tuple(sorted(client_kwargs.items())))
+    with _WORKER_CLIENTS_LOCK:
+        client = _WORKER_CLIENTS.get(key)
+        if client is None:
+            client = _WORKER_CLIENTS[key] = SteadysunAPI(**client_kwargs)
+        return client
+
+
+class _ForecastBatchLoader:
+    """Fetches the forecasts of a batch of sites as one partition (pickled to the workers)."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        params: Dict[str, Any],
+        object_type: str,
+        response_format: ResponseFormat,
+        max_workers: int,
+        client_kwargs: Optional[Dict[str, Any]],
+        semaphore: Optional[Any],
+    ):
+        """Initializes the loader with the parameters shared by all the partitions."""
+        self.params = params
+        self.object_type = object_type
+        self.response_format = response_format
+        self.max_workers = max_workers
+        self.client_kwargs = client_kwargs
+        self.semaphore = semaphore
+
+    def _fetch(self, api: SteadysunAPI, site_uuid: str) -> pd.DataFrame:
+        """Fetch the forecast of a site, within the cluster-wide limit of concurrent calls."""
+        with self.semaphore if self.semaphore is not None else contextlib.nullcontext():
+            return _fetch_forecast(api, self.object_type, site_uuid, self.params, None, self.response_format, BATCH)
+
+    def __call__(self, site_uuids: List[str]) -> pd.DataFrame:
+        """Fetch the forecasts of a batch of sites, concatenated with a site UUID column."""
+        api = _get_worker_client(self.client_kwargs)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(site_uuids)))) as executor:
+            forecast_dfs = list(
+                executor.map(lambda site_uuid: api.concurrency_limiter.call(self._fetch, api, site_uuid), site_uuids)
+            )
+        partition_df = pd.concat(
+            [
+                forecast_df.assign(**{SITE_UUID_COLUMN: site_uuid})
+                for site_uuid, forecast_df in zip(site_uuids, forecast_dfs)
+            ]
+        )
+        fields = [column for column in partition_df.columns if column != SITE_UUID_COLUMN]
+        return partition_df[[SITE_UUID_COLUMN] + fields]
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def read_forecasts(
+    site_uuids: Iterable[str],
+    time_step: Optional[int] = None,
+    horizon: Optional[int] = None,
+    precision: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    use_timestamp_format: bool = False,
+    time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+    object_type: str = "pvsystem",
+    batch_size: int = 100,
+    max_workers: int = 32,
+    response_format: ResponseFormat = "json",
+    client_kwargs: Optional[Dict[str, Any]] = None,
+    max_concurrent_calls: Optional[int] = None,
+) -> "dd.DataFrame":
+    """Builds the lazy Dask DataFrame of the forecasts of many sites, one partition per batch of sites.
+
+    Nothing is fetched until the partitions are computed, except the first batch if `fields` is not given (to get
+    the columns of the DataFrame). The forecasts of a partition are fetched concurrently on its worker, with the
+    pooled client of the worker process.
+
+    Args:
+        site_uuids (Iterable[str]): The UUIDs of the sites (duplicates are fetched once).
+        time_step (Optional[int], optional): The time step of the forecast (in minutes).
+        horizon (Optional[int], optional): The horizon of the forecast (in minutes).
+        precision (Optional[int], optional): Maximal number of decimal places.
+        fields (Optional[List[str]], optional): The fields to include in the forecast.
+        use_timestamp_format (bool, optional): Should the timestamp format be used instead of iso_8601 for date.
+        time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the time stamp (if use_timestamp_format).
+        object_type (str, optional): The type of the forecasted components (default is "pvsystem").
+        batch_size (int, optional): The number of sites of each partition (default is 100).
+        max_workers (int, optional): The maximal number of concurrent API calls of a partition (default is 32).
+        response_format (ResponseFormat, optional): The preferred response format: "json" or "csv" (default is
+            "json").
+        client_kwargs (Optional[Dict[str, Any]], optional): The parameters of the `SteadysunAPI` client of each
+            worker process (e.g. `{"rate_limit": 20}`, a limit per worker process). Default is the default client
+            of the workers (configured by their environment), so that the API token is not sent in the task graph.
+        max_concurrent_calls (Optional[int], optional): The maximal number of concurrent API calls of the whole
+            cluster, shared by all the workers through a `distributed.Semaphore` (default is no cluster-wide
+            limit). It needs a running `distributed.Client`.
+
+    Returns:
+        dd.DataFrame: The forecasts of all the sites, indexed by date, with a `SITE_UUID_COLUMN` column and one
+            column per field.
+
+    Raises:
+        ImportError: If dask (or distributed, for `max_concurrent_calls`) is not installed.
+        ValueError: If the batch size is not positive, or if there is no site.
+
+    Example:
+        Compute the total forecasted irradiance of each site of a large fleet on a Dask cluster::
+
+            forecasts_ddf = read_forecasts(fleet.uuids, fields=["all_sky_global_horizontal_irradiance"])
+            daily_df = forecasts_ddf.groupby(SITE_UUID_COLUMN).sum().compute()
+    """
+    if dd is None:
+        raise ImportError("The Dask integration needs dask: pip install steadysun[dask]")
+    if batch_size <= 0:
+        raise ValueError(f"The batch size must be positive (got {batch_size}).")
+    site_uuids = list(dict.fromkeys(site_uuids))
+    if not site_uuids:
+        raise ValueError("There is no site to fetch.")
+    forecast_parameters = _get_forecast_parameters(
+        time_step=time_step,
+        horizon=horizon,
+        precision=precision,
+        fields=fields,
+        date_time_format="time_stamp" if use_timestamp_format else None,
+        time_stamp_unit=time_stamp_unit,
+    )
+
+    semaphore = None
+    if max_concurrent_calls is not None:
+        if distributed is None:
+            raise ImportError("The cluster-wide limit of API calls needs distributed: pip install steadysun[dask]")
+        # One semaphore per client configuration, named without revealing the token
+        clients_key = hashlib.sha1(str(sorted((client_kwargs or {}).items())).encode()).hexdigest()[:12]
+        semaphore = distributed.Semaphore(max_leases=max_concurrent_calls, name=f"steadysun-api-{clients_key}")
+
+    loader = _ForecastBatchLoader(
+        forecast_parameters.to_dict(), object_type, response_format, max_workers, client_kwargs, semaphore
+    )
+    n_batches = -(-len(site_uuids) // batch_size)
+    batches = [batch.tolist() for batch in np.array_split(np.array(site_uuids, dtype=object), n_batches)]
+    meta = None
+    if fields is not None:
+        meta = pd.DataFrame({SITE_UUID_COLUMN: pd.Series(dtype=object), **{field: [] for field in fields}})
+        meta = meta.astype({field: "float64" for field in fields})
+    return dd.from_map(loader, batches, meta=meta, label="steadysun-forecasts", enforce_metadata=False)
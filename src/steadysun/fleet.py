@@ -0,0 +1,342 @@
+"""This module provides a compact, read-only representation of large fleets of PV systems.
+
+A `PVFleet` stores the numeric fields of its PV systems in two NumPy structured arrays: one row per system
+(location, altitude, PV type, tracker and inverter parameters, albedo, timestamp interval and losses factor) and one
+row per PV array (peak power, orientation, inclination, module parameters), with enums stored as int8 codes. Fleet
+analytics, filters and local simulations are vectorized and never need a Python object per field. On demand, the
+other fields (title, requested fields, detailed losses, ...) are kept aside as plain dicts, to convert the fleet back
+to `PVSystem` objects without loss.
+
+Classes:
+    PVFleet: A read-only fleet of PV systems backed by NumPy structured arrays.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from .models.pvsystem import (
+    ModuleMaterial,
+    ModuleTechnology,
+    ModuleType,
+    PVSystemExpertParams,
+    PVType,
+    Racking,
+    TimestampInterval,
+)
+from .pvsystem import PVSystem
+
+SYSTEM_DTYPE = np.dtype(
+    [
+        ("uuid", "U36"),
+        ("lon", "f8"),
+        ("lat", "f8"),
+        ("altitude", "f8"),
+        ("pv_type", "i1"),
+        ("has_tracker", "?"),
+        ("tracker_max_angle", "f8"),
+        ("tracker_backtrack", "?"),
+        ("tracker_gcr", "f8"),
+        ("tracker_slope_azimuth", "f8"),
+        ("tracker_slope_tilt", "f8"),
+        ("has_inverter", "?"),
+        ("inverter_pdc0", "f8"),
+        ("inverter_eta_inv_nom", "f8"),
+        ("albedo", "f8"),
+        ("timestamp_interval", "i1"),
+        ("losses_factor", "f8"),
+    ]
+)
+
+ARRAY_DTYPE = np.dtype(
+    [
+        ("system", "i4"),
+        ("id", "i8"),
+        ("pdc0", "f8"),
+        ("orientation", "f8"),
+        ("inclination", "f8"),
+        ("module_technology", "i1"),
+        ("module_material", "i1"),
+        ("racking", "i1"),
+        ("module_type", "i1"),
+        ("power_temp_coeff", "f8"),
+    ]
+)
+
+# Enums of the PV array fields stored as int8 codes
+_ARRAY_ENUMS = {
+    "module_technology": ModuleTechnology,
+    "module_material": ModuleMaterial,
+    "racking": Racking,
+    "module_type": ModuleType,
+}
+
+# Fields of PVSystem (and of its expert parameters) stored in the structured arrays
+_ENCODED_FIELDS = {"uuid", "name", "location", "altitude", "pv_type", "expert_params"}
+_ENCODED_EXPERT_FIELDS = {"arrays", "tracker_config", "inverter_parameters"}
+
+# Losses parameters (percentages) reducing the DC power, in addition to the aging over the age of the system
+_LOSSES = ["wiring", "lid", "nameplate_rating", "mismatch", "soiling", "snow", "shading", "availability", "connections"]
+
+
+def _losses_factor(losses: Mapping[str, Any]) -> np.ndarray:
+    """Get the DC power factor of losses parameters (values or arrays of values, missing losses are 0)."""
+    factor = np.ones(())
+    for loss in _LOSSES:
+        factor = factor * (1 - np.asarray(losses.get(loss, 0), dtype=np.float64) / 100)
+    aging = np.asarray(losses.get("age", 0), dtype=np.float64) * np.asarray(losses.get("aging", 0), dtype=np.float64)
+    return np.clip(factor * (1 - aging / 100), 0, 1)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark an array as read-only."""
+    array.flags.writeable = False
+    return array
+
+
+class PVFleet:
+    """A read-only fleet of PV systems, backed by NumPy structured arrays.
+
+    Index a fleet with a boolean mask, integer indices or a slice to get a sub-fleet. The systems without
+    irradiances parameters have a NaN albedo and a centered timestamp interval.
+
+    Attributes:
+        systems (np.ndarray): One row per PV system (see `SYSTEM_DTYPE`).
+        arrays (np.ndarray): One row per PV array (see `ARRAY_DTYPE`), grouped by system. The `system` field is
+            the index of the system of the array in `systems`.
+        names (np.ndarray): The name of each PV system.
+        extras (Optional[List[Dict[str, Any]]]): The other fields of each PV system (None if not kept).
+
+    Example:
+        Select the large south-facing fixed systems of a fleet::
+
+            fleet = PVFleet.from_pvsystems(pvsystems)
+            south = (fleet.arrays["orientation"] > 135) & (fleet.arrays["orientation"] < 225)
+            selection = fleet[fleet.systems_with(south) & (fleet.pdc0 > 1e6) & (fleet.systems["pv_type"] == 1)]
+            pvsystems = selection.to_pvsystems()
+    """
+
+    __slots__ = ("systems", "arrays", "names", "extras")
+
+    def __init__(
+        self,
+        systems: np.ndarray,
+        arrays: np.ndarray,
+        names: Union[np.ndarray, Iterable[str]],
+        extras: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """Initializes a fleet from its structured arrays.
+
+        Args:
+            systems (np.ndarray): One row per PV system (see `SYSTEM_DTYPE`).
+            arrays (np.ndarray): One row per PV array (see `ARRAY_DTYPE`), grouped by system.
+            names (Union[np.ndarray, Iterable[str]]): The name of each PV system.
+            extras (Optional[List[Dict[str, Any]]]): The other fields of each PV system (default is None).
+
+        Raises:
+            ValueError: If the arrays don't match the expected dtypes or lengths.
+        """
+        if systems.dtype != SYSTEM_DTYPE or arrays.dtype != ARRAY_DTYPE:
+            raise ValueError("The systems and arrays must use SYSTEM_DTYPE and ARRAY_DTYPE.")
+        names = np.asarray(list(names) if not isinstance(names, np.ndarray) else names, dtype=object)
+        if len(names) != len(systems) or (extras is not None and len(extras) != len(systems)):
+            raise ValueError("The names and extras must have one item per system.")
+        if len(arrays) and (arrays["system"].min() < 0 or arrays["system"].max() >= len(systems)):
+            raise ValueError("The arrays must refer to existing systems.")
+        if np.any(np.diff(arrays["system"]) < 0):
+            raise ValueError("The arrays must be grouped by system.")
+        self.systems = _read_only(systems)
+        self.arrays = _read_only(arrays)
+        self.names = _read_only(names)
+        self.extras = extras
+
+    @classmethod
+    def from_pvsystems(cls, pvsystems: Iterable[PVSystem], keep_extras: bool = False) -> "PVFleet":
+        """Creates a fleet from PV systems.
+
+        Args:
+            pvsystems (Iterable[PVSystem]): The PV systems.
+            keep_extras (bool): Keep the fields that are not stored in the structured arrays as one dict per system,
+                to convert the fleet back to PV systems without loss (default is False).
+
+        Returns:
+            PVFleet: The fleet.
+        """
+        pvsystems = list(pvsystems)
+        systems = np.zeros(len(pvsystems), dtype=SYSTEM_DTYPE)
+        arrays = np.zeros(sum(len(pvsystem.expert_params.arrays) for pvsystem in pvsystems), dtype=ARRAY_DTYPE)
+        extras = [] if keep_extras else None
+        position = 0
+        for index, pvsystem in enumerate(pvsystems):
+            expert_params = pvsystem.expert_params
+            tracker = expert_params.tracker_config
+            inverter = expert_params.inverter_parameters
+            irradiances = expert_params.irradiances
+            losses = expert_params.losses_parameters
+            systems[index] = (
+                str(pvsystem.uuid),
+                pvsystem.location.coordinates.lon,
+                pvsystem.location.coordinates.lat,
+                pvsystem.altitude,
+                pvsystem.pv_type.value,
+                tracker is not None,
+                np.nan if tracker is None else tracker.max_angle,
+                tracker is not None and tracker.backtrack,
+                np.nan if tracker is None else tracker.gcr,
+                np.nan if tracker is None else tracker.slope_azimuth,
+                np.nan if tracker is None else tracker.slope_tilt,
+                inverter is not None,
+                np.nan if inverter is None else inverter.pdc0,
+                np.nan if inverter is None else inverter.eta_inv_nom,
+                np.nan if irradiances is None else irradiances.albedo,
+                (TimestampInterval.centered if irradiances is None else irradiances.timestamp_interval).value,
+                1.0 if losses is None else float(_losses_factor(losses.model_dump())),
+            )
+            for array in expert_params.arrays:
+                arrays[position] = (
+                    index,
+                    array.id,
+                    array.pvmodules_pdc0,
+                    array.orientation,
+                    array.inclination,
+                    array.module_technology.value,
+                    array.module_material.value,
+                    array.racking.value,
+                    array.module_type.value,
+                    array.power_temp_coeff,
+                )
+                position += 1
+            if keep_extras:
+                extra = pvsystem.model_dump(mode="json", exclude=_ENCODED_FIELDS)
+                extra.update(expert_params.model_dump(mode="json", exclude=_ENCODED_EXPERT_FIELDS))
+                extras.append(extra)
+        return cls(systems, arrays, [pvsystem.name for pvsystem in pvsystems], extras)
+
+    def to_pvsystems(self) -> List[PVSystem]:
+        """Converts the fleet to PV systems.
+
+        Without extras, the fields that are not stored in the structured arrays get default values (title is the
+        name, no requested fields, empty installation date, no bifacial, irradiances and losses parameters).
+
+        Returns:
+            List[PVSystem]: The PV systems.
+        """
+        bounds = np.searchsorted(self.arrays["system"], np.arange(len(self.systems) + 1))
+        return [self._to_pvsystem(index, bounds[index], bounds[index + 1]) for index in range(len(self.systems))]
+
+    def _to_pvsystem(self, index: int, array_start: int, array_end: int) -> PVSystem:
+        """Converts one system of the fleet to a PVSystem."""
+        record = dict(zip(SYSTEM_DTYPE.names, self.systems[index].item()))
+        extra = dict(self.extras[index]) if self.extras is not None else {}
+        expert_fields = {field: extra.pop(field) for field in PVSystemExpertParams.model_fields if field in extra}
+        expert_fields.setdefault("installation_date", "")
+        arrays = [dict(zip(ARRAY_DTYPE.names, row)) for row in self.arrays[array_start:array_end].tolist()]
+        expert_fields["arrays"] = [
+            {
+                "id": array["id"],
+                "pvmodules_pdc0": array["pdc0"],
+                "orientation": array["orientation"],
+                "inclination": array["inclination"],
+                **{field: enum(array[field]) for field, enum in _ARRAY_ENUMS.items()},
+                "power_temp_coeff": array["power_temp_coeff"],
+            }
+            for array in arrays
+        ]
+        if record["has_tracker"]:
+            expert_fields["tracker_config"] = {
+                "max_angle": record["tracker_max_angle"],
+                "backtrack": record["tracker_backtrack"],
+                "gcr": record["tracker_gcr"],
+                "slope_azimuth": record["tracker_slope_azimuth"],
+                "slope_tilt": record["tracker_slope_tilt"],
+            }
+        if record["has_inverter"]:
+            expert_fields["inverter_parameters"] = {
+                "pdc0": record["inverter_pdc0"],
+                "eta_inv_nom": record["inverter_eta_inv_nom"],
+            }
+        extra.setdefault("title", self.names[index])
+        extra.setdefault("requested_fields", [])
+        return PVSystem(
+            uuid=record["uuid"],
+            name=self.names[index],
+            location={"type": "Point", "coordinates": [record["lon"], record["lat"]]},
+            altitude=record["altitude"],
+            pv_type=PVType(record["pv_type"]),
+            expert_params=PVSystemExpertParams(**expert_fields),
+            **extra,
+        )
+
+    def __len__(self) -> int:
+        """The number of PV systems."""
+        return len(self.systems)
+
+    def __getitem__(self, key: Union[np.ndarray, slice, int, Iterable[int]]) -> "PVFleet":
+        """Selects a sub-fleet.
+
+        Args:
+            key (Union[np.ndarray, slice, int, Iterable[int]]): A boolean mask over the systems, integer indices
+                (without duplicates) or a slice.
+
+        Returns:
+            PVFleet: The selected PV systems (in the order of the indices).
+
+        Raises:
+            ValueError: If the indices contain duplicates.
+        """
+        indices = np.arange(len(self.systems))[key]
+        indices = np.atleast_1d(indices)
+        if len(np.unique(indices)) != len(indices):
+            raise ValueError("A PV system can't be selected twice.")
+        new_positions = np.full(len(self.systems), -1, dtype=np.int64)
+        new_positions[indices] = np.arange(len(indices))
+        array_positions = new_positions[self.arrays["system"]]
+        kept = np.flatnonzero(array_positions >= 0)
+        kept = kept[np.argsort(array_positions[kept], kind="stable")]
+        arrays = self.arrays[kept]
+        arrays["system"] = array_positions[kept]
+        extras = None if self.extras is None else [self.extras[index] for index in indices]
+        return PVFleet(self.systems[indices], arrays, self.names[indices], extras)
+
+    @property
+    def uuids(self) -> np.ndarray:
+        """The UUID of each PV system."""
+        return self.systems["uuid"]
+
+    @property
+    def pdc0(self) -> np.ndarray:
+        """The total peak power of the arrays of each PV system (in W)."""
+        return np.bincount(self.arrays["system"], weights=self.arrays["pdc0"], minlength=len(self.systems))
+
+    def systems_with(self, array_mask: np.ndarray) -> np.ndarray:
+        """Converts a mask over the PV arrays to a mask over the PV systems having at least one selected array.
+
+        Args:
+            array_mask (np.ndarray): A boolean mask over the PV arrays.
+
+        Returns:
+            np.ndarray: A boolean mask over the PV systems.
+        """
+        return np.bincount(self.arrays["system"][array_mask], minlength=len(self.systems)) > 0
+
+    def index_of(self, uuids: Union[str, Iterable[str]]) -> np.ndarray:
+        """Gets the indices of PV systems from their UUIDs.
+
+        Args:
+            uuids (Union[str, Iterable[str]]): The UUIDs of the PV systems.
+
+        Returns:
+            np.ndarray: The index of each PV system in the fleet.
+
+        Raises:
+            KeyError: If a UUID is not in the fleet.
+        """
+        uuids = np.atleast_1d(np.asarray(uuids if isinstance(uuids, str) else list(uuids), dtype=SYSTEM_DTYPE["uuid"]))
+        order = np.argsort(self.systems["uuid"])
+        sorted_uuids = self.systems["uuid"][order]
+        positions = np.searchsorted(sorted_uuids, uuids)
+        found = positions < len(sorted_uuids)
+        found[found] = sorted_uuids[positions[found]] == uuids[found]
+        if not np.all(found):
+            raise KeyError(f"PV systems not in the fleet: {uuids[~found].tolist()}")
+        return order[positions]
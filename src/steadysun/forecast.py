@@ -1,20 +1,48 @@
 """This module is here to help fetching forecast data from the Steadysun API
 
-It includes the `_ForecastParameters` class to model the parameters for the forecast API request, and
-the `get_forecast` function to retrieve forecast data as a pandas DataFrame.
+It includes the `_ForecastParameters` class to model the parameters for the forecast API request,
+the `get_forecast` function to retrieve forecast data as a pandas DataFrame, and the `get_forecasts` function
+to retrieve the forecast data of several sites concurrently.
 """
 
-from typing import Any, Dict, List, Literal, Optional, Union
+import hashlib
+import io
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, partial
+from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode
 
+import numpy as np
 import pandas as pd
+import requests
 from pydantic import BaseModel, field_validator
 
-from .steadysun_api import SteadysunAPI
+from ._circuit_breaker import CircuitOpenError, is_unhealthy_error
+from ._deadline import Deadline
+from ._scheduling import BATCH, INTERACTIVE, Priority
+from .forecast_cache import ForecastCache
+from .steadysun_api import SteadysunAPI, get_default_client
+
+logger = logging.getLogger(__name__)
+
+ResponseFormat = Literal["json", "csv"]
+
+# Accept header of each response format (the API may fall back to JSON)
+_ACCEPT_HEADERS: Dict[str, str] = {
+    "json": "application/json",
+    "csv": "text/csv, application/json;q=0.5",
+}
 
 
 class _ForecastParameters(BaseModel):
     """Available parameters for the get_forecast API call.
 
+    Instances are immutable: the query parameters, the encoded query string and the stable hash `key` are only
+    computed once (use `_get_forecast_parameters` to also reuse the validated instances).
+
     See default values and more information about each parameters at:
     https://steadyweb.steady-sun.com/rapidoc/#get-/forecast/-object_type-/-component_uuid-/
 
@@ -37,7 +65,7 @@ class _ForecastParameters(BaseModel):
     class Config:
         """Pydantic config"""
 
-        validate_assignment = True
+        frozen = True
 
     @field_validator("fields")
     @classmethod
@@ -64,13 +92,320 @@ class _ForecastParameters(BaseModel):
 
         return fields if len(fields) else None
 
+    @cached_property
+    def _params(self) -> Dict[str, Any]:
+        """The query parameters (computed once)."""
+        return super().model_dump(exclude_none=True)
+
+    @cached_property
+    def query_string(self) -> str:
+        """The URL-encoded query string of the parameters (sorted by name)."""
+        return urlencode(sorted(self._params.items()))
+
+    @cached_property
+    def key(self) -> str:
+        """A hash of the parameters, stable across processes (usable as a cache key)."""
+        return hashlib.sha1(self.query_string.encode()).hexdigest()
+
+    @cached_property
+    def key_without_fields(self) -> str:
+        """A hash of the parameters except the fields, stable across processes."""
+        query_string = urlencode(sorted((name, value) for name, value in self._params.items() if name != "fields"))
+        return hashlib.sha1(query_string.encode()).hexdigest()
+
+    @cached_property
+    def field_list(self) -> Optional[Tuple[str, ...]]:
+        """The requested fields (None for all the available fields)."""
+        return None if self.fields is None else tuple(field.strip() for field in self.fields.split(","))
+
+    def with_fields(self, fields: Optional[Sequence[str]]) -> "_ForecastParameters":
+        """Get the same parameters, for other fields.
+
+        Args:
+            fields (Optional[Sequence[str]]): The fields to retrieve.
+
+        Returns:
+            _ForecastParameters: The new parameters.
+        """
+        return _get_forecast_parameters(
+            time_step=self.time_step,
+            horizon=self.horizon,
+            precision=self.precision,
+            fields=None if fields is None else tuple(fields),
+            date_time_format=self.date_time_format,
+            time_stamp_unit=self.time_stamp_unit,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the attributes to a dictionary adapted to api_requests (excluding None values).
 
         Returns:
             Dict[str, Any]: The dictionary representation of the forecast parameters.
         """
-        return super().model_dump(exclude_none=True)
+        return dict(self._params)
+
+
+@lru_cache(maxsize=1024)
+def _cached_forecast_parameters(**kwargs: Any) -> _ForecastParameters:
+    """Build and validate forecast parameters, memoized on the (hashable) arguments."""
+    return _ForecastParameters(**kwargs)
+
+
+# pylint: disable=too-many-arguments
+def _get_forecast_parameters(
+    time_step: Optional[int] = None,
+    horizon: Optional[int] = None,
+    precision: Optional[int] = None,
+    fields: Optional[Union[List[str], Tuple[str, ...], str]] = None,
+    date_time_format: Optional[Literal["time_stamp", "iso_8601"]] = None,
+    time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+) -> _ForecastParameters:
+    """Get the validated forecast parameters, reusing the instance built for identical arguments.
+
+    Args:
+        time_step (Optional[int]): The time step of the forecast (in minutes).
+        horizon (Optional[int]): The horizon of the forecast (in minutes).
+        precision (Optional[int]): Maximal number of decimal places.
+        fields (Optional[Union[List[str], Tuple[str, ...], str]]): The fields to retrieve.
+        date_time_format (Optional[Literal["time_stamp", "iso_8601"]]): Set the date format.
+        time_stamp_unit (Optional[Literal["ms", "s"]]): The unit of the timestamp (if used in date_time_format).
+
+    Returns:
+        _ForecastParameters: The validated (and immutable) forecast parameters.
+
+    Raises:
+        ValueError: If the parameters are not valid.
+    """
+    kwargs = {
+        "time_step": time_step,
+        "horizon": horizon,
+        "precision": precision,
+        "fields": tuple(fields) if isinstance(fields, list) else fields,
+        "date_time_format": date_time_format,
+        "time_stamp_unit": time_stamp_unit,
+    }
+    try:
+        return _cached_forecast_parameters(**kwargs)
+    except TypeError:  # Unhashable arguments, pydantic will refuse them anyway
+        return _ForecastParameters(**kwargs)
+
+
+def _to_datetime_index(index: pd.Index, time_stamp_unit: Optional[Literal["ms", "s"]] = None) -> pd.DatetimeIndex:
+    """Convert a forecast index (iso_8601 strings or time stamps) to a UTC DatetimeIndex.
+
+    Args:
+        index (pd.Index): The index of a forecast DataFrame.
+        time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the time stamps (for numeric indexes).
+
+    Returns:
+        pd.DatetimeIndex: The converted index.
+
+    Raises:
+        ValueError: If the index is numeric but no time stamp unit was given.
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        return index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    if pd.api.types.is_numeric_dtype(index.dtype):
+        if time_stamp_unit is None:
+            raise ValueError("The forecast index is made of time stamps, please give their unit ('ms' or 's').")
+        return pd.DatetimeIndex(pd.to_datetime(index, unit=time_stamp_unit, utc=True))
+    return pd.DatetimeIndex(pd.to_datetime(index, utc=True))
+
+
+class _LastKnownForecasts:
+    """Bounded LRU of the last successfully fetched forecasts, used as stale data while the API is unavailable."""
+
+    def __init__(self, max_size: int = 256):
+        """Initializes an empty LRU.
+
+        Args:
+            max_size (int): The maximal number of stored forecasts (default is 256).
+        """
+        self.max_size = max_size
+        self._forecasts: "OrderedDict[Tuple[str, ...], pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: Tuple[str, ...], forecast_df: pd.DataFrame):
+        """Store a forecast (a copy is kept)."""
+        with self._lock:
+            self._forecasts[key] = forecast_df.copy()
+            self._forecasts.move_to_end(key)
+            while len(self._forecasts) > self.max_size:
+                self._forecasts.popitem(last=False)
+
+    def get(self, key: Tuple[str, ...]) -> Optional[pd.DataFrame]:
+        """Get a copy of a stored forecast, flagged with `attrs["stale"] = True` (None if not stored)."""
+        with self._lock:
+            forecast_df = self._forecasts.get(key)
+        if forecast_df is None:
+            return None
+        forecast_df = forecast_df.copy()
+        forecast_df.attrs["stale"] = True
+        return forecast_df
+
+
+_LAST_KNOWN_FORECASTS = _LastKnownForecasts()
+
+# Running forecast prefetchers (see `steadysun.prefetch`), consulted by `get_forecast` before calling the API
+_PREFETCHERS: List[Any] = []
+_PREFETCHERS_LOCK = threading.Lock()
+
+
+def _get_prefetched_forecast(api: SteadysunAPI, key: Tuple[str, str, str]) -> Optional[pd.DataFrame]:
+    """Get a fresh forecast kept in memory by a running prefetcher of the same account (None if there is none)."""
+    for prefetcher in _PREFETCHERS:
+        forecast_df = prefetcher.lookup(key, api.token)
+        if forecast_df is not None:
+            return forecast_df
+    return None
+
+
+def _split_json_to_dataframe(api_data: Dict[str, Any]) -> pd.DataFrame:
+    """Convert a pandas "split" JSON forecast (`data`/`index`/`columns`) to a DataFrame.
+
+    The rows are converted to one float block at once, instead of inferring the type of each column. Only the
+    columns with integral values are checked, to keep the integer (and boolean) columns as the generic conversion
+    does (falls back to the generic conversion for non-numeric data).
+
+    Args:
+        api_data (Dict[str, Any]): The parsed JSON response.
+
+    Returns:
+        pd.DataFrame: The forecast data.
+    """
+    data, index, columns = api_data["data"], api_data["index"], api_data["columns"]
+    try:
+        values = np.asarray(data, dtype=np.float64).reshape(len(index), len(columns))
+        integer_columns = {}
+        for position in np.flatnonzero(np.all(values == np.round(values), axis=0)):
+            column = [row[position] for row in data]
+            types = set(map(type, column))
+            if types == {int}:
+                integer_columns[columns[position]] = np.array(column, dtype=np.int64)
+            elif types == {bool}:
+                integer_columns[columns[position]] = np.array(column, dtype=bool)
+            elif bool in types:
+                raise TypeError("Mixed booleans and numbers")
+    except (TypeError, ValueError, OverflowError):
+        return pd.DataFrame(data=data, index=index, columns=columns)
+    forecast_df = pd.DataFrame(data=values, index=index, columns=columns, copy=False)
+    return forecast_df.assign(**integer_columns) if integer_columns else forecast_df
+
+
+def _csv_to_dataframe(content: bytes) -> pd.DataFrame:
+    """Convert a CSV forecast (index in the first column) to a DataFrame, with the C parser of pandas.
+
+    Args:
+        content (bytes): The CSV response body.
+
+    Returns:
+        pd.DataFrame: The forecast data.
+    """
+    forecast_df = pd.read_csv(io.BytesIO(content), index_col=0, engine="c")
+    forecast_df.index.name = None
+    return forecast_df
+
+
+def _response_to_dataframe(response: requests.Response) -> pd.DataFrame:
+    """Convert a forecast response to a DataFrame, with the parser matching its content type.
+
+    Args:
+        response (requests.Response): The API response (CSV or split JSON).
+
+    Returns:
+        pd.DataFrame: The forecast data.
+    """
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return _csv_to_dataframe(response.content)
+    return _split_json_to_dataframe(response.json())
+
+
+# pylint: disable=too-many-arguments
+def _fetch_forecast(
+    api: SteadysunAPI,
+    object_type: str,
+    component_uuid: str,
+    params: Dict[str, Any],
+    deadline: Optional[Deadline] = None,
+    response_format: ResponseFormat = "json",
+    priority: Priority = INTERACTIVE,
+) -> pd.DataFrame:
+    """Make the forecast GET call for one component and convert the response to a DataFrame.
+
+    Args:
+        api (SteadysunAPI): The API client to use.
+        object_type (str): The type of the component (e.g. "pvsystem").
+        component_uuid (str): The UUID of the component.
+        params (Dict[str, Any]): The forecast parameters, as given by `_ForecastParameters.to_dict`.
+        deadline (Optional[Deadline], optional): The deadline of the operation.
+        response_format (ResponseFormat, optional): The preferred response format (default is "json").
+        priority (Priority, optional): The priority of the call (default is "interactive").
+
+    Returns:
+        pd.DataFrame: The forecast data for the specified component.
+
+    Raises:
+        ValueError: If the response format is unknown.
+    """
+    if response_format not in _ACCEPT_HEADERS:
+        raise ValueError(f"Unknown response format '{response_format}' (expected one of {list(_ACCEPT_HEADERS)}).")
+    endpoint = f"forecast/{object_type}/{component_uuid}/"
+    if response_format == "json":
+        return _split_json_to_dataframe(api.get(endpoint, params=params, deadline=deadline, priority=priority))
+    response = api.get_response(
+        endpoint, params=params, accept=_ACCEPT_HEADERS[response_format], deadline=deadline, priority=priority
+    )
+    return _response_to_dataframe(response)
+
+
+# pylint: disable=too-many-arguments
+def _fetch_forecast_with_cache(
+    cache: ForecastCache,
+    api: SteadysunAPI,
+    object_type: str,
+    component_uuid: str,
+    forecast_parameters: _ForecastParameters,
+    deadline: Optional[Deadline] = None,
+    response_format: ResponseFormat = "json",
+    priority: Priority = INTERACTIVE,
+) -> pd.DataFrame:
+    """Get a forecast from the cache, only fetching the fields that are not cached (see `_fetch_forecast`).
+
+    If the fetched fields come from another forecast run than the cached ones (different index), all the requested
+    fields are fetched again and replace the cached forecast.
+
+    Args:
+        cache (ForecastCache): The forecast cache.
+        api (SteadysunAPI): The API client to use.
+        object_type (str): The type of the component (e.g. "pvsystem").
+        component_uuid (str): The UUID of the component.
+        forecast_parameters (_ForecastParameters): The forecast parameters.
+        deadline (Optional[Deadline], optional): The deadline of the operation.
+        response_format (ResponseFormat, optional): The preferred response format (default is "json").
+        priority (Priority, optional): The priority of the calls (default is "interactive").
+
+    Returns:
+        pd.DataFrame: The forecast data for the specified component.
+    """
+    key = (api.token, object_type, component_uuid, forecast_parameters.key_without_fields)
+    fields = forecast_parameters.field_list
+    cached_df, missing = cache.get(key, fields)
+    if cached_df is not None and not missing:
+        return cached_df
+    if cached_df is not None:
+        missing_parameters = forecast_parameters.with_fields(missing)
+        missing_df = _fetch_forecast(
+            api, object_type, component_uuid, missing_parameters.to_dict(), deadline, response_format, priority
+        )
+        merged_df = cache.merge(key, missing_df, fields)
+        if merged_df is not None:
+            return merged_df
+    forecast_df = _fetch_forecast(
+        api, object_type, component_uuid, forecast_parameters.to_dict(), deadline, response_format, priority
+    )
+    cache.put(key, forecast_df, complete=fields is None)
+    return forecast_df
 
 
 # pylint: disable=too-many-arguments
@@ -82,10 +417,20 @@ def get_forecast(
     fields: Optional[List[str]] = None,
     use_timestamp_format: bool = False,
     time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+    object_type: str = "pvsystem",
+    stale_on_failure: bool = False,
+    response_format: ResponseFormat = "json",
+    deadline: Optional[Union[float, Deadline]] = None,
+    client: Optional[SteadysunAPI] = None,
+    cache: Optional[ForecastCache] = None,
+    priority: Priority = INTERACTIVE,
 ) -> pd.DataFrame:
     """
     Fetch forecast data for a specific site with given parameters.
 
+    If a running `steadysun.prefetch.ForecastPrefetcher` keeps a fresh forecast of the site with the same parameters
+    (and account), it is returned from memory without calling the API.
+
     See default values and more information about each parameters at:
     https://steadyweb.steady-sun.com/rapidoc/#get-/forecast/-object_type-/-component_uuid-/
 
@@ -97,12 +442,25 @@ def get_forecast(
         fields (Optional[List[str]], optional): The fields to include in the forecast.
         use_timestamp_format (bool, optional): Should the timestamp format be used instead of iso_8601 for date.
         time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the time stamp (if use_timestamp_format).
+        object_type (str, optional): The type of the forecasted component (default is "pvsystem").
+        stale_on_failure (bool, optional): Keep the last forecast fetched with these parameters, and return it
+            (flagged with `attrs["stale"] = True`) if the API is unavailable (default is False).
+        response_format (ResponseFormat, optional): The preferred response format: "json" or "csv" (parsed faster
+            for big forecasts, with a JSON fallback if the API does not support it). Default is "json".
+        deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+        client (Optional[SteadysunAPI], optional): The API client to use (default is `get_default_client()`).
+        cache (Optional[ForecastCache], optional): A cache answering the requests whose fields are already cached,
+            and only fetching the missing fields otherwise (default is no cache).
+        priority (Priority, optional): The priority of the API calls, if the client has a scheduler
+            (default is "interactive").
 
     Returns:
         pd.DataFrame: The forecast data for the specified site.
 
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
+        steadysun._circuit_breaker.CircuitOpenError: If the API is considered unavailable (and no stale data is used).
+        steadysun._deadline.DeadlineExceeded: If the forecast is not received before the deadline.
 
     Example:
         Fetch forecast data for a specific site with a time step of 30 minutes, a horizon of 2440 minutes,
@@ -116,7 +474,7 @@ def get_forecast(
                 fields=["all_sky_global_horizontal_irradiance", "2m_temperature"],
             )
     """
-    forecast_parameters = _ForecastParameters(
+    forecast_parameters = _get_forecast_parameters(
         time_step=time_step,
         horizon=horizon,
         precision=precision,
@@ -124,14 +482,140 @@ def get_forecast(
         date_time_format="time_stamp" if use_timestamp_format else None,
         time_stamp_unit=time_stamp_unit,
     )
+    deadline = Deadline.from_value(deadline)
+    api = client or get_default_client()
+    key = (object_type, site_uuid, forecast_parameters.key)
+    if _PREFETCHERS:
+        forecast_df = _get_prefetched_forecast(api, key)
+        if forecast_df is not None:
+            return forecast_df
+    if cache is None:
+        fetch = partial(
+            _fetch_forecast,
+            api,
+            object_type,
+            site_uuid,
+            forecast_parameters.to_dict(),
+            deadline,
+            response_format,
+            priority,
+        )
+    else:
+        fetch = partial(
+            _fetch_forecast_with_cache,
+            cache,
+            api,
+            object_type,
+            site_uuid,
+            forecast_parameters,
+            deadline,
+            response_format,
+            priority,
+        )
+    if not stale_on_failure:
+        return fetch()
 
-    endpoint = f"forecast/pvsystem/{site_uuid}/"
-    params = forecast_parameters.to_dict()
+    # The last known forecasts of an account are not served to the other accounts
+    stale_key = (api.token, api.base_url) + key
+    try:
+        forecast_df = fetch()
+    except requests.exceptions.RequestException as error:
+        stale_df = _LAST_KNOWN_FORECASTS.get(stale_key)
+        if stale_df is None or not (isinstance(error, CircuitOpenError) or is_unhealthy_error(error)):
+            raise
+        logger.warning(f"Returning the last known forecast of {site_uuid}, the API is unavailable ({error}).")
+        return stale_df
+    _LAST_KNOWN_FORECASTS.put(stale_key, forecast_df)
+    return forecast_df
 
-    # Make the GET call
-    api_data = SteadysunAPI().get(endpoint, params=params)
 
-    # Convert the response to a pandas DataFrame
-    forecast_df = pd.DataFrame(data=api_data["data"], index=api_data["index"], columns=api_data["columns"])
+# pylint: disable=too-many-arguments
+def get_forecasts(
+    site_uuids: Iterable[str],
+    time_step: Optional[int] = None,
+    horizon: Optional[int] = None,
+    precision: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    use_timestamp_format: bool = False,
+    time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+    object_type: str = "pvsystem",
+    max_workers: int = 32,
+    response_format: ResponseFormat = "json",
+    deadline: Optional[Union[float, Deadline]] = None,
+    client: Optional[SteadysunAPI] = None,
+    priority: Priority = BATCH,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch forecast data for several sites with the same parameters.
 
-    return forecast_df
+    The parameters are validated once, duplicated UUIDs are only requested once, and the API calls are made
+    concurrently with a single API client. The number of concurrent calls adapts to the API latency and errors
+    (see `SteadysunAPI.concurrency_limiter`), within `max_workers`.
+
+    Args:
+        site_uuids (Iterable[str]): The UUIDs of the sites.
+        time_step (Optional[int], optional): The time step of the forecast (in minutes).
+        horizon (Optional[int], optional): The horizon of the forecast (in minutes).
+        precision (Optional[int], optional): Maximal number of decimal places.
+        fields (Optional[List[str]], optional): The fields to include in the forecast.
+        use_timestamp_format (bool, optional): Should the timestamp format be used instead of iso_8601 for date.
+        time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the time stamp (if use_timestamp_format).
+        object_type (str, optional): The type of the forecasted components (default is "pvsystem").
+        max_workers (int, optional): The maximal number of concurrent API calls (default is 32).
+        response_format (ResponseFormat, optional): The preferred response format: "json" or "csv" (parsed faster
+            for big forecasts, with a JSON fallback if the API does not support it). Default is "json".
+        deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) shared by all
+            the API calls.
+        client (Optional[SteadysunAPI], optional): The API client to use (default is `get_default_client()`).
+        priority (Priority, optional): The priority of the API calls, if the client has a scheduler
+            (default is "batch").
+
+    Returns:
+        Dict[str, pd.DataFrame]: The forecast data of each site, by site UUID.
+
+    Raises:
+        requests.exceptions.HTTPError: If one of the API requests fails.
+        steadysun._deadline.DeadlineExceeded: If all the forecasts are not received before the deadline.
+
+    Example:
+        Fetch the irradiance forecast of several sites::
+
+            forecast_dfs = get_forecasts(
+                site_uuids=["SITE_UUID_1", "SITE_UUID_2"],
+                fields=["all_sky_global_horizontal_irradiance"],
+            )
+            forecast_df_1 = forecast_dfs["SITE_UUID_1"]
+    """
+    forecast_parameters = _get_forecast_parameters(
+        time_step=time_step,
+        horizon=horizon,
+        precision=precision,
+        fields=fields,
+        date_time_format="time_stamp" if use_timestamp_format else None,
+        time_stamp_unit=time_stamp_unit,
+    )
+    params = forecast_parameters.to_dict()
+    api = client or get_default_client()
+    deadline = Deadline.from_value(deadline)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            site_uuid: executor.submit(
+                api.concurrency_limiter.call,
+                _fetch_forecast,
+                api,
+                object_type,
+                site_uuid,
+                params,
+                deadline,
+                response_format,
+                priority,
+            )
+            for site_uuid in dict.fromkeys(site_uuids)
+        }
+        try:
+            return {site_uuid: future.result() for site_uuid, future in futures.items()}
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
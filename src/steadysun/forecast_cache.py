@@ -0,0 +1,185 @@
+"""This module provides an in-memory forecast cache, aware of the fields of each forecast.
+
+Forecasts are cached per site and per parameters (time step, horizon, precision and date format), field by field.
+Given to `get_forecast` (`cache` parameter), it answers a request whose fields are already cached by projecting
+the cached columns, and only fetches the missing fields of a partially cached request, merged into the entry.
+Consumers asking for different field lists of the same site then share the API calls.
+
+Classes:
+    ForecastCache: A thread-safe LRU of forecasts, by site and parameters, with a time to live.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+class _CachedForecast:
+    """A cached forecast: its columns, whether they are all the available fields, and its fetch time."""
+
+    __slots__ = ("forecast_df", "complete", "fetched_at")
+
+    def __init__(self, forecast_df: pd.DataFrame, complete: bool, fetched_at: float):
+        self.forecast_df = forecast_df
+        self.complete = complete
+        self.fetched_at = fetched_at
+
+
+class ForecastCache:
+    """A thread-safe LRU of forecasts, by site and parameters, serving field subsets.
+
+    Attributes:
+        ttl (float): Time to live of the cached forecasts, in seconds.
+        max_entries (int): The maximal number of cached (site, parameters) forecasts.
+        hits (int): The number of requests answered from the cache.
+        partial_hits (int): The number of requests for which only the missing fields were fetched.
+        misses (int): The number of requests fully fetched.
+
+    Example:
+        Share the API calls of consumers asking for different fields::
+
+            cache = ForecastCache(ttl=300)
+            ghi_df = get_forecast("SITE_UUID", fields=["all_sky_global_horizontal_irradiance"], cache=cache)
+            # Only "2m_temperature" is fetched
+            both_df = get_forecast(
+                "SITE_UUID", fields=["all_sky_global_horizontal_irradiance", "2m_temperature"], cache=cache
+            )
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 1024):
+        """Initializes an empty cache.
+
+        Args:
+            ttl (float): Time to live of the cached forecasts, in seconds (default is 300).
+            max_entries (int): The maximal number of cached (site, parameters) forecasts (default is 1024).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _CachedForecast]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of cached (site, parameters) forecasts."""
+        return len(self._entries)
+
+    def clear(self):
+        """Removes all the cached forecasts."""
+        with self._lock:
+            self._entries.clear()
+
+    def export_entries(self) -> List[Tuple[Hashable, pd.DataFrame, bool, float]]:
+        """Gets the fresh cached forecasts (e.g. to save them), from the least to the most recently used.
+
+        Returns:
+            List[Tuple[Hashable, pd.DataFrame, bool, float]]: The key, forecast (shared, must not be modified),
+                completeness and age in seconds of each cached forecast.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, entry.forecast_df, entry.complete, now - entry.fetched_at)
+                for key, entry in self._entries.items()
+                if now - entry.fetched_at <= self.ttl
+            ]
+
+    def import_entries(self, entries: Iterable[Tuple[Hashable, pd.DataFrame, bool, float]]) -> int:
+        """Caches forecasts with their age (e.g. restored from a snapshot), skipping the expired ones.
+
+        Args:
+            entries (Iterable[Tuple[Hashable, pd.DataFrame, bool, float]]): The key, forecast, completeness and age
+                in seconds of each forecast (see `export_entries`).
+
+        Returns:
+            int: The number of forecasts cached.
+        """
+        now = time.monotonic()
+        imported = 0
+        with self._lock:
+            for key, forecast_df, complete, age in entries:
+                if age > self.ttl:
+                    continue
+                self._entries[key] = _CachedForecast(forecast_df.copy(), complete, now - age)
+                self._entries.move_to_end(key)
+                imported += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return imported
+
+    def get(self, key: Hashable, fields: Optional[Sequence[str]]) -> Tuple[Optional[pd.DataFrame], List[str]]:
+        """Gets the cached columns of a forecast.
+
+        Args:
+            key (Hashable): The key of the site and parameters (without the fields).
+            fields (Optional[Sequence[str]]): The requested fields (None for all the available fields).
+
+        Returns:
+            Tuple[Optional[pd.DataFrame], List[str]]: A copy of the cached requested fields (None if nothing is
+                cached, or if all the fields are requested and only some are cached), and the missing fields.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.fetched_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None or (fields is None and not entry.complete):
+                self.misses += 1
+                return None, []
+            self._entries.move_to_end(key)
+            forecast_df = entry.forecast_df
+            if fields is None:
+                self.hits += 1
+                return forecast_df.copy(), []
+            missing = [field for field in fields if field not in forecast_df.columns]
+            if missing and not entry.complete:
+                self.partial_hits += 1
+            else:
+                self.hits += 1
+                missing = []
+            return forecast_df[[field for field in fields if field in forecast_df.columns]].copy(), missing
+
+    def put(self, key: Hashable, forecast_df: pd.DataFrame, complete: bool = False):
+        """Caches a forecast, replacing the cached one.
+
+        Args:
+            key (Hashable): The key of the site and parameters (without the fields).
+            forecast_df (pd.DataFrame): The forecast (a copy is kept).
+            complete (bool): Whether the forecast has all the available fields (default is False).
+        """
+        with self._lock:
+            self._entries[key] = _CachedForecast(forecast_df.copy(), complete, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def merge(
+        self, key: Hashable, forecast_df: pd.DataFrame, fields: Optional[Sequence[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """Adds fields to a cached forecast, if they come from the same forecast run (same index).
+
+        The merged forecast is returned directly: the request of the missing fields was already counted by `get`.
+
+        Args:
+            key (Hashable): The key of the site and parameters (without the fields).
+            forecast_df (pd.DataFrame): The forecast of the missing fields.
+            fields (Optional[Sequence[str]]): The requested fields to return (None for all the cached fields).
+
+        Returns:
+            Optional[pd.DataFrame]: A copy of the requested fields of the merged forecast (None if the fields were not
+                added, because the forecast is no longer cached or has another index).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.forecast_df.index.equals(forecast_df.index):
+                return None
+            new_columns = [column for column in forecast_df.columns if column not in entry.forecast_df.columns]
+            entry.forecast_df = pd.concat([entry.forecast_df, forecast_df[new_columns]], axis=1)
+            merged_df = entry.forecast_df
+            if fields is None:
+                return merged_df.copy()
+            return merged_df[[field for field in fields if field in merged_df.columns]].copy()
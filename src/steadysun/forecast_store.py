@@ -0,0 +1,302 @@
+"""This module provides a local on-disk store for historical forecasts.
+
+Each forecast fetched with `get_forecast` can be appended to the store, which keeps one directory per site with one
+fixed-width file per column: the issue times and target times (int64 nanoseconds since epoch, UTC) and one float64
+file per forecast field. Rows are kept sorted by issue time, and by target time within each issue time, so range
+queries only need binary searches on the memory-mapped issue times (and on the target times of each issue) and
+never load the whole history in memory.
+
+Classes:
+    ForecastStore: A memory-mapped, append-only forecast store.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Literal, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .forecast import _to_datetime_index
+
+ISSUE_TIME_FILE = "issue_time.i8"
+TARGET_TIME_FILE = "target_time.i8"
+FIELD_FILE_SUFFIX = ".f8"
+
+_INDEX_DTYPE = np.dtype("<i8")
+_FIELD_DTYPE = np.dtype("<f8")
+_SAFE_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+
+TimeLike = Union[str, datetime, np.datetime64]
+
+
+def _to_nanoseconds(index: pd.DatetimeIndex) -> np.ndarray:
+    """Convert a UTC DatetimeIndex to int64 nanoseconds since epoch."""
+    return index.tz_convert(None).to_numpy().astype("datetime64[ns]").view(_INDEX_DTYPE)
+
+
+def _time_to_nanoseconds(time: TimeLike) -> int:
+    """Convert a time bound to int64 nanoseconds since epoch (naive times are considered as UTC)."""
+    return int(_to_nanoseconds(_to_datetime_index(pd.DatetimeIndex([pd.Timestamp(time)])))[0])
+
+
+def _check_name(name: str) -> str:
+    """Check that a site uuid or a field name can safely be used as a file name."""
+    if not _SAFE_NAME_PATTERN.match(name) or name in (".", ".."):
+        raise ValueError(f"'{name}' can't be used in the forecast store (only letters, digits, '_', '-', '.').")
+    return name
+
+
+class ForecastStore:
+    """A local, append-only, memory-mapped store of historical forecasts.
+
+    The store is safe to use from several threads of one process, but only one process should append to it.
+
+    Attributes:
+        root (Path): The root directory of the store.
+
+    Example:
+        Archive every new forecast, then get all the forecasts issued in January for a given target day::
+
+            store = ForecastStore("forecasts/")
+            store.append("SITE_UUID", get_forecast("SITE_UUID"))
+
+            history_df = store.query(
+                "SITE_UUID",
+                fields=["all_sky_global_horizontal_irradiance"],
+                issue_start="2025-01-01",
+                issue_end="2025-02-01",
+                target_start="2025-01-15",
+                target_end="2025-01-16",
+            )
+    """
+
+    def __init__(self, root: Union[str, os.PathLike]):
+        """Initializes the store, creating its root directory if needed.
+
+        Args:
+            root (Union[str, os.PathLike]): The root directory of the store.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _site_dir(self, site_uuid: str) -> Path:
+        """Get the directory of a site."""
+        return self.root / _check_name(str(site_uuid))
+
+    @staticmethod
+    def _n_rows(site_dir: Path) -> int:
+        """Get the number of committed rows of a site (the issue times file is written last)."""
+        issue_path = site_dir / ISSUE_TIME_FILE
+        return issue_path.stat().st_size // _INDEX_DTYPE.itemsize if issue_path.exists() else 0
+
+    @staticmethod
+    def _memmap(path: Path, dtype: np.dtype, n_rows: int) -> np.ndarray:
+        """Memory-map the first rows of a column file."""
+        if n_rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(n_rows,))
+
+    @staticmethod
+    def _last_issue(site_dir: Path, n_rows: int) -> int:
+        """Read the last committed issue time of a site (in nanoseconds)."""
+        offset = (n_rows - 1) * _INDEX_DTYPE.itemsize
+        return int(np.fromfile(site_dir / ISSUE_TIME_FILE, dtype=_INDEX_DTYPE, count=1, offset=offset)[0])
+
+    @staticmethod
+    def _target_rows(
+        issues: np.ndarray,
+        targets: np.ndarray,
+        start: int,
+        stop: int,
+        target_start: Optional[int],
+        target_end: Optional[int],
+    ) -> np.ndarray:
+        """Get the rows within a target time range, with binary searches in each issue of the rows start:stop."""
+        blocks = []
+        position = start
+        while position < stop:
+            block_stop = min(stop, int(np.searchsorted(issues, issues[position], "right")))
+            block_targets = targets[position:block_stop]
+            block_start = 0 if target_start is None else int(np.searchsorted(block_targets, target_start, "left"))
+            block_end = len(block_targets) if target_end is None else int(np.searchsorted(block_targets, target_end))
+            blocks.append(np.arange(position + block_start, position + max(block_start, block_end)))
+            position = block_stop
+        return np.concatenate(blocks) if blocks else np.arange(0)
+
+    @staticmethod
+    def _append_column(path: Path, values: np.ndarray, n_rows: int, fill_value: float = 0):
+        """Append values to a column file, after resizing it to the number of committed rows.
+
+        Extra rows left by an interrupted append are dropped, and missing rows (of a new field) are filled.
+        """
+        expected_size = n_rows * values.dtype.itemsize
+        size = path.stat().st_size if path.exists() else 0
+        with open(path, "ab") as file:
+            if size > expected_size:
+                file.truncate(expected_size)
+            elif size < expected_size:
+                np.full((expected_size - size) // values.dtype.itemsize, fill_value, dtype=values.dtype).tofile(file)
+            values.tofile(file)
+
+    def sites(self) -> List[str]:
+        """List the sites available in the store.
+
+        Returns:
+            List[str]: The site uuids.
+        """
+        return sorted(path.name for path in self.root.iterdir() if (path / ISSUE_TIME_FILE).exists())
+
+    def fields(self, site_uuid: str) -> List[str]:
+        """List the fields stored for a site.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+
+        Returns:
+            List[str]: The stored fields.
+        """
+        site_dir = self._site_dir(site_uuid)
+        if not site_dir.exists():
+            return []
+        return sorted(path.name[: -len(FIELD_FILE_SUFFIX)] for path in site_dir.glob(f"*{FIELD_FILE_SUFFIX}"))
+
+    def append(
+        self,
+        site_uuid: str,
+        forecast_df: pd.DataFrame,
+        issue_time: Optional[TimeLike] = None,
+        time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+    ) -> int:
+        """Append a forecast to the history of a site.
+
+        Fields which are not part of this forecast are filled with NaN (and new fields are back-filled with NaN).
+
+        Args:
+            site_uuid (str): The UUID of the site.
+            forecast_df (pd.DataFrame): The forecast data, as returned by `get_forecast`.
+            issue_time (Optional[TimeLike], optional): When the forecast was issued (default is now).
+            time_stamp_unit (Optional[Literal["ms", "s"]], optional): The unit of the index (if made of time stamps).
+
+        Returns:
+            int: The number of appended rows.
+
+        Raises:
+            ValueError: If the forecast was issued before the last stored one (or at the same time, with target
+                times before the stored ones), or if a name is not valid.
+        """
+        target_times = _to_datetime_index(forecast_df.index, time_stamp_unit)
+        order = np.argsort(_to_nanoseconds(target_times), kind="stable")
+        targets = _to_nanoseconds(target_times)[order]
+        issue = _time_to_nanoseconds(pd.Timestamp.now(tz="UTC") if issue_time is None else issue_time)
+        new_fields = {
+            _check_name(str(field)): forecast_df[field].to_numpy(dtype=_FIELD_DTYPE)[order]
+            for field in forecast_df.columns
+        }
+        n_new = len(targets)
+
+        site_dir = self._site_dir(site_uuid)
+        with self._lock:
+            site_dir.mkdir(exist_ok=True)
+            n_rows = self._n_rows(site_dir)
+            if n_rows and self._last_issue(site_dir, n_rows) > issue:
+                raise ValueError(f"Forecasts of '{site_uuid}' must be appended in issue time order.")
+            if n_rows and n_new and self._last_issue(site_dir, n_rows) == issue:
+                if self._memmap(site_dir / TARGET_TIME_FILE, _INDEX_DTYPE, n_rows)[-1] > targets[0]:
+                    raise ValueError(f"Forecasts of '{site_uuid}' issued at the same time must follow in target time.")
+
+            for field in set(self.fields(site_uuid)) | set(new_fields):
+                values = new_fields.get(field, np.full(n_new, np.nan, dtype=_FIELD_DTYPE))
+                self._append_column(site_dir / f"{field}{FIELD_FILE_SUFFIX}", values, n_rows, fill_value=np.nan)
+
+            # The index files are written last: they commit the new rows
+            self._append_column(site_dir / TARGET_TIME_FILE, targets, n_rows)
+            self._append_column(site_dir / ISSUE_TIME_FILE, np.full(n_new, issue, dtype=_INDEX_DTYPE), n_rows)
+        return n_new
+
+    def query(  # pylint: disable=too-many-arguments
+        self,
+        site_uuid: str,
+        fields: Optional[List[str]] = None,
+        issue_start: Optional[TimeLike] = None,
+        issue_end: Optional[TimeLike] = None,
+        target_start: Optional[TimeLike] = None,
+        target_end: Optional[TimeLike] = None,
+    ) -> pd.DataFrame:
+        """Get the stored forecasts of a site within issue time and target time ranges.
+
+        Ranges include their start and exclude their end, naive times are considered as UTC.
+        Only the selected rows are read from disk.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+            fields (Optional[List[str]], optional): The fields to read (default is all stored fields).
+            issue_start (Optional[TimeLike], optional): Minimal issue time.
+            issue_end (Optional[TimeLike], optional): Maximal issue time (excluded).
+            target_start (Optional[TimeLike], optional): Minimal target time.
+            target_end (Optional[TimeLike], optional): Maximal target time (excluded).
+
+        Returns:
+            pd.DataFrame: The forecasts, indexed by ("issue_time", "target_time").
+
+        Raises:
+            KeyError: If one of the requested fields is not stored for this site.
+        """
+        site_dir = self._site_dir(site_uuid)
+        n_rows = self._n_rows(site_dir)
+        fields = self.fields(site_uuid) if fields is None else fields
+        missing_fields = set(fields) - set(self.fields(site_uuid))
+        if missing_fields:
+            raise KeyError(f"Fields {sorted(missing_fields)} are not stored for '{site_uuid}'.")
+
+        issues = self._memmap(site_dir / ISSUE_TIME_FILE, _INDEX_DTYPE, n_rows)
+        start = 0 if issue_start is None else int(np.searchsorted(issues, _time_to_nanoseconds(issue_start), "left"))
+        stop = n_rows if issue_end is None else int(np.searchsorted(issues, _time_to_nanoseconds(issue_end), "left"))
+        stop = max(start, stop)
+
+        targets = self._memmap(site_dir / TARGET_TIME_FILE, _INDEX_DTYPE, n_rows)
+        if target_start is None and target_end is None:
+            rows = np.arange(start, stop)
+        else:
+            rows = self._target_rows(
+                issues,
+                targets,
+                start,
+                stop,
+                None if target_start is None else _time_to_nanoseconds(target_start),
+                None if target_end is None else _time_to_nanoseconds(target_end),
+            )
+
+        index = pd.MultiIndex.from_arrays(
+            [
+                pd.to_datetime(np.asarray(issues[rows]), utc=True),
+                pd.to_datetime(np.asarray(targets[rows]), utc=True),
+            ],
+            names=["issue_time", "target_time"],
+        )
+        data = {
+            field: np.asarray(self._memmap(site_dir / f"{field}{FIELD_FILE_SUFFIX}", _FIELD_DTYPE, n_rows)[rows])
+            for field in fields
+        }
+        return pd.DataFrame(data, index=index, columns=fields)
+
+    def latest(self, site_uuid: str, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get the last stored forecast of a site.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+            fields (Optional[List[str]], optional): The fields to read (default is all stored fields).
+
+        Returns:
+            pd.DataFrame: The last forecast, indexed by target time.
+        """
+        site_dir = self._site_dir(site_uuid)
+        n_rows = self._n_rows(site_dir)
+        if n_rows == 0:
+            return self.query(site_uuid, fields).droplevel("issue_time")
+        last_issue = pd.Timestamp(self._last_issue(site_dir, n_rows), tz="UTC")
+        return self.query(site_uuid, fields, issue_start=last_issue).droplevel("issue_time")
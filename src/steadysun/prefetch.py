@@ -0,0 +1,337 @@
+"""This module keeps the forecasts of a set of sites warm in memory, for latency-critical code.
+
+A `ForecastPrefetcher` refreshes the forecasts of its sites in a background thread, at times aligned with the
+forecast run schedule (every `refresh_interval` seconds since the epoch, plus `run_delay`). While it is running,
+`get_forecast` calls for these sites (with the same parameters and account) are served from memory.
+
+Classes:
+    PrefetchedForecast: A forecast kept in memory, with its staleness metadata.
+    ForecastPrefetcher: Refreshes the forecasts of a set of sites in the background.
+"""
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Literal, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from . import forecast
+from ._scheduling import BATCH
+from .forecast import _fetch_forecast, _get_forecast_parameters
+from .steadysun_api import SteadysunAPI, get_default_client
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchedForecast(NamedTuple):
+    """A forecast kept in memory by a prefetcher.
+
+    Attributes:
+        forecast_df (Optional[pd.DataFrame]): The last forecast received (None if never received).
+        fetched_at (Optional[float]): Time (`time.time()`) of the last successful refresh.
+        changed_at (Optional[float]): Time of the last refresh that received new data (e.g. a new run).
+        error (Optional[str]): The error of the last refresh, if it failed.
+    """
+
+    forecast_df: Optional[pd.DataFrame] = None
+    fetched_at: Optional[float] = None
+    changed_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+# pylint: disable=too-many-instance-attributes
+class ForecastPrefetcher:
+    """Refreshes the forecasts of a set of sites in a background thread, and serves them from memory.
+
+    Attributes:
+        refresh_interval (float): Time between two refreshes, in seconds (the forecast run frequency).
+        run_delay (float): Delay after each run time before refreshing, in seconds (the run availability delay).
+        max_age (float): Age above which a forecast is considered stale and is no longer served by `get_forecast`.
+
+    Example:
+        Keep the forecast of the dispatched sites warm, refreshing them 2 minutes after each 15 minutes run::
+
+            with ForecastPrefetcher(["SITE_UUID_1", "SITE_UUID_2"], refresh_interval=900, run_delay=120):
+                forecast_df = get_forecast("SITE_UUID_1")  # served from memory
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        site_uuids: Iterable[str],
+        refresh_interval: float = 900,
+        run_delay: float = 0,
+        max_age: Optional[float] = None,
+        time_step: Optional[int] = None,
+        horizon: Optional[int] = None,
+        precision: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        use_timestamp_format: bool = False,
+        time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+        object_type: str = "pvsystem",
+        client: Optional[SteadysunAPI] = None,
+        max_workers: int = 8,
+    ):
+        """Initializes a stopped prefetcher.
+
+        Args:
+            site_uuids (Iterable[str]): The UUIDs of the sites to keep warm.
+            refresh_interval (float): Time between two refreshes, in seconds (default is 900).
+            run_delay (float): Delay after each run time before refreshing, in seconds (default is 0).
+            max_age (Optional[float]): Age in seconds above which a forecast is no longer served by `get_forecast`
+                (default is twice the refresh interval).
+            time_step (Optional[int]): The time step of the forecast (in minutes).
+            horizon (Optional[int]): The horizon of the forecast (in minutes).
+            precision (Optional[int]): Maximal number of decimal places.
+            fields (Optional[List[str]]): The fields to include in the forecast.
+            use_timestamp_format (bool): Should the timestamp format be used instead of iso_8601 for date.
+            time_stamp_unit (Optional[Literal["ms", "s"]]): The unit of the time stamp (if use_timestamp_format).
+            object_type (str): The type of the forecasted components (default is "pvsystem").
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+            max_workers (int): The maximal number of concurrent API calls of a refresh (default is 8).
+
+        Raises:
+            ValueError: If the refresh interval is not positive.
+        """
+        if refresh_interval <= 0:
+            raise ValueError(f"The refresh interval must be positive (got {refresh_interval}).")
+        self.refresh_interval = refresh_interval
+        self.run_delay = run_delay
+        self.max_age = 2 * refresh_interval if max_age is None else max_age
+        self.object_type = object_type
+        self.max_workers = max_workers
+        self._client = client
+        self._parameters = _get_forecast_parameters(
+            time_step=time_step,
+            horizon=horizon,
+            precision=precision,
+            fields=fields,
+            date_time_format="time_stamp" if use_timestamp_format else None,
+            time_stamp_unit=time_stamp_unit,
+        )
+        self._entries: Dict[str, PrefetchedForecast] = {site_uuid: PrefetchedForecast() for site_uuid in site_uuids}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def client(self) -> SteadysunAPI:
+        """The API client used to refresh the forecasts."""
+        return self._client or get_default_client()
+
+    @property
+    def site_uuids(self) -> List[str]:
+        """The UUIDs of the sites kept warm."""
+        return list(self._entries)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_sites(self, site_uuids: Iterable[str]):
+        """Adds sites to keep warm (fetched at the next refresh).
+
+        Args:
+            site_uuids (Iterable[str]): The UUIDs of the sites.
+        """
+        with self._lock:
+            for site_uuid in site_uuids:
+                self._entries.setdefault(site_uuid, PrefetchedForecast())
+
+    def remove_sites(self, site_uuids: Iterable[str]):
+        """Stops keeping sites warm.
+
+        Args:
+            site_uuids (Iterable[str]): The UUIDs of the sites.
+        """
+        with self._lock:
+            for site_uuid in site_uuids:
+                self._entries.pop(site_uuid, None)
+
+    def next_refresh_time(self, now: Optional[float] = None) -> float:
+        """Gets the time of the next refresh, aligned with the forecast run schedule.
+
+        Args:
+            now (Optional[float]): The current time (default is `time.time()`).
+
+        Returns:
+            float: The time (`time.time()`) of the next refresh.
+        """
+        now = time.time() if now is None else now
+        runs = math.floor((now - self.run_delay) / self.refresh_interval) + 1
+        return runs * self.refresh_interval + self.run_delay
+
+    def refresh(self):
+        """Fetches the forecasts of all the sites now (a failed site keeps its previous forecast)."""
+        client = self.client
+        params = self._parameters.to_dict()
+        site_uuids = self.site_uuids
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                site_uuid: executor.submit(
+                    client.concurrency_limiter.call,
+                    _fetch_forecast,
+                    client,
+                    self.object_type,
+                    site_uuid,
+                    params,
+                    priority=BATCH,
+                )
+                for site_uuid in site_uuids
+            }
+            for site_uuid, future in futures.items():
+                try:
+                    forecast_df = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.warning(f"Failed to refresh the forecast of {site_uuid}: {error}")
+                    self._update(site_uuid, error=str(error))
+                else:
+                    self._update(site_uuid, forecast_df=forecast_df)
+
+    def _update(self, site_uuid: str, forecast_df: Optional[pd.DataFrame] = None, error: Optional[str] = None):
+        """Stores the outcome of the refresh of a site."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(site_uuid)
+            if entry is None:  # removed during the refresh
+                return
+            if forecast_df is None:
+                self._entries[site_uuid] = entry._replace(error=error)
+                return
+            changed = entry.forecast_df is None or not entry.forecast_df.equals(forecast_df)
+            self._entries[site_uuid] = PrefetchedForecast(
+                forecast_df=forecast_df,
+                fetched_at=now,
+                changed_at=now if changed else entry.changed_at,
+                error=None,
+            )
+
+    def get(self, site_uuid: str) -> Optional[PrefetchedForecast]:
+        """Gets the forecast kept in memory for a site, with its staleness metadata.
+
+        Args:
+            site_uuid (str): The UUID of the site.
+
+        Returns:
+            Optional[PrefetchedForecast]: The prefetched forecast (None if the site is not kept warm). Its DataFrame
+                is shared, so it must not be modified.
+        """
+        return self._entries.get(site_uuid)
+
+    def lookup(self, key: Tuple[str, str, str], token: str) -> Optional[pd.DataFrame]:
+        """Gets a copy of a fresh forecast, for `get_forecast`.
+
+        Args:
+            key (Tuple[str, str, str]): The object type, site UUID and forecast parameters key.
+            token (str): The API token of the caller.
+
+        Returns:
+            Optional[pd.DataFrame]: A copy of the forecast, with `attrs["fetched_at"]` (None if not fresh or not
+                prefetched with the same parameters and account).
+        """
+        object_type, site_uuid, parameters_key = key
+        if object_type != self.object_type or parameters_key != self._parameters.key:
+            return None
+        entry = self._entries.get(site_uuid)
+        if entry is None or entry.forecast_df is None or time.time() - entry.fetched_at > self.max_age:
+            return None
+        if token != self.client.token:
+            return None
+        forecast_df = entry.forecast_df.copy()
+        forecast_df.attrs["fetched_at"] = entry.fetched_at
+        return forecast_df
+
+    def status(self) -> pd.DataFrame:
+        """Gets the staleness metadata of each site.
+
+        Returns:
+            pd.DataFrame: By site UUID, the time of the last refresh (`fetched_at`) and of the last new data
+                (`changed_at`), the `age` of the forecast in seconds, whether it is `stale` and the last `error`.
+        """
+        now = time.time()
+        entries = dict(self._entries)
+        status_df = pd.DataFrame(
+            {
+                "fetched_at": [entry.fetched_at for entry in entries.values()],
+                "changed_at": [entry.changed_at for entry in entries.values()],
+                "error": [entry.error for entry in entries.values()],
+            },
+            index=pd.Index(list(entries), name="site_uuid"),
+            dtype=object,
+        )
+        status_df["fetched_at"] = pd.to_numeric(status_df["fetched_at"])
+        status_df["changed_at"] = pd.to_numeric(status_df["changed_at"])
+        status_df["age"] = now - status_df["fetched_at"]
+        status_df["stale"] = ~(status_df["age"] <= self.max_age)
+        return status_df
+
+    def start(self, wait: bool = True) -> "ForecastPrefetcher":
+        """Starts refreshing the forecasts in a background thread, and serving them to `get_forecast`.
+
+        Args:
+            wait (bool): Make the first refresh before returning (default is True).
+
+        Returns:
+            ForecastPrefetcher: The prefetcher itself.
+
+        Raises:
+            RuntimeError: If the thread of a previous `stop` is still finishing its refresh.
+        """
+        if self.running:
+            if self._stop.is_set():
+                raise RuntimeError("The prefetcher is still stopping: wait for the end of its ongoing refresh.")
+            return self
+        self._stop.clear()
+        if wait:
+            self.refresh()
+        self._thread = threading.Thread(
+            target=self._run, kwargs={"refresh_now": not wait}, name="ForecastPrefetcher", daemon=True
+        )
+        self._thread.start()
+        with forecast._PREFETCHERS_LOCK:  # pylint: disable=protected-access
+            forecast._PREFETCHERS.append(self)  # pylint: disable=protected-access
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the background thread (the forecasts are no longer served to `get_forecast`).
+
+        If the ongoing refresh does not end before the timeout, the thread ends after it (`running` is True until
+        then), and the prefetcher can't be started again before.
+
+        Args:
+            timeout (Optional[float]): Maximal time to wait for the end of an ongoing refresh (default is no limit).
+        """
+        with forecast._PREFETCHERS_LOCK:  # pylint: disable=protected-access
+            if self in forecast._PREFETCHERS:  # pylint: disable=protected-access
+                forecast._PREFETCHERS.remove(self)  # pylint: disable=protected-access
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def _run(self, refresh_now: bool):
+        """Refreshes the forecasts at each run time, until stopped (a failed refresh is retried at the next run)."""
+        if refresh_now:
+            self._refresh_safely()
+        while not self._stop.wait(max(0.0, self.next_refresh_time() - time.time())):
+            self._refresh_safely()
+
+    def _refresh_safely(self):
+        """Refreshes the forecasts in the background thread, logging the errors instead of stopping the thread."""
+        try:
+            self.refresh()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to refresh the prefetched forecasts.")
+
+    def __enter__(self) -> "ForecastPrefetcher":
+        """Starts the prefetcher."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the prefetcher."""
+        self.stop()
@@ -0,0 +1,373 @@
+"""This module computes the power of PV systems locally, from forecast weather fields and their configuration.
+
+Answering a what-if question (another inclination, inverter, racking, ...) with the API needs a configuration update
+and a new forecast. This module runs a simplified version of the physics chain described by the PV system expert
+parameters, with NumPy operations vectorized over time steps, PV arrays and PV systems, and without API calls:
+
+1. Solar position (Spencer/NOAA approximations), with the timestamp interval of the irradiances parameters.
+2. Decomposition of the global horizontal irradiance into direct and diffuse components (Erbs).
+3. Surface orientation: fixed, single-axis trackers (horizontal axis along the array orientation, with backtracking)
+   or double-axis trackers.
+4. Transposition to the plane of array (Hay-Davies) and reflection losses on the direct irradiance (ASHRAE).
+5. Cell temperature (SAPM), with the parameters of the racking and module type.
+6. DC power (PVWatts), with the temperature coefficient of the arrays, and the losses parameters.
+7. AC power (PVWatts inverter), clipped to the inverter nominal power.
+
+The decomposition, angle-of-incidence and spectral models of the irradiances parameters are not all available
+locally: Erbs and ASHRAE are always used, and spectral, bifacial and self-shading effects are ignored. The results
+are meant to compare configurations, not to replace the Steadysun forecasts.
+
+Attributes:
+    GHI_FIELD (str): The forecast field of the global horizontal irradiance (W/m²).
+    TEMPERATURE_FIELD (str): The forecast field of the air temperature (°C).
+
+Functions:
+    solar_position: Computes the solar zenith and azimuth.
+    simulate_fleet_power: Computes the AC power of a fleet of PV systems.
+    simulate_power: Computes the AC power of a PV system from its forecast.
+"""
+
+from typing import Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .fleet import PVFleet
+from .forecast import _to_datetime_index
+from .forecast_store import _to_nanoseconds
+from .models.pvsystem import ModuleType, PVType, Racking, TimestampInterval
+from .pvsystem import PVSystem
+
+GHI_FIELD = "all_sky_global_horizontal_irradiance"
+TEMPERATURE_FIELD = "2m_temperature"
+
+ArrayLike = Union[float, np.ndarray, pd.Series, pd.DataFrame]
+
+_DEFAULT_ALBEDO = 0.25
+_DEFAULT_WIND_SPEED = 1.0
+_DEFAULT_ETA_INV_NOM = 0.96
+_ETA_INV_REF = 0.9637
+_ASHRAE_B = 0.05
+_MIN_COS_ZENITH = 0.065
+_MAX_ZENITH = 87.0
+_SOLAR_CONSTANT = 1367.0
+_SECONDS_PER_DAY = 86400.0
+_DAYS_PER_YEAR = 365.2422
+
+# SAPM cell temperature parameters (a, b, delta_t) by racking and module type
+_SAPM_PARAMETERS = {
+    (Racking.open_rack, ModuleType.glass_glass): (-3.47, -0.0594, 3.0),
+    (Racking.close_mount, ModuleType.glass_glass): (-2.98, -0.0471, 1.0),
+    (Racking.open_rack, ModuleType.glass_polymer): (-3.56, -0.0750, 3.0),
+    (Racking.insulated_back, ModuleType.glass_polymer): (-2.81, -0.0455, 0.0),
+    # Not measured, approximated with the other module type
+    (Racking.close_mount, ModuleType.glass_polymer): (-2.98, -0.0471, 1.0),
+    (Racking.insulated_back, ModuleType.glass_glass): (-2.81, -0.0455, 0.0),
+}
+
+
+# Losses parameters applied as percentages of the DC power (the aging is a percentage per year of age)
+def _sapm_table() -> np.ndarray:
+    """Build the SAPM parameters lookup table, indexed by racking and module type codes."""
+    table = np.full((max(m.value for m in Racking) + 1, max(m.value for m in ModuleType) + 1, 3), np.nan)
+    for (racking, module_type), parameters in _SAPM_PARAMETERS.items():
+        table[racking.value, module_type.value] = parameters
+    return table
+
+
+_SAPM_TABLE = _sapm_table()
+
+
+def _cos(degrees: np.ndarray) -> np.ndarray:
+    """Cosine of angles in degrees."""
+    return np.cos(np.radians(degrees))
+
+
+def _sin(degrees: np.ndarray) -> np.ndarray:
+    """Sine of angles in degrees."""
+    return np.sin(np.radians(degrees))
+
+
+def _day_angle(seconds: np.ndarray) -> np.ndarray:
+    """Get the fractional year angle (radians, 0 on January 1st) of times in seconds since epoch."""
+    days = (seconds - 946684800.0) / _SECONDS_PER_DAY  # since 2000-01-01
+    return 2 * np.pi * np.mod(days, _DAYS_PER_YEAR) / _DAYS_PER_YEAR
+
+
+def _solar_position_seconds(
+    seconds: np.ndarray, latitude: np.ndarray, longitude: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the solar zenith and azimuth (degrees) of times in seconds since epoch (broadcast)."""
+    gamma = _day_angle(seconds)
+    equation_of_time = 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(gamma)
+        - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma)
+        - 0.040849 * np.sin(2 * gamma)
+    )
+    declination = (
+        0.006918
+        - 0.399912 * np.cos(gamma)
+        + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma)
+        + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma)
+        + 0.00148 * np.sin(3 * gamma)
+    )
+    true_solar_minutes = np.mod(seconds, _SECONDS_PER_DAY) / 60 + equation_of_time + 4 * longitude
+    hour_angle = np.radians(true_solar_minutes / 4 - 180)
+    latitude = np.radians(latitude)
+
+    cos_zenith = np.sin(latitude) * np.sin(declination) + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+    zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+    azimuth = np.degrees(
+        np.arctan2(np.sin(hour_angle), np.cos(hour_angle) * np.sin(latitude) - np.tan(declination) * np.cos(latitude))
+    )
+    return zenith, np.mod(azimuth + 180, 360)
+
+
+def solar_position(
+    times: pd.DatetimeIndex, latitude: Union[float, np.ndarray], longitude: Union[float, np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the solar zenith and azimuth, for each time and location.
+
+    The approximations are accurate to a few tenths of a degree, enough for PV power modelling.
+
+    Args:
+        times (pd.DatetimeIndex): The times (naive times are considered as UTC).
+        latitude (Union[float, np.ndarray]): The latitude of each location (degrees).
+        longitude (Union[float, np.ndarray]): The longitude of each location (degrees).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The zenith and the azimuth (degrees, clockwise from north), with shape
+            (n_times, n_locations).
+    """
+    seconds = _to_nanoseconds(_to_datetime_index(pd.DatetimeIndex(times))) / 1e9
+    return _solar_position_seconds(seconds[:, None], np.atleast_1d(latitude)[None], np.atleast_1d(longitude)[None])
+
+
+def _extraterrestrial_irradiance(seconds: np.ndarray) -> np.ndarray:
+    """Compute the extraterrestrial normal irradiance (W/m²) of times in seconds since epoch."""
+    gamma = _day_angle(seconds)
+    return _SOLAR_CONSTANT * (
+        1.00011
+        + 0.034221 * np.cos(gamma)
+        + 0.00128 * np.sin(gamma)
+        + 0.000719 * np.cos(2 * gamma)
+        + 0.000077 * np.sin(2 * gamma)
+    )
+
+
+def _erbs(ghi: np.ndarray, zenith: np.ndarray, extra_irradiance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Decompose the global horizontal irradiance into direct normal and diffuse horizontal irradiances (Erbs)."""
+    cos_zenith = np.maximum(_cos(zenith), _MIN_COS_ZENITH)
+    clearness = np.clip(ghi / (extra_irradiance * cos_zenith), 0, 1)
+    diffuse_fraction = np.where(
+        clearness <= 0.22,
+        1 - 0.09 * clearness,
+        np.where(
+            clearness <= 0.8,
+            0.9511 - 0.1604 * clearness + 4.388 * clearness**2 - 16.638 * clearness**3 + 12.336 * clearness**4,
+            0.165,
+        ),
+    )
+    dhi = np.where(zenith < _MAX_ZENITH, diffuse_fraction * ghi, ghi)
+    dni = np.where(zenith < _MAX_ZENITH, (ghi - dhi) / cos_zenith, 0.0)
+    return dni, dhi
+
+
+def _single_axis_rotation(
+    zenith: np.ndarray, azimuth: np.ndarray, axis_azimuth: np.ndarray, max_angle: np.ndarray, gcr: np.ndarray
+) -> np.ndarray:
+    """Compute the rotation (degrees, positive towards axis_azimuth + 90) of horizontal single-axis trackers.
+
+    The rotation is limited to `max_angle`, and backtracks to avoid row-to-row shading where `gcr` is not NaN.
+    """
+    x = _sin(zenith) * _sin(azimuth - axis_azimuth)
+    rotation = np.degrees(np.arctan2(x, _cos(zenith)))
+    cos_rotation = np.clip(_cos(rotation) / gcr, -1, 1)
+    correction = np.nan_to_num(-np.sign(rotation) * np.degrees(np.arccos(cos_rotation)))
+    rotation = np.clip(rotation + correction, -max_angle, max_angle)
+    return np.where(zenith < 90, rotation, 0.0)
+
+
+def _to_matrix(values: ArrayLike, fleet: PVFleet, n_times: int, name: str) -> np.ndarray:
+    """Broadcast a weather input (scalar, per time, or per time and system) to shape (n_times, n_systems)."""
+    if isinstance(values, pd.DataFrame):
+        missing = np.setdiff1d(fleet.uuids, values.columns.astype(str))
+        if len(missing):
+            raise ValueError(f"Missing systems in the {name} input: {missing.tolist()}")
+        values = values.set_axis(values.columns.astype(str), axis=1)[list(fleet.uuids)]
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[:, None]
+    try:
+        return np.broadcast_to(array, (n_times, len(fleet)))
+    except ValueError:
+        raise ValueError(f"The {name} input must have one row per time and one column per system.") from None
+
+
+def _system_parameters(fleet: PVFleet, albedo: Optional[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the albedo, timestamp interval code and DC losses factor of each system (with the default albedo)."""
+    systems = fleet.systems
+    if albedo is not None:
+        albedos = np.full(len(fleet), albedo, dtype=np.float64)
+    else:
+        albedos = np.where(np.isnan(systems["albedo"]), _DEFAULT_ALBEDO, systems["albedo"])
+    return albedos, systems["timestamp_interval"], systems["losses_factor"]
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def simulate_fleet_power(
+    fleet: PVFleet,
+    times: pd.DatetimeIndex,
+    ghi: ArrayLike,
+    temp_air: ArrayLike,
+    wind_speed: ArrayLike = _DEFAULT_WIND_SPEED,
+    albedo: Optional[float] = None,
+) -> pd.DataFrame:
+    """Computes the AC power of every PV system of a fleet, in a single vectorized pass.
+
+    The albedo, timestamp interval and losses factor of each system are read from the fleet (see
+    `fleet.SYSTEM_DTYPE`). The time step of the timestamp interval correction is the median step of `times`.
+
+    Args:
+        fleet (PVFleet): The PV systems.
+        times (pd.DatetimeIndex): The times of the weather inputs (naive times are considered as UTC).
+        ghi (ArrayLike): The global horizontal irradiance (W/m²): a scalar, one value per time, or one value per
+            time and system (array of shape (n_times, n_systems) or DataFrame with system UUIDs as columns).
+        temp_air (ArrayLike): The air temperature (°C), with the same shapes as `ghi`.
+        wind_speed (ArrayLike): The wind speed (m/s), with the same shapes as `ghi` (default is 1 m/s).
+        albedo (Optional[float]): The ground albedo, overriding the irradiances parameters (default is 0.25 for the
+            systems without irradiances parameters).
+
+    Returns:
+        pd.DataFrame: The AC power of each system (W), indexed by time, with the system UUIDs as columns.
+
+    Raises:
+        ValueError: If a weather input doesn't match the times and systems.
+
+    Example:
+        Compute the production of a fleet, from the forecast fields of each site (DataFrames with the site UUIDs as
+        columns)::
+
+            fleet = PVFleet.from_pvsystems(pvsystems)
+            power_df = simulate_fleet_power(fleet, ghi_df.index, ghi_df, temperature_df)
+    """
+    times = _to_datetime_index(pd.DatetimeIndex(times))
+    n_times = len(times)
+    ghi = _to_matrix(ghi, fleet, n_times, "ghi")
+    temp_air = _to_matrix(temp_air, fleet, n_times, "temp_air")
+    wind_speed = _to_matrix(wind_speed, fleet, n_times, "wind_speed")
+    systems, arrays = fleet.systems, fleet.arrays
+    albedos, intervals, losses_factors = _system_parameters(fleet, albedo)
+
+    # Solar position at the middle of each time interval
+    seconds = _to_nanoseconds(times) / 1e9
+    step = float(np.median(np.diff(seconds))) if n_times > 1 else 0.0
+    shifts = np.select(
+        [intervals == TimestampInterval.left.value, intervals == TimestampInterval.right.value], [step / 2, -step / 2]
+    )
+    system_seconds = seconds[:, None] + shifts[None]
+    zenith, azimuth = _solar_position_seconds(system_seconds, systems["lat"][None], systems["lon"][None])
+    extra_irradiance = _extraterrestrial_irradiance(system_seconds)
+    dni, dhi = _erbs(ghi, zenith, extra_irradiance)
+
+    # Everything per PV array from here, shape (n_times, n_arrays)
+    system_of = arrays["system"]
+    zenith, azimuth, dni, dhi = zenith[:, system_of], azimuth[:, system_of], dni[:, system_of], dhi[:, system_of]
+    pv_type = systems["pv_type"][system_of]
+    rotation = _single_axis_rotation(
+        zenith,
+        azimuth,
+        arrays["orientation"],
+        np.nan_to_num(systems["tracker_max_angle"][system_of], nan=90.0),
+        np.where(systems["tracker_backtrack"][system_of], systems["tracker_gcr"][system_of], np.nan),
+    )
+    single_axis, double_axis = pv_type == PVType.single_axis.value, pv_type == PVType.double_axis.value
+    tilt = np.where(single_axis, np.abs(rotation), np.where(double_axis, np.minimum(zenith, 90), arrays["inclination"]))
+    surface_azimuth = np.where(
+        single_axis,
+        arrays["orientation"] + np.where(rotation >= 0, 90, -90),
+        np.where(double_axis, azimuth, arrays["orientation"]),
+    )
+    cos_aoi = _cos(zenith) * _cos(tilt) + _sin(zenith) * _sin(tilt) * _cos(azimuth - surface_azimuth)
+    cos_aoi = np.clip(np.where(zenith < 90, cos_aoi, 0.0), 0, 1)
+
+    # Plane of array irradiance (Hay-Davies), with the ASHRAE reflection losses on the direct irradiance
+    anisotropy = np.clip(dni / extra_irradiance[:, system_of], 0, 1)
+    ratio = cos_aoi / np.maximum(_cos(zenith), 0.01745)
+    sky_diffuse = dhi * (anisotropy * ratio + (1 - anisotropy) * (1 + _cos(tilt)) / 2)
+    ground_diffuse = ghi[:, system_of] * albedos[system_of] * (1 - _cos(tilt)) / 2
+    iam = np.clip(1 - _ASHRAE_B * (1 / np.maximum(cos_aoi, 1e-6) - 1), 0, 1)
+    poa = dni * cos_aoi * iam + sky_diffuse + ground_diffuse
+
+    # Cell temperature (SAPM) and DC power (PVWatts)
+    a, b, delta_t = np.moveaxis(_SAPM_TABLE[arrays["racking"], arrays["module_type"]], -1, 0)
+    temp_cell = poa * np.exp(a + b * wind_speed[:, system_of]) + temp_air[:, system_of] + poa / 1000 * delta_t
+    dc_power = arrays["pdc0"] * poa / 1000 * (1 + arrays["power_temp_coeff"] / 100 * (temp_cell - 25))
+
+    # Sum by system, losses and AC power (PVWatts inverter)
+    bounds = np.searchsorted(system_of, np.arange(len(systems) + 1))
+    has_arrays = bounds[1:] > bounds[:-1]
+    system_dc = np.zeros((n_times, len(systems)))
+    if len(arrays):
+        system_dc[:, has_arrays] = np.add.reduceat(dc_power, bounds[:-1][has_arrays], axis=1)
+    system_dc = np.maximum(system_dc * losses_factors, 0)
+
+    inverter_pdc0 = np.where(systems["has_inverter"], systems["inverter_pdc0"], fleet.pdc0)
+    eta_inv_nom = np.where(systems["has_inverter"], systems["inverter_eta_inv_nom"], _DEFAULT_ETA_INV_NOM)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zeta = system_dc / inverter_pdc0
+        efficiency = eta_inv_nom / _ETA_INV_REF * (-0.0162 * zeta - 0.0059 / zeta + 0.9858)
+        ac_power = np.where(system_dc > 0, np.clip(efficiency * system_dc, 0, eta_inv_nom * inverter_pdc0), 0.0)
+    ac_power[np.isnan(ghi) | np.isnan(temp_air) | np.isnan(wind_speed)] = np.nan
+    return pd.DataFrame(ac_power, index=times, columns=pd.Index(fleet.uuids, name="uuid"))
+
+
+def simulate_power(
+    pvsystem: PVSystem,
+    forecast_df: pd.DataFrame,
+    wind_speed: ArrayLike = _DEFAULT_WIND_SPEED,
+    albedo: Optional[float] = None,
+    time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+) -> pd.Series:
+    """Computes the AC power of a PV system from its forecast, without calling the API.
+
+    Args:
+        pvsystem (PVSystem): The PV system (e.g. a modified copy, to answer a what-if question).
+        forecast_df (pd.DataFrame): The forecast, as returned by `get_forecast`, with the `GHI_FIELD` and
+            `TEMPERATURE_FIELD` fields.
+        wind_speed (ArrayLike): The wind speed (m/s), a scalar or one value per time (default is 1 m/s).
+        albedo (Optional[float]): The ground albedo, overriding the irradiances parameters.
+        time_stamp_unit (Optional[Literal["ms", "s"]]): The unit of the index (if made of time stamps).
+
+    Returns:
+        pd.Series: The AC power (W), indexed by time (UTC).
+
+    Raises:
+        KeyError: If a required field is missing from the forecast.
+
+    Example:
+        Compare the forecast production of a PV system with a steeper inclination::
+
+            forecast_df = get_forecast("SITE_UUID", fields=[GHI_FIELD, TEMPERATURE_FIELD])
+            pvsystem = PVSystem.from_uuid("SITE_UUID")
+            steeper = pvsystem.model_copy(deep=True)
+            steeper.expert_params.arrays[0].inclination = 35
+            gain = simulate_power(steeper, forecast_df).sum() / simulate_power(pvsystem, forecast_df).sum()
+    """
+    missing = [field for field in (GHI_FIELD, TEMPERATURE_FIELD) if field not in forecast_df.columns]
+    if missing:
+        raise KeyError(f"Missing fields in the forecast: {missing}")
+    times = _to_datetime_index(forecast_df.index, time_stamp_unit)
+    power_df = simulate_fleet_power(
+        PVFleet.from_pvsystems([pvsystem]),
+        times,
+        forecast_df[GHI_FIELD].to_numpy(dtype=np.float64),
+        forecast_df[TEMPERATURE_FIELD].to_numpy(dtype=np.float64),
+        wind_speed=wind_speed.to_numpy(dtype=np.float64) if isinstance(wind_speed, pd.Series) else wind_speed,
+        albedo=albedo,
+    )
+    return power_df.iloc[:, 0].rename("ac_power").rename_axis(None)
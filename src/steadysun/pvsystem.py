@@ -6,22 +6,24 @@ including expert parameters. A helper function is also provided to get the UUIDs
 
 Classes:
     PVSystem: A class representing a photovoltaic system, allowing operations such as creation, update, and deletion.
+    PVSystemSummary: A lightweight view of a PV system, loading its expert parameters only when accessed.
 
 Functions:
     get_pvsystem_uuids(): Retrieves all your PV system UUIDs and names from Steadyweb API
+    get_pvsystem_summaries(): Retrieves a lightweight summary of all your PV systems from Steadyweb API
 """
 
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
 from geojson import Point
-from pydantic import FiniteFloat, NonNegativeFloat, StrictStr, field_validator
+from pydantic import FiniteFloat, NonNegativeFloat, PrivateAttr, StrictStr, field_validator
 from pydantic_geojson import PointModel
 
 from steadysun.models._utils import TypeCheckingBaseModel
 from steadysun.models.pvsystem import PVSystemExpertParams, PVType
-from steadysun.steadysun_api import SteadysunAPI
+from steadysun.steadysun_api import SteadysunAPI, get_default_client
 
 
 class PVSystem(TypeCheckingBaseModel):
@@ -66,21 +68,21 @@ class PVSystem(TypeCheckingBaseModel):
         Returns:
             PVSystem: An instance of the PVSystem class.
         """
-        expert_fields = PVSystemExpertParams.model_fields.keys()
-        expert_params = PVSystemExpertParams(**{field: steadyweb_pv_config.pop(field) for field in expert_fields})
+        expert_params = _pop_expert_params(steadyweb_pv_config)
         return cls(**steadyweb_pv_config, expert_params=expert_params)
 
     @classmethod
-    def from_uuid(cls, uuid):
+    def from_uuid(cls, uuid, client: Optional[SteadysunAPI] = None):
         """Retrieves a PVSystem instance based on its UUID from the Steadyweb API.
 
         Args:
             uuid (UUID): The unique identifier of the PV system.
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
 
         Returns:
             PVSystem: An instance of the PVSystem class.
         """
-        steadyweb_pv_config = SteadysunAPI().get(f"pvsystem/{uuid}/")
+        steadyweb_pv_config = (client or get_default_client()).get(f"pvsystem/{uuid}/")
         return PVSystem._from_steadyweb_config(steadyweb_pv_config)
 
     @classmethod
@@ -91,6 +93,10 @@ class PVSystem(TypeCheckingBaseModel):
         pdc0: NonNegativeFloat,
         orientation: NonNegativeFloat = 180,
         inclination: NonNegativeFloat = 30,
+        client: Optional[SteadysunAPI] = None,
+        altitude: Optional[NonNegativeFloat] = None,
+        pv_type: Union[PVType, int, str] = PVType.single_axis,
+        array_params: Optional[Dict[str, Any]] = None,
     ):
         """Creates a new PVSystem on Steadyweb with the provided parameters.
 
@@ -100,6 +106,12 @@ class PVSystem(TypeCheckingBaseModel):
             pdc0 (NonNegativeFloat): Peak power of the PV system (in  W).
             orientation (NonNegativeFloat): Orientation of the PV system in degrees (default is 180).
             inclination (NonNegativeFloat): Inclination of the PV system in degrees (default is 30).
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+            altitude (Optional[NonNegativeFloat]): Altitude of the PV system (default is the one of the API).
+            pv_type (Union[PVType, int, str]): Type of the PV system, as a member, int code or name
+                (default is single_axis).
+            array_params (Optional[Dict[str, Any]]): Other parameters of the array (e.g. `module_material`,
+                `power_temp_coeff`), with enum members given as int codes (default is the ones of the API).
 
         Returns:
             PVSystem: The newly created PVSystem instance.
@@ -109,9 +121,10 @@ class PVSystem(TypeCheckingBaseModel):
             "name": name,
             "location": Point(location),
             "installation_date": str(datetime.now().date()),
-            "pv_type": 2,
+            "pv_type": PVType.from_value(pv_type).value,
             "arrays": [
                 {
+                    **(array_params or {}),
                     "pvmodules_pdc0": pdc0,
                     "orientation": orientation,
                     "inclination": inclination,
@@ -119,7 +132,9 @@ class PVSystem(TypeCheckingBaseModel):
             ],
             "requested_fields": [1, 13],
         }
-        new_pvsystem_config = SteadysunAPI().post("pvsystem/", data=config)
+        if altitude is not None:
+            config["altitude"] = altitude
+        new_pvsystem_config = (client or get_default_client()).post("pvsystem/", data=config)
         return PVSystem._from_steadyweb_config(new_pvsystem_config)
 
     def _to_steadyweb_dict(self) -> dict:
@@ -132,30 +147,139 @@ class PVSystem(TypeCheckingBaseModel):
         expert_params_dict = model_dict.pop("expert_params")
         return {**model_dict, **expert_params_dict}
 
-    def save_changes(self) -> dict:
+    def save_changes(self, client: Optional[SteadysunAPI] = None) -> dict:
         """Saves changes made to the PVSystem by sending an updated configuration to the Steadyweb API.
 
+        Args:
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+
         Returns:
             dict: The response from the Steadyweb API after patching the PV system.
         """
         steadyweb_patch_config = self._to_steadyweb_dict()
-        return SteadysunAPI().patch(f"pvsystem/{str(self.uuid)}/", data=steadyweb_patch_config)
+        return (client or get_default_client()).patch(f"pvsystem/{str(self.uuid)}/", data=steadyweb_patch_config)
 
-    def delete(self):
+    def delete(self, client: Optional[SteadysunAPI] = None):
         """Deletes the PVSystem from the Steadyweb API. This action is irreversible.
 
+        Args:
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+
         Returns:
             dict: The response from the Steadyweb API after deletion.
         """
-        return SteadysunAPI().delete(f"pvsystem/{str(self.uuid)}/")
+        return (client or get_default_client()).delete(f"pvsystem/{str(self.uuid)}/")
+
+
+def _pop_expert_params(steadyweb_pv_config: dict) -> PVSystemExpertParams:
+    """Removes the expert parameters from a Steadyweb configuration and validates them.
+
+    Args:
+        steadyweb_pv_config (dict): Configuration data for the PV system from Steadyweb (modified in place).
+
+    Returns:
+        PVSystemExpertParams: The expert parameters of the PV system.
+    """
+    expert_fields = PVSystemExpertParams.model_fields.keys()
+    return PVSystemExpertParams(**{field: steadyweb_pv_config.pop(field) for field in expert_fields})
+
+
+class PVSystemSummary(TypeCheckingBaseModel):
+    """Lightweight view of a PV system, with only the fields needed to list and filter systems.
+
+    The expert parameters are only fetched and validated when `expert_params` is accessed (then kept).
 
+    Attributes:
+        uuid (UUID): Unique identifier for the PV system.
+        name (StrictStr): Name of the PV system.
+        title (Optional[StrictStr]): Title of the PV system.
+        location (Optional[PointModel]): Geolocation of the PV system.
+        pv_type (Optional[PVType]): Type of the PV system.
+    """
+
+    uuid: UUID
+    name: StrictStr
+    title: Optional[StrictStr] = None
+    location: Optional[PointModel] = None
+    pv_type: Optional[PVType] = None
+
+    _expert_params: Optional[PVSystemExpertParams] = PrivateAttr(default=None)
+    _client: Optional[SteadysunAPI] = PrivateAttr(default=None)
+
+    @field_validator("pv_type", mode="before")
+    @classmethod
+    def _convert_enum(cls, v) -> Optional[PVType]:
+        """Validates and converts the PV type value to its enum representation."""
+        return None if v is None else PVType.from_value(v)
 
-def get_pvsystem_uuids() -> Dict[str, str]:
+    @classmethod
+    def from_steadyweb_config(cls, steadyweb_pv_config: dict, client: Optional[SteadysunAPI] = None):
+        """Creates a summary from a Steadyweb configuration (e.g. an item of the PV system list), other fields
+        are ignored.
+
+        Args:
+            steadyweb_pv_config (dict): Configuration data for the PV system from Steadyweb.
+            client (Optional[SteadysunAPI]): The API client used to fetch the expert parameters
+                (default is `get_default_client()`).
+
+        Returns:
+            PVSystemSummary: The summary of the PV system.
+        """
+        summary = cls.model_validate(steadyweb_pv_config)
+        summary._client = client
+        return summary
+
+    @property
+    def expert_params_loaded(self) -> bool:
+        """Whether the expert parameters are already fetched."""
+        return self._expert_params is not None
+
+    @property
+    def expert_params(self) -> PVSystemExpertParams:
+        """Expert parameters of the PV system, fetched from the Steadyweb API on first access."""
+        if self._expert_params is None:
+            self._expert_params = _pop_expert_params(self._fetch_config())
+        return self._expert_params
+
+    def to_pvsystem(self) -> PVSystem:
+        """Retrieves the full PVSystem (and keeps its expert parameters).
+
+        Returns:
+            PVSystem: An instance of the PVSystem class.
+        """
+        pvsystem = PVSystem._from_steadyweb_config(self._fetch_config())
+        self._expert_params = pvsystem.expert_params
+        return pvsystem
+
+    def _fetch_config(self) -> dict:
+        """Fetches the full Steadyweb configuration of the PV system."""
+        return (self._client or get_default_client()).get(f"pvsystem/{self.uuid}/")
+
+
+def get_pvsystem_uuids(client: Optional[SteadysunAPI] = None) -> Dict[str, str]:
     """Retrieves all your PV system UUIDs and names.
 
+    Args:
+        client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+
     Returns:
         dict: A dictionary mapping PV system UUIDs to their corresponding names.
     """
-    response = SteadysunAPI().get_list("pvsystem/", page_limit=100, get_all_pages=True)
+    response = (client or get_default_client()).get_list("pvsystem/", page_limit=100, get_all_pages=True)
     uuids_name_dict = {pv_details["uuid"]: pv_details["name"] for pv_details in response.get("results", [])}
     return uuids_name_dict
+
+
+def get_pvsystem_summaries(client: Optional[SteadysunAPI] = None) -> List[PVSystemSummary]:
+    """Retrieves a lightweight summary of all your PV systems (expert parameters are fetched on access).
+
+    Args:
+        client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+
+    Returns:
+        List[PVSystemSummary]: The summaries of the PV systems.
+    """
+    response = (client or get_default_client()).get_list("pvsystem/", page_limit=100, get_all_pages=True)
+    return [
+        PVSystemSummary.from_steadyweb_config(pv_details, client=client) for pv_details in response.get("results", [])
+    ]
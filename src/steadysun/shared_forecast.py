@@ -0,0 +1,207 @@
+"""This module helps sharing forecast data between processes without pickling it.
+
+A forecast DataFrame is copied once into a `multiprocessing.shared_memory` segment as a contiguous NumPy block
+(one row per column, followed by the index values). Only a small picklable `SharedForecastDescriptor` has to be
+sent to the worker processes, which can then attach a zero-copy DataFrame view on the same memory.
+
+Classes:
+    SharedForecastDescriptor: Small picklable description of a forecast placed in shared memory.
+    SharedForecast: Handle on a shared memory segment holding a forecast.
+
+Functions:
+    get_shared_forecast(): Fetch a forecast and place it directly in shared memory.
+"""
+
+import sys
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from .forecast import get_forecast
+
+
+class SharedForecastDescriptor(BaseModel):
+    """Description of a forecast placed in shared memory (cheap to pickle and send to other processes).
+
+    Attributes:
+        shm_name (str): Name of the shared memory segment.
+        n_rows (int): Number of rows (time steps) of the forecast.
+        columns (List[str]): The forecast columns (fields).
+        data_dtype (str): NumPy dtype of the data block.
+        index_dtype (str): NumPy dtype of the index block.
+        index_offset (int): Offset (in bytes) of the index block inside the segment.
+        index_name (Optional[str]): Name of the index.
+    """
+
+    shm_name: str
+    n_rows: int
+    columns: List[str]
+    data_dtype: str
+    index_dtype: str
+    index_offset: int
+    index_name: Optional[str] = None
+
+    class Config:
+        """Pydantic config"""
+
+        frozen = True
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach an existing shared memory segment.
+
+    Processes started with `multiprocessing` share the resource tracker of their parent, so the segment is only
+    tracked (and unlinked at exit) once. Since python 3.13 the attaching process can explicitly opt out of tracking.
+
+    Args:
+        name (str): Name of the shared memory segment.
+
+    Returns:
+        shared_memory.SharedMemory: The attached segment.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # pylint: disable=unexpected-keyword-arg
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedForecast:
+    """Handle on a forecast stored in a shared memory segment.
+
+    The process which creates the segment (with `from_dataframe`) owns it and should `unlink` it once every
+    worker is done. Workers `attach` the segment from its descriptor and only `close` it.
+    DataFrames returned by `to_dataframe` are views on the segment: they must be released before closing it.
+
+    Example:
+        In the parent process::
+
+            with get_shared_forecast("SITE_UUID") as shared:
+                pool.map(process_forecast, [shared.descriptor] * 8)
+
+        In the worker processes::
+
+            def process_forecast(descriptor):
+                with SharedForecast.attach(descriptor) as shared:
+                    forecast_df = shared.to_dataframe()
+                    ...
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, descriptor: SharedForecastDescriptor, owner: bool):
+        """Initializes the handle, use `from_dataframe` or `attach` instead.
+
+        Args:
+            shm (shared_memory.SharedMemory): The shared memory segment.
+            descriptor (SharedForecastDescriptor): The description of the forecast stored in the segment.
+            owner (bool): Whether this handle should unlink the segment when used as a context manager.
+        """
+        self.shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+
+    @classmethod
+    def from_dataframe(cls, forecast_df: pd.DataFrame) -> "SharedForecast":
+        """Copy a forecast DataFrame into a new shared memory segment.
+
+        Args:
+            forecast_df (pd.DataFrame): The forecast data (numeric columns only).
+
+        Returns:
+            SharedForecast: The owner handle on the new segment.
+
+        Raises:
+            ValueError: If the DataFrame has non numeric columns.
+        """
+        data = forecast_df.to_numpy().T
+        if not (np.issubdtype(data.dtype, np.number) or np.issubdtype(data.dtype, np.bool_)):
+            raise ValueError(f"Only numeric forecasts can be shared (got dtype {data.dtype}).")
+        index = np.asarray(forecast_df.index)
+        if index.dtype == object:
+            index = index.astype(str)
+
+        index_offset = data.nbytes + (-data.nbytes % 8)
+        shm = shared_memory.SharedMemory(create=True, size=max(index_offset + index.nbytes, 1))
+        np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[:] = data
+        np.ndarray(index.shape, dtype=index.dtype, buffer=shm.buf, offset=index_offset)[:] = index
+
+        descriptor = SharedForecastDescriptor(
+            shm_name=shm.name,
+            n_rows=len(index),
+            columns=[str(column) for column in forecast_df.columns],
+            data_dtype=data.dtype.str,
+            index_dtype=index.dtype.str,
+            index_offset=index_offset,
+            index_name=forecast_df.index.name,
+        )
+        return cls(shm, descriptor, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: SharedForecastDescriptor) -> "SharedForecast":
+        """Attach a forecast previously placed in shared memory (usually from another process).
+
+        Args:
+            descriptor (SharedForecastDescriptor): The descriptor of the shared forecast.
+
+        Returns:
+            SharedForecast: A non-owner handle on the segment.
+        """
+        shm = _attach_shared_memory(descriptor.shm_name)
+        return cls(shm, descriptor, owner=False)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build a DataFrame view on the shared forecast (the data block is not copied).
+
+        Returns:
+            pd.DataFrame: The forecast data.
+        """
+        descriptor = self.descriptor
+        data = np.ndarray(
+            (len(descriptor.columns), descriptor.n_rows), dtype=np.dtype(descriptor.data_dtype), buffer=self.shm.buf
+        )
+        index = np.ndarray(
+            (descriptor.n_rows,),
+            dtype=np.dtype(descriptor.index_dtype),
+            buffer=self.shm.buf,
+            offset=descriptor.index_offset,
+        )
+        return pd.DataFrame(
+            data.T,
+            index=pd.Index(index, name=descriptor.index_name, copy=False),
+            columns=descriptor.columns,
+            copy=False,
+        )
+
+    def close(self):
+        """Close this process access to the segment (every DataFrame view must have been released)."""
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the segment, should only be called once by its owner."""
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedForecast":
+        """Use the handle as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the segment, and unlink it if this handle is its owner."""
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def get_shared_forecast(site_uuid: str, **forecast_kwargs) -> SharedForecast:
+    """Fetch forecast data for a specific site and place it in shared memory.
+
+    Args:
+        site_uuid (str): The UUID of the site.
+        **forecast_kwargs: Any other parameter accepted by `steadysun.forecast.get_forecast`.
+
+    Returns:
+        SharedForecast: The owner handle on the shared forecast.
+
+    Raises:
+        requests.exceptions.HTTPError: If the API request fails.
+    """
+    return SharedForecast.from_dataframe(get_forecast(site_uuid, **forecast_kwargs))
@@ -0,0 +1,275 @@
+"""This module saves the state of a process (PV systems and cached forecasts) to a local binary snapshot file.
+
+A cron-style run normally starts cold: it lists the PV systems, fetches their configurations and validates them
+all through pydantic. With a `Snapshot`, the next run loads the PV systems of the previous one from a msgpack file
+without validating them again (they were validated before being saved), lists the PV systems, and only fetches and
+validates the PV systems whose list item changed since the snapshot. The fresh forecasts of a `ForecastCache` can
+be saved and restored too (without the API token of the account, which is never written to the file).
+
+Snapshots need the optional `snapshot` dependencies (`pip install steadysun[snapshot]`). A snapshot written with
+another schema version can't be loaded (start cold instead).
+
+Attributes:
+    SCHEMA_VERSION (int): The version of the snapshot format, stored in the files.
+
+Classes:
+    Snapshot: The PV systems and cached forecasts of a process, saved to and loaded from a snapshot file.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from .forecast_cache import ForecastCache
+from .models.pvsystem import PVSystemExpertParams
+from .pvsystem import PVSystem
+from .steadysun_api import SteadysunAPI, get_default_client
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SCHEMA_VERSION = 1
+
+
+def _config_hash(config: dict) -> str:
+    """Hash a Steadyweb configuration (stable across processes)."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _construct(annotation: Any, value: Any) -> Any:
+    """Rebuild a value of a pydantic field from its JSON dump, without validation."""
+    if value is None:
+        return None
+    origin = get_origin(annotation)
+    if origin is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+        return _construct(annotation, value)
+    if origin is list:
+        (item_annotation,) = get_args(annotation) or (Any,)
+        return [_construct(item_annotation, item) for item in value]
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return annotation.model_construct(
+                **{
+                    name: _construct(field.annotation, value[name])
+                    for name, field in annotation.model_fields.items()
+                    if name in value
+                }
+            )
+        if issubclass(annotation, (Enum, UUID)):
+            return annotation(value)
+        if issubclass(annotation, tuple) and hasattr(annotation, "_fields"):  # NamedTuple
+            return annotation(*value)
+    return value
+
+
+def _frame_to_record(forecast_df: pd.DataFrame) -> dict:
+    """Convert a forecast to msgpack types."""
+    index = forecast_df.index
+    return {
+        "index": index.tolist() if pd.api.types.is_numeric_dtype(index.dtype) else index.astype(str).tolist(),
+        "columns": [str(column) for column in forecast_df.columns],
+        "values": np.ascontiguousarray(forecast_df.to_numpy(dtype=np.float64)).tobytes(),
+    }
+
+
+def _record_to_frame(record: dict) -> pd.DataFrame:
+    """Convert a forecast from msgpack types."""
+    values = np.frombuffer(record["values"], dtype=np.float64).reshape(len(record["index"]), len(record["columns"]))
+    return pd.DataFrame(values.copy(), index=pd.Index(record["index"]), columns=record["columns"])
+
+
+class Snapshot:
+    """The PV systems and cached forecasts of a process, saved to and loaded from a binary snapshot file.
+
+    Attributes:
+        saved_at (Optional[float]): Time (`time.time()`) when the snapshot was saved (None if never saved).
+
+    Example:
+        Warm-start a cron job from the snapshot of its previous run::
+
+            snapshot = Snapshot.load("state.snapshot") if os.path.exists("state.snapshot") else Snapshot()
+            changed_uuids = snapshot.refresh_pvsystems()  # only the changed PV systems are fetched
+            cache = ForecastCache(ttl=900)
+            snapshot.restore_cache(cache)
+
+            ...  # work with snapshot.pvsystems and get_forecast(..., cache=cache)
+
+            snapshot.capture_cache(cache)
+            snapshot.save("state.snapshot")
+    """
+
+    def __init__(self):
+        """Initializes an empty snapshot."""
+        self.saved_at: Optional[float] = None
+        self._pvsystems: Dict[str, PVSystem] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        self._forecasts: List[dict] = []
+
+    @property
+    def pvsystems(self) -> List[PVSystem]:
+        """The PV systems of the snapshot."""
+        return list(self._pvsystems.values())
+
+    def add_pvsystem(self, pvsystem: PVSystem, source_config: Optional[dict] = None):
+        """Adds (or replaces) a PV system.
+
+        Args:
+            pvsystem (PVSystem): The PV system.
+            source_config (Optional[dict]): The item of the PV system list it was built from, to detect its
+                changes in `refresh_pvsystems` (default is None, it is then fetched again at the next refresh).
+        """
+        uuid = str(pvsystem.uuid)
+        self._pvsystems[uuid] = pvsystem
+        self._hashes[uuid] = None if source_config is None else _config_hash(source_config)
+
+    def refresh_pvsystems(self, client: Optional[SteadysunAPI] = None, max_workers: int = 8) -> List[str]:
+        """Synchronizes the PV systems with the API, fetching and validating only the new and changed ones.
+
+        The PV system list is fetched, and each item is compared with the one the snapshot PV system was built
+        from. Changed and new PV systems are validated from their list item, or fetched if the list item doesn't
+        have the expert parameters. Deleted PV systems are removed.
+
+        Args:
+            client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+            max_workers (int): The maximal number of concurrent API calls (default is 8).
+
+        Returns:
+            List[str]: The UUIDs of the new and changed PV systems.
+        """
+        api = client or get_default_client()
+        items = api.get_list("pvsystem/", page_limit=100, get_all_pages=True).get("results", [])
+        required_fields = [name for name, field in PVSystemExpertParams.model_fields.items() if field.is_required()]
+
+        def load(item: dict) -> PVSystem:
+            if all(field in item for field in required_fields):
+                return PVSystem._from_steadyweb_config(dict(item))  # pylint: disable=protected-access
+            return PVSystem.from_uuid(item["uuid"], client=api)
+
+        hashes = {str(item["uuid"]): _config_hash(item) for item in items}
+        changed = [item for item in items if self._hashes.get(str(item["uuid"])) != hashes[str(item["uuid"])]]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = list(executor.map(lambda item: api.concurrency_limiter.call(load, item), changed))
+
+        pvsystems = {uuid: self._pvsystems[uuid] for uuid in hashes if uuid in self._pvsystems}
+        pvsystems.update({str(pvsystem.uuid): pvsystem for pvsystem in loaded})
+        self._pvsystems = {uuid: pvsystems[uuid] for uuid in hashes}
+        self._hashes = hashes
+        return [str(item["uuid"]) for item in changed]
+
+    def capture_cache(self, cache: ForecastCache, client: Optional[SteadysunAPI] = None):
+        """Replaces the cached forecasts of the snapshot with the fresh forecasts of a cache, for an account.
+
+        Args:
+            cache (ForecastCache): The forecast cache.
+            client (Optional[SteadysunAPI]): The client of the account (default is `get_default_client()`).
+        """
+        token = (client or get_default_client()).token
+        self._forecasts = [
+            {"key": list(key[1:]), "complete": complete, "age": age, **_frame_to_record(forecast_df)}
+            for key, forecast_df, complete, age in cache.export_entries()
+            if isinstance(key, tuple) and key[0] == token
+        ]
+
+    def restore_cache(self, cache: ForecastCache, client: Optional[SteadysunAPI] = None) -> int:
+        """Restores the cached forecasts of the snapshot into a cache (for an account), skipping the expired ones.
+
+        Args:
+            cache (ForecastCache): The forecast cache.
+            client (Optional[SteadysunAPI]): The client of the account (default is `get_default_client()`).
+
+        Returns:
+            int: The number of forecasts restored.
+        """
+        token = (client or get_default_client()).token
+        elapsed = 0.0 if self.saved_at is None else max(0.0, time.time() - self.saved_at)
+        return cache.import_entries(
+            ((token, *record["key"]), _record_to_frame(record), record["complete"], record["age"] + elapsed)
+            for record in self._forecasts
+            if record["age"] + elapsed <= cache.ttl
+        )
+
+    def save(self, path: Union[str, os.PathLike]):
+        """Saves the snapshot to a file (replaced atomically).
+
+        Args:
+            path (Union[str, os.PathLike]): The snapshot file.
+
+        Raises:
+            ImportError: If msgpack is not installed.
+        """
+        _check_msgpack()
+        self.saved_at = time.time()
+        path = Path(path)
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "wb") as file:
+            file.write(msgpack.packb(self._to_payload(), use_bin_type=True))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "Snapshot":
+        """Loads a snapshot from a file, without validating its PV systems again.
+
+        Args:
+            path (Union[str, os.PathLike]): The snapshot file.
+
+        Returns:
+            Snapshot: The snapshot.
+
+        Raises:
+            ImportError: If msgpack is not installed.
+            ValueError: If the snapshot was written with another schema version.
+        """
+        _check_msgpack()
+        with open(path, "rb") as file:
+            payload = msgpack.unpackb(file.read(), raw=False, strict_map_key=False)
+        return cls._from_payload(payload)
+
+    def _to_payload(self) -> Dict[str, Any]:
+        """Converts the snapshot to msgpack types."""
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "saved_at": self.saved_at,
+            "pvsystems": [
+                {"hash": self._hashes.get(uuid), "data": pvsystem.model_dump(mode="json")}
+                for uuid, pvsystem in self._pvsystems.items()
+            ],
+            "forecasts": self._forecasts,
+        }
+
+    @classmethod
+    def _from_payload(cls, payload: Dict[str, Any]) -> "Snapshot":
+        """Builds a snapshot from its decoded file content."""
+        if not isinstance(payload, dict) or payload.get("schema_version") != SCHEMA_VERSION:
+            version = payload.get("schema_version") if isinstance(payload, dict) else None
+            raise ValueError(f"Unsupported snapshot schema version {version} (expected {SCHEMA_VERSION}).")
+        snapshot = cls()
+        snapshot.saved_at = payload["saved_at"]
+        for record in payload["pvsystems"]:
+            pvsystem = _construct(PVSystem, record["data"])
+            snapshot._pvsystems[str(pvsystem.uuid)] = pvsystem
+            snapshot._hashes[str(pvsystem.uuid)] = record["hash"]
+        snapshot._forecasts = list(payload["forecasts"])
+        return snapshot
+
+    def __len__(self) -> int:
+        """The number of PV systems."""
+        return len(self._pvsystems)
+
+
+def _check_msgpack():
+    """Check that the optional msgpack dependency is installed."""
+    if msgpack is None:
+        raise ImportError("Snapshots need msgpack: pip install steadysun[snapshot]")
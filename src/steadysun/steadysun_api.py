@@ -6,19 +6,56 @@ and supports making paginated requests.
 
 Classes:
     SteadysunAPI: A class that handles HTTP requests to the Steadysun API, with authorization and response handling.
+    SteadysunAPIPool: A pool of clients, one per account, to work with several accounts concurrently.
+
+Functions:
+    get_default_client: Get the process-wide default client, used by the helpers when no client is given.
+    set_default_client: Override (or reset) the process-wide default client.
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from os import environ, getenv
-from typing import NoReturn
+from typing import Any, Callable, Dict, Iterable, Iterator, NoReturn, Optional, Union
 
 import requests
 
 from ._api import APIResponseHandler
+from ._circuit_breaker import CircuitBreaker
+from ._coalescing import SingleFlight, normalize_params
+from ._concurrency import AdaptiveConcurrencyLimiter
+from ._deadline import Deadline, DeadlineExceeded, Timeout
+from ._rate_limit import TokenBucket
+from ._scheduling import BATCH, INTERACTIVE, Priority, PriorityScheduler
+from ._transport import Transport, create_transport
 
 ENV_STEADYSUN_API_TOKEN = "STEADYSUN_API_TOKEN"
 ENV_STEADYSUN_API_URL = "STEADYSUN_API_URL"
 DEFAULT_STEADYSUN_API_URL = "https://steadyweb.steady-sun.com/api/v1/"
 
+# GET requests in flight, shared by all the SteadysunAPI instances of the process
+_IN_FLIGHT_GET_REQUESTS = SingleFlight()
+
+# Default circuit breakers, shared by all the SteadysunAPI instances of the process (one per API URL)
+_CIRCUIT_BREAKERS = {}
+_CIRCUIT_BREAKERS_LOCK = threading.Lock()
+
+
+def _get_shared_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """Get the circuit breaker shared by all the clients of an API URL.
+
+    Args:
+        base_url (str): Base URL of the API.
+
+    Returns:
+        CircuitBreaker: The shared circuit breaker.
+    """
+    with _CIRCUIT_BREAKERS_LOCK:
+        if base_url not in _CIRCUIT_BREAKERS:
+            _CIRCUIT_BREAKERS[base_url] = CircuitBreaker()
+        return _CIRCUIT_BREAKERS[base_url]
+
 
 class SteadysunAPI:
     """A class to interact with the Steadysun API.
@@ -26,28 +63,83 @@ class SteadysunAPI:
     This class provides methods for making HTTP requests (GET, POST, PUT, PATCH, DELETE)
     to the Steadysun API, handling authorization and response validation automatically.
 
+    Each instance carries its own token, base URL, HTTP transport (connection pool) and optional rate limit,
+    so several instances can work concurrently with different accounts. The default transport uses a
+    `requests.Session` (HTTP/1.1); the "http2" transport multiplexes concurrent requests over a few connections,
+    for high fan-out workloads (it needs `pip install steadysun[http2]`). With a `PriorityScheduler`, interactive
+    calls get reserved concurrency and quota, and never wait behind queued batch calls (see the `priority`
+    parameter of the request methods).
+
     Attributes:
-        timeout (int): Timeout for API requests in seconds (default is 30).
-        token (str): API token retrieved from environment variables.
+        timeout (Timeout): Default timeout for API requests in seconds, or (connect, read) timeouts.
+        endpoint_timeouts (Dict[str, Timeout]): Timeouts overriding the default one, by endpoint prefix.
+        token (str): API token (given, or retrieved from environment variables).
         base_url (str): Base URL for Steadysun API requests.
         headers (dict): Authorization headers with API token.
+        transport (Transport): The HTTP transport of the client, reusing its connections.
+        rate_limiter (Optional[TokenBucket]): Limits the number of API calls per second of the client.
+        coalesce_requests (bool): Whether concurrent identical GET requests share one API call.
+        concurrency_limiter (AdaptiveConcurrencyLimiter): Limits the concurrent calls of the bulk helpers
+            (`limit` is the current number of allowed concurrent calls).
+        circuit_breaker (CircuitBreaker): Fails API calls immediately while the API is unhealthy.
+        scheduler (Optional[PriorityScheduler]): Dispatches the API calls by priority (None if not used).
     """
 
-    def __init__(self, timeout: int = 30):
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        timeout: float = 30,
+        connect_timeout: Optional[float] = None,
+        endpoint_timeouts: Optional[Dict[str, Timeout]] = None,
+        coalesce_requests: bool = True,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        transport: Union[None, str, Transport] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+    ):
         """Initializes a SteadysunAPI instance, setting up the API token, base URL, and headers required for requests.
 
         Args:
-            timeout (int): Timeout for API requests in seconds (default is 30 seconds).
+            timeout (float): Timeout for API requests in seconds (default is 30 seconds). It is the read timeout
+                if a `connect_timeout` is given.
+            connect_timeout (Optional[float]): Timeout to establish the connections in seconds (default is `timeout`).
+            endpoint_timeouts (Optional[Dict[str, Timeout]]): Timeouts (in seconds, or (connect, read) tuples)
+                overriding the default one for the endpoints starting with the given prefixes
+                (e.g. `{"forecast/": (3, 120)}`). The longest matching prefix is used.
+            coalesce_requests (bool): Whether concurrent identical GET requests (same endpoint and parameters)
+                share one in-flight API call (default is True).
+            concurrency_limiter (Optional[AdaptiveConcurrencyLimiter]): The limiter used by concurrent bulk
+                operations such as `get_forecasts` (default is a new adaptive limiter).
+            circuit_breaker (Optional[CircuitBreaker]): The circuit breaker of the API calls
+                (default is the one shared by all the clients of the same API URL).
+            token (Optional[str]): The API token of the client (default is the one of the environment).
+            base_url (Optional[str]): Base URL of the API (default is the one of the environment, or the public one).
+            rate_limit (Optional[float]): Maximal number of API calls per second of the client (default is no limit).
+            transport (Union[None, str, Transport]): The HTTP transport: "requests" (default, HTTP/1.1), "http2"
+                (HTTP/2 with httpx) or a `Transport` instance.
+            scheduler (Optional[PriorityScheduler]): Dispatches the API calls in interactive and batch lanes
+                (default is no scheduling: all the calls are dispatched in arrival order).
 
         Raises:
-            ValueError: If the API token is not found or is invalid.
+            ValueError: If the API token is not found or is invalid, or if the transport is unknown.
+            ImportError: If the dependencies of the transport are not installed.
         """
-        self.token = self.retrieve_token_from_env()
-        self.timeout = timeout
-        self.base_url = getenv(ENV_STEADYSUN_API_URL, DEFAULT_STEADYSUN_API_URL)
+        self.token = self.retrieve_token_from_env() if token is None else self.check_token(token)
+        self.timeout = timeout if connect_timeout is None else (connect_timeout, timeout)
+        self.endpoint_timeouts = dict(endpoint_timeouts or {})
+        self.base_url = base_url or getenv(ENV_STEADYSUN_API_URL, DEFAULT_STEADYSUN_API_URL)
         self.headers = {
             "Authorization": f"Token {self.token}",
         }
+        self.transport = create_transport(transport)
+        self.rate_limiter = None if rate_limit is None else TokenBucket(rate_limit)
+        self.coalesce_requests = coalesce_requests
+        self.concurrency_limiter = concurrency_limiter or AdaptiveConcurrencyLimiter()
+        self.circuit_breaker = circuit_breaker or _get_shared_circuit_breaker(self.base_url)
+        self.scheduler = scheduler
 
     @staticmethod
     def retrieve_token_from_env() -> str:
@@ -69,11 +161,14 @@ class SteadysunAPI:
         return token
 
     @staticmethod
-    def set_api_token(token: str) -> NoReturn:
-        """Sets the Steadysun API token in the environment.
+    def check_token(token: str) -> str:
+        """Quick-check an API token.
 
         Args:
-            token (str): The API token to set.
+            token (str): The API token to check.
+
+        Returns:
+            str: The API token.
 
         Raises:
             ValueError: If the token is empty or does not seem valid.
@@ -82,7 +177,50 @@ class SteadysunAPI:
             raise ValueError("The given token is empty")
         if len(token) != 40:
             raise ValueError(f"The given token does not seem valid (expected 40 characters, but got {len(token)}).")
-        environ[ENV_STEADYSUN_API_TOKEN] = token
+        return token
+
+    @staticmethod
+    def set_api_token(token: str) -> NoReturn:
+        """Sets the Steadysun API token in the environment.
+
+        Args:
+            token (str): The API token to set.
+
+        Raises:
+            ValueError: If the token is empty or does not seem valid.
+        """
+        environ[ENV_STEADYSUN_API_TOKEN] = SteadysunAPI.check_token(token)
+
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """The HTTP session of the client (None if the transport is not based on `requests`)."""
+        return getattr(self.transport, "session", None)
+
+    def close(self):
+        """Close the HTTP transport of the client."""
+        self.transport.close()
+
+    def __enter__(self) -> "SteadysunAPI":
+        """Use the client as a context manager (closing its transport at exit)."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the HTTP transport of the client."""
+        self.close()
+
+    def get_timeout(self, endpoint: str) -> Timeout:
+        """Get the timeout of an endpoint (the longest matching prefix of `endpoint_timeouts`, or the default one).
+
+        Args:
+            endpoint (str): The API endpoint to call.
+
+        Returns:
+            Timeout: The timeout in seconds, or (connect, read) timeouts.
+        """
+        matching_prefixes = [prefix for prefix in self.endpoint_timeouts if endpoint.startswith(prefix)]
+        if not matching_prefixes:
+            return self.timeout
+        return self.endpoint_timeouts[max(matching_prefixes, key=len)]
 
     def _make_request(
         self,
@@ -90,7 +228,10 @@ class SteadysunAPI:
         endpoint: str,
         params: dict = None,
         data: dict = None,
-    ) -> dict:
+        deadline: Optional[Deadline] = None,
+        accept: Optional[str] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> Union[dict, requests.Response]:
         """Makes an HTTP request to the Steadysun API.
 
         Args:
@@ -98,85 +239,247 @@ class SteadysunAPI:
             endpoint (str): The API endpoint to call.
             params (dict, optional): URL parameters for GET requests (default is None).
             data (dict, optional): JSON payload for POST, PUT, PATCH requests (default is None).
+            deadline (Optional[Deadline], optional): Deadline of the operation, capping the request timeout.
+            accept (Optional[str], optional): Accept header of the request. If given, the response is not parsed.
+            priority (Priority, optional): The priority of the request, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
-            dict: The parsed response from the API.
+            Union[dict, requests.Response]: The parsed response from the API (the raw response if `accept` is given).
 
         Raises:
             HTTPError: If the API response indicates an error.
+            CircuitOpenError: If the API is considered unavailable (the call is not made).
+            DeadlineExceeded: If the deadline is passed before the response is received.
         """
+        # The slot is taken first, so that queued batch calls don't hold rate limit tokens
+        if self.scheduler is not None:
+            self.scheduler.acquire(priority, timeout=None if deadline is None else deadline.remaining())
+        try:
+            if self.rate_limiter is not None:
+                reserve = (
+                    0 if self.scheduler is None else self.scheduler.rate_reserve(priority, self.rate_limiter.capacity)
+                )
+                self.rate_limiter.acquire(timeout=None if deadline is None else deadline.remaining(), reserve=reserve)
+            timeout = self.get_timeout(endpoint)
+            if deadline is not None:
+                timeout = deadline.cap(timeout)
+            return self.circuit_breaker.call(
+                self._send_request, method, endpoint, params, data, timeout, deadline, accept
+            )
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.release(priority)
+
+    # pylint: disable=too-many-arguments
+    def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict],
+        data: Optional[dict],
+        timeout: Timeout,
+        deadline: Optional[Deadline],
+        accept: Optional[str] = None,
+    ) -> Union[dict, requests.Response]:
+        """Sends an HTTP request to the Steadysun API and handles its response (see `_make_request`)."""
         url = f"{self.base_url}{endpoint}"
-        response = requests.request(
-            method=method,
-            url=url,
-            params=params,
-            json=data,
-            headers=self.headers,
-            timeout=self.timeout,
-        )
+        try:
+            response = self.transport.request(
+                method=method,
+                url=url,
+                params=params,
+                json=data,
+                headers=self.headers if accept is None else {**self.headers, "Accept": accept},
+                timeout=timeout,
+            )
+        except requests.exceptions.Timeout as error:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"The deadline of the operation is exceeded ({error}).") from error
+            raise
+        if accept is not None:
+            return APIResponseHandler(response).handle_raw()
         return APIResponseHandler(response).handle()
 
-    def get(self, endpoint: str, params: dict = None) -> dict:
+    def get(
+        self,
+        endpoint: str,
+        params: dict = None,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> dict:
         """Makes a GET request to the Steadysun API.
 
+        If `coalesce_requests` is enabled, concurrent identical requests (same token, endpoint, parameters and
+        priority) made from any thread share one API call, and all receive its result (or its error).
+
         Args:
             endpoint (str): The API endpoint to call.
             params (dict, optional): URL parameters for the GET request (default is None).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
             dict: The parsed response from the API.
         """
-        return self._make_request("GET", endpoint, params=params)
+        deadline = Deadline.from_value(deadline)
+        if not self.coalesce_requests:
+            return self._make_request("GET", endpoint, params=params, deadline=deadline, priority=priority)
+        key = (self.token, self.base_url, endpoint, normalize_params(params), priority)
+        try:
+            return _IN_FLIGHT_GET_REQUESTS.do(
+                key,
+                lambda: self._make_request("GET", endpoint, params=params, deadline=deadline, priority=priority),
+                timeout=None if deadline is None else deadline.remaining(),
+            )
+        except TimeoutError as error:
+            raise DeadlineExceeded("The deadline is exceeded while waiting for an identical request.") from error
+
+    def get_response(
+        self,
+        endpoint: str,
+        params: dict = None,
+        accept: str = "application/json",
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> requests.Response:
+        """Makes a GET request to the Steadysun API, negotiating the response format, and returns the raw response.
+
+        The API may answer with another format than the preferred one: check the "Content-Type" header of the
+        response. Concurrent identical requests are coalesced as with `get`.
+
+        Args:
+            endpoint (str): The API endpoint to call.
+            params (dict, optional): URL parameters for the GET request (default is None).
+            accept (str, optional): The Accept header, e.g. "text/csv, application/json;q=0.5"
+                (default is "application/json").
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
-    def post(self, endpoint: str, data: dict = None) -> dict:
+        Returns:
+            requests.Response: The API response, with a success status code.
+        """
+        deadline = Deadline.from_value(deadline)
+
+        def request() -> requests.Response:
+            return self._make_request(
+                "GET", endpoint, params=params, deadline=deadline, accept=accept, priority=priority
+            )
+
+        if not self.coalesce_requests:
+            return request()
+        key = (self.token, self.base_url, endpoint, normalize_params(params), accept, priority)
+        try:
+            return _IN_FLIGHT_GET_REQUESTS.do(
+                key,
+                request,
+                timeout=None if deadline is None else deadline.remaining(),
+            )
+        except TimeoutError as error:
+            raise DeadlineExceeded("The deadline is exceeded while waiting for an identical request.") from error
+
+    def post(
+        self,
+        endpoint: str,
+        data: dict = None,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> dict:
         """Makes a POST request to the Steadysun API.
 
         Args:
             endpoint (str): The API endpoint to call.
             data (dict, optional): The JSON payload to send (default is None).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
             dict: The parsed response from the API.
         """
-        return self._make_request("POST", endpoint, data=data)
+        return self._make_request(
+            "POST", endpoint, data=data, deadline=Deadline.from_value(deadline), priority=priority
+        )
 
-    def patch(self, endpoint: str, data: dict = None) -> dict:
+    def patch(
+        self,
+        endpoint: str,
+        data: dict = None,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> dict:
         """Makes a PATCH request to the Steadysun API.
 
         Args:
             endpoint (str): The API endpoint to call.
             data (dict, optional): The JSON payload to send (default is None).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
             dict: The parsed response from the API.
         """
-        return self._make_request("PATCH", endpoint, data=data)
+        return self._make_request(
+            "PATCH", endpoint, data=data, deadline=Deadline.from_value(deadline), priority=priority
+        )
 
-    def put(self, endpoint: str, data: dict = None) -> dict:
+    def put(
+        self,
+        endpoint: str,
+        data: dict = None,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> dict:
         """Makes a PUT request to the Steadysun API.
 
         Args:
             endpoint (str): The API endpoint to call.
             data (dict, optional): The JSON payload to send (default is None).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
             dict: The parsed response from the API.
         """
-        return self._make_request("PUT", endpoint, data=data)
+        return self._make_request("PUT", endpoint, data=data, deadline=Deadline.from_value(deadline), priority=priority)
 
-    def delete(self, endpoint: str, params: dict = None) -> dict:
+    def delete(
+        self,
+        endpoint: str,
+        params: dict = None,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Priority = INTERACTIVE,
+    ) -> dict:
         """Makes a DELETE request to the Steadysun API.
 
         Args:
             endpoint (str): The API endpoint to call.
             params (dict, optional): URL parameters for the DELETE request (default is None).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) of the call.
+            priority (Priority, optional): The priority of the call, if the client has a scheduler
+                (default is "interactive").
 
         Returns:
             dict: The parsed response from the API.
         """
-        return self._make_request("DELETE", endpoint, params=params)
+        return self._make_request(
+            "DELETE", endpoint, params=params, deadline=Deadline.from_value(deadline), priority=priority
+        )
 
-    def get_list(self, endpoint: str, params: dict = None, page_limit: int = 10, get_all_pages: bool = False):
+    # pylint: disable=too-many-arguments
+    def get_list(
+        self,
+        endpoint: str,
+        params: dict = None,
+        page_limit: int = 10,
+        get_all_pages: bool = False,
+        deadline: Optional[Union[float, Deadline]] = None,
+        priority: Optional[Priority] = None,
+    ):
         """Makes a paginated GET request to retrieve a list of results from the Steadysun API.
 
         Args:
@@ -184,16 +487,196 @@ class SteadysunAPI:
             params (dict, optional): URL parameters for the GET request (default is None).
             page_limit (int): The number of items to request per page (default is 10).
             get_all_pages (bool): Whether to retrieve all pages of results (default is False).
+            deadline (Optional[Union[float, Deadline]], optional): Time budget in seconds (or deadline) shared by
+                all the page requests.
+            priority (Optional[Priority], optional): The priority of the page requests, if the client has a
+                scheduler (default is "batch" if get_all_pages is True, "interactive" otherwise).
 
         Returns:
             dict: The combined results from all pages (if get_all_pages is True).
         """
+        deadline = Deadline.from_value(deadline)
+        if priority is None:
+            priority = BATCH if get_all_pages else INTERACTIVE
         params = dict(params or {}, **{"limit": page_limit, "offset": 0})
-        response = self.get(endpoint, params)
+        response = self.get(endpoint, params, deadline=deadline, priority=priority)
         if get_all_pages:
             while response["next"] is not None:
                 params["offset"] += params["limit"]
-                response["results"] = response["results"] + self.get(endpoint, params)["results"]
+                page = self.get(endpoint, params, deadline=deadline, priority=priority)
+                response["results"] = response["results"] + page["results"]
             del response["next"]
             del response["previous"]
         return response
+
+
+# Process-wide default client, lazily created from the environment (unless set by `set_default_client`)
+_DEFAULT_CLIENT: Optional[SteadysunAPI] = None
+_DEFAULT_CLIENT_IS_CUSTOM = False
+_DEFAULT_CLIENT_PID = os.getpid()
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_default_client() -> SteadysunAPI:
+    """Get the process-wide default client, used by the helpers (`get_forecast`, `PVSystem.from_uuid`, ...)
+    when no client is given.
+
+    The default client is created on first use from the environment, and created again if the environment token
+    or API URL changed (e.g. with `SteadysunAPI.set_api_token`). In a forked process, the default client gets new
+    HTTP connections, so that the connections of the parent process are never shared.
+
+    Returns:
+        SteadysunAPI: The default client.
+
+    Raises:
+        ValueError: If the default client must be created and the API token is not found or is invalid.
+    """
+    global _DEFAULT_CLIENT, _DEFAULT_CLIENT_PID  # pylint: disable=global-statement
+    client = _DEFAULT_CLIENT
+    if (
+        client is not None
+        and _DEFAULT_CLIENT_PID == os.getpid()
+        and (_DEFAULT_CLIENT_IS_CUSTOM or _matches_environment(client))
+    ):
+        return client
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT_PID != os.getpid():
+            _DEFAULT_CLIENT_PID = os.getpid()
+            if _DEFAULT_CLIENT is not None:
+                _DEFAULT_CLIENT.transport.reset()
+        if _DEFAULT_CLIENT is None or not (_DEFAULT_CLIENT_IS_CUSTOM or _matches_environment(_DEFAULT_CLIENT)):
+            _DEFAULT_CLIENT = SteadysunAPI()
+        return _DEFAULT_CLIENT
+
+
+def set_default_client(client: Optional[SteadysunAPI]):
+    """Override the process-wide default client (e.g. to use a custom timeout or rate limit everywhere).
+
+    Args:
+        client (Optional[SteadysunAPI]): The new default client, or None to go back to a client created from
+            the environment.
+    """
+    global _DEFAULT_CLIENT, _DEFAULT_CLIENT_IS_CUSTOM, _DEFAULT_CLIENT_PID  # pylint: disable=global-statement
+    with _DEFAULT_CLIENT_LOCK:
+        _DEFAULT_CLIENT = client
+        _DEFAULT_CLIENT_IS_CUSTOM = client is not None
+        _DEFAULT_CLIENT_PID = os.getpid()
+
+
+def _matches_environment(client: SteadysunAPI) -> bool:
+    """Check if a client uses the API token and URL of the environment."""
+    return client.token == getenv(ENV_STEADYSUN_API_TOKEN) and client.base_url == getenv(
+        ENV_STEADYSUN_API_URL, DEFAULT_STEADYSUN_API_URL
+    )
+
+
+def _reset_after_fork():
+    """Reset the process-wide state that can't be inherited from the parent process (locks, in-flight calls)."""
+    global _IN_FLIGHT_GET_REQUESTS, _CIRCUIT_BREAKERS_LOCK, _DEFAULT_CLIENT_LOCK  # pylint: disable=global-statement
+    _IN_FLIGHT_GET_REQUESTS = SingleFlight()
+    _CIRCUIT_BREAKERS_LOCK = threading.Lock()
+    _DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SteadysunAPIPool:
+    """A pool of API clients, one per account, each with its own token, transport and rate limit.
+
+    Example:
+        Work with two accounts concurrently::
+
+            pool = SteadysunAPIPool()
+            pool.add("customer_a", token="TOKEN_A", rate_limit=5)
+            pool.add("customer_b", token="TOKEN_B")
+
+            pvsystems = pool.map(lambda client: client.get_list("pvsystem/", get_all_pages=True))
+            config = pool["customer_a"].get("pvsystem/PV_UUID/")
+    """
+
+    def __init__(self, clients: Optional[Dict[str, SteadysunAPI]] = None):
+        """Initializes a pool.
+
+        Args:
+            clients (Optional[Dict[str, SteadysunAPI]]): Existing clients, by account name (default is none).
+        """
+        self._clients: Dict[str, SteadysunAPI] = dict(clients or {})
+        self._lock = threading.Lock()
+
+    def add(self, account: str, token: str, **client_kwargs: Any) -> SteadysunAPI:
+        """Create the client of an account.
+
+        Args:
+            account (str): The name of the account.
+            token (str): The API token of the account.
+            **client_kwargs (Any): Any other parameter of `SteadysunAPI` (base_url, rate_limit, timeout, ...).
+
+        Returns:
+            SteadysunAPI: The client of the account.
+
+        Raises:
+            ValueError: If the account already exists or if the token is invalid.
+        """
+        client = SteadysunAPI(token=token, **client_kwargs)
+        with self._lock:
+            if account in self._clients:
+                client.close()
+                raise ValueError(f"The account '{account}' is already in the pool.")
+            self._clients[account] = client
+        return client
+
+    def remove(self, account: str):
+        """Remove the client of an account (and close its transport).
+
+        Args:
+            account (str): The name of the account.
+        """
+        with self._lock:
+            client = self._clients.pop(account)
+        client.close()
+
+    def __getitem__(self, account: str) -> SteadysunAPI:
+        """Get the client of an account."""
+        return self._clients[account]
+
+    def __contains__(self, account: str) -> bool:
+        """Check if an account is in the pool."""
+        return account in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the account names."""
+        return iter(list(self._clients))
+
+    def __len__(self) -> int:
+        """Get the number of accounts."""
+        return len(self._clients)
+
+    def map(
+        self,
+        function: Callable[[SteadysunAPI], Any],
+        accounts: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Call a function with the client of each account, concurrently.
+
+        Args:
+            function (Callable[[SteadysunAPI], Any]): The function to call with each client.
+            accounts (Optional[Iterable[str]]): The accounts to use (default is all the accounts).
+            max_workers (Optional[int]): The maximal number of concurrent calls (default is one per account).
+
+        Returns:
+            Dict[str, Any]: The result of each call, by account name.
+        """
+        accounts = list(self if accounts is None else accounts)
+        if not accounts:
+            return {}
+        with ThreadPoolExecutor(max_workers=max_workers or len(accounts)) as executor:
+            futures = {account: executor.submit(function, self[account]) for account in accounts}
+            return {account: future.result() for account, future in futures.items()}
+
+    def close(self):
+        """Close the transports of all the clients."""
+        for client in self._clients.values():
+            client.close()
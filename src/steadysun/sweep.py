@@ -0,0 +1,223 @@
+"""This module evaluates many variants of a PV system configuration locally, for sizing studies.
+
+A sweep takes a base `PVSystem`, one forecast (see `pvmodel.simulate_power` for the required fields) and a grid of
+parameter variations. The variants are built as `PVFleet` structured arrays, by chunks of `chunk_size` variants
+to bound the memory, and each chunk is simulated in a single vectorized pass of `pvmodel.simulate_fleet_power`.
+The chunks are spread across a process pool. No PV system is created on the API.
+
+Parameters (a grid column sets the parameter of every variant row):
+    orientation, inclination, power_temp_coeff: Set on every array of the PV system.
+    module_technology, module_material, racking, module_type: Set on every array (enum names or int codes).
+    pvmodules_pdc0: Total peak power (W), split between the arrays in the proportions of the base PV system.
+    pv_type: The PV system type (enum name or int code).
+    max_angle, backtrack, gcr: Tracker parameters (only used by tracking PV system types). The ground coverage ratio
+        only has an effect with backtracking: sweep `backtrack` too if the base PV system doesn't backtrack.
+    inverter_pdc0, eta_inv_nom: Inverter parameters.
+    albedo: The ground albedo.
+    wiring, lid, nameplate_rating, mismatch, soiling, snow, shading, availability, connections, age, aging: Losses
+        parameters (percentages, and age in years).
+
+Functions:
+    parameter_grid: Builds the variants of all the combinations of parameter values.
+    sweep_pvsystem: Evaluates variants of a PV system configuration.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Literal, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .fleet import _LOSSES, PVFleet, _losses_factor
+from .forecast import _to_datetime_index
+from .models.pvsystem import ModuleMaterial, ModuleTechnology, ModuleType, PVType, Racking
+from .pvmodel import _DEFAULT_ETA_INV_NOM, GHI_FIELD, TEMPERATURE_FIELD, simulate_fleet_power
+from .pvsystem import PVSystem
+
+RESULT_COLUMNS = ["energy", "peak_power", "specific_yield"]
+
+_ARRAY_PARAMETERS = ["orientation", "inclination", "power_temp_coeff"]
+_ARRAY_ENUM_PARAMETERS = {
+    "module_technology": ModuleTechnology,
+    "module_material": ModuleMaterial,
+    "racking": Racking,
+    "module_type": ModuleType,
+}
+_TRACKER_PARAMETERS = {"max_angle": "tracker_max_angle", "backtrack": "tracker_backtrack", "gcr": "tracker_gcr"}
+_INVERTER_PARAMETERS = {"inverter_pdc0": "inverter_pdc0", "eta_inv_nom": "inverter_eta_inv_nom"}
+_LOSSES_PARAMETERS = _LOSSES + ["age", "aging"]
+
+SWEEP_PARAMETERS = (
+    _ARRAY_PARAMETERS
+    + list(_ARRAY_ENUM_PARAMETERS)
+    + ["pvmodules_pdc0", "pv_type"]
+    + list(_TRACKER_PARAMETERS)
+    + list(_INVERTER_PARAMETERS)
+    + ["albedo"]
+    + _LOSSES_PARAMETERS
+)
+
+
+def parameter_grid(**values: Sequence[Any]) -> pd.DataFrame:
+    """Builds the variants of all the combinations of parameter values.
+
+    Args:
+        **values (Sequence[Any]): The values of each parameter.
+
+    Returns:
+        pd.DataFrame: One row per combination, one column per parameter.
+
+    Example:
+        Build the 3 x 4 variants of inclination and inverter size::
+
+            grid = parameter_grid(inclination=[15, 25, 35], inverter_pdc0=[6000, 8000, 10000, 12000])
+    """
+    combinations = list(itertools.product(*values.values()))
+    return pd.DataFrame(combinations, columns=list(values))
+
+
+def _variants_fleet(base: PVFleet, variants: pd.DataFrame) -> PVFleet:
+    """Build the fleet of the variants of a single PV system fleet."""
+    n_variants, n_arrays = len(variants), len(base.arrays)
+    systems = np.repeat(base.systems, n_variants)
+    systems["uuid"] = [str(label) for label in variants.index]
+    arrays = np.tile(base.arrays, n_variants)
+    arrays["system"] = np.repeat(np.arange(n_variants), n_arrays)
+
+    def per_array(column: str) -> np.ndarray:
+        return np.repeat(variants[column].to_numpy(), n_arrays)
+
+    for column in variants.columns:
+        if column in _ARRAY_PARAMETERS:
+            arrays[column] = per_array(column)
+        elif column in _ARRAY_ENUM_PARAMETERS:
+            enum_class = _ARRAY_ENUM_PARAMETERS[column]
+            arrays[column] = [enum_class.from_value(value).value for value in per_array(column).tolist()]
+    if "pvmodules_pdc0" in variants.columns:
+        shares = base.arrays["pdc0"] / base.arrays["pdc0"].sum()
+        arrays["pdc0"] = per_array("pvmodules_pdc0") * np.tile(shares, n_variants)
+    if "pv_type" in variants.columns:
+        systems["pv_type"] = [PVType.from_value(value).value for value in variants["pv_type"].tolist()]
+    for column, field in _TRACKER_PARAMETERS.items():
+        if column in variants.columns:
+            systems["has_tracker"] = True
+            systems[field] = variants[column].to_numpy()
+    if any(column in variants.columns for column in _INVERTER_PARAMETERS):
+        pdc0 = np.bincount(arrays["system"], weights=arrays["pdc0"], minlength=n_variants)
+        systems["inverter_pdc0"] = np.where(systems["has_inverter"], systems["inverter_pdc0"], pdc0)
+        systems["inverter_eta_inv_nom"] = np.where(
+            systems["has_inverter"], systems["inverter_eta_inv_nom"], _DEFAULT_ETA_INV_NOM
+        )
+        systems["has_inverter"] = True
+        for column, field in _INVERTER_PARAMETERS.items():
+            if column in variants.columns:
+                systems[field] = variants[column].to_numpy()
+
+    if "albedo" in variants.columns:
+        systems["albedo"] = variants["albedo"].to_numpy()
+    losses = {column: variants[column].to_numpy() for column in _LOSSES_PARAMETERS if column in variants.columns}
+    if losses:
+        base_losses = (base.extras or [{}])[0].get("losses_parameters") or {}
+        systems["losses_factor"] = _losses_factor({**base_losses, **losses})
+    return PVFleet(systems, arrays, [str(label) for label in variants.index])
+
+
+# pylint: disable=too-many-arguments
+def _evaluate_chunk(
+    base: PVFleet,
+    variants: pd.DataFrame,
+    times: pd.DatetimeIndex,
+    ghi: np.ndarray,
+    temp_air: np.ndarray,
+    wind_speed: Union[float, np.ndarray],
+) -> pd.DataFrame:
+    """Simulate a chunk of variants, and summarize the power of each one (run in the process pool)."""
+    fleet = _variants_fleet(base, variants)
+    power = simulate_fleet_power(fleet, times, ghi, temp_air, wind_speed=wind_speed).to_numpy()
+    step_hours = float(np.median((times[1:] - times[:-1]) / pd.Timedelta(hours=1))) if len(times) > 1 else 1.0
+    energy = np.nansum(power, axis=0) * step_hours
+    return pd.DataFrame(
+        {
+            "energy": energy,
+            "peak_power": np.nanmax(power, axis=0, initial=0.0),
+            "specific_yield": energy / fleet.pdc0,
+        },
+        index=variants.index,
+    )
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def sweep_pvsystem(
+    pvsystem: PVSystem,
+    forecast_df: pd.DataFrame,
+    grid: Union[pd.DataFrame, Mapping[str, Sequence[Any]]],
+    wind_speed: Union[float, np.ndarray] = 1.0,
+    chunk_size: int = 256,
+    max_workers: Optional[int] = None,
+    time_stamp_unit: Optional[Literal["ms", "s"]] = None,
+) -> pd.DataFrame:
+    """Evaluates variants of a PV system configuration on one forecast, without calling the API.
+
+    Args:
+        pvsystem (PVSystem): The base PV system.
+        forecast_df (pd.DataFrame): The forecast, as returned by `get_forecast`, with the `pvmodel.GHI_FIELD` and
+            `pvmodel.TEMPERATURE_FIELD` fields.
+        grid (Union[pd.DataFrame, Mapping[str, Sequence[Any]]]): The variants, one row per variant and one column per
+            parameter (see the module documentation), or the values of each parameter to combine (see
+            `parameter_grid`).
+        wind_speed (Union[float, np.ndarray]): The wind speed (m/s), a scalar or one value per time (default is 1).
+        chunk_size (int): The number of variants simulated together (default is 256).
+        max_workers (Optional[int]): The number of worker processes (default is the number of CPUs, 1 to evaluate
+            the variants in the current process).
+        time_stamp_unit (Optional[Literal["ms", "s"]]): The unit of the index (if made of time stamps).
+
+    Returns:
+        pd.DataFrame: One row per variant (indexed like the variants), with the parameters, the `energy` (Wh) and
+            `peak_power` (W) of the AC power, and the `specific_yield` (Wh/Wp). It is empty for an empty grid.
+
+    Raises:
+        ValueError: If a parameter is not supported, or if the chunk size is not positive.
+        KeyError: If a required field is missing from the forecast.
+
+    Example:
+        Find the inclination and inverter size maximizing the energy of a PV system on a forecast::
+
+            forecast_df = get_forecast("SITE_UUID", fields=[GHI_FIELD, TEMPERATURE_FIELD])
+            results_df = sweep_pvsystem(
+                PVSystem.from_uuid("SITE_UUID"),
+                forecast_df,
+                {"inclination": range(0, 61, 5), "inverter_pdc0": [6000, 8000, 10000]},
+            )
+            best = results_df.loc[results_df["energy"].idxmax()]
+    """
+    variants = grid if isinstance(grid, pd.DataFrame) else parameter_grid(**grid)
+    unknown = [column for column in variants.columns if column not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unsupported sweep parameters: {unknown} (supported: {SWEEP_PARAMETERS})")
+    if chunk_size <= 0:
+        raise ValueError(f"The chunk size must be positive (got {chunk_size}).")
+    missing = [field for field in (GHI_FIELD, TEMPERATURE_FIELD) if field not in forecast_df.columns]
+    if missing:
+        raise KeyError(f"Missing fields in the forecast: {missing}")
+
+    # The detailed losses of the base system are kept, to update them with the swept losses
+    base = PVFleet.from_pvsystems([pvsystem], keep_extras=True)
+    times = _to_datetime_index(forecast_df.index, time_stamp_unit)
+    ghi = forecast_df[GHI_FIELD].to_numpy(dtype=np.float64)
+    temp_air = forecast_df[TEMPERATURE_FIELD].to_numpy(dtype=np.float64)
+    n_chunks = -(-len(variants) // chunk_size)
+    chunks = []
+    if n_chunks:  # an empty grid has no chunk, and an empty result
+        chunks = [variants.iloc[positions] for positions in np.array_split(np.arange(len(variants)), n_chunks)]
+    arguments = (itertools.repeat(base), chunks, itertools.repeat(times), itertools.repeat(ghi))
+    arguments += (itertools.repeat(temp_air), itertools.repeat(wind_speed))
+
+    results: List[pd.DataFrame]
+    if max_workers == 1 or len(chunks) <= 1:
+        results = list(map(_evaluate_chunk, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_evaluate_chunk, *arguments))
+    results_df = pd.concat(results) if results else pd.DataFrame(columns=RESULT_COLUMNS, dtype=np.float64)
+    return variants.assign(**{column: results_df[column].to_numpy() for column in RESULT_COLUMNS})
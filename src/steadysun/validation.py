@@ -0,0 +1,248 @@
+"""This module validates PV system configurations in bulk, before provisioning them on the Steadysun API.
+
+Validating a large portfolio one object at a time through pydantic is slow, so `validate_pvsystems` checks a whole
+DataFrame of candidate configurations (one row per PV system) with vectorized column operations, and reports every
+error of every row at once. `provision_pvsystems` then creates the valid rows with `PVSystem.create_new`, with all
+the columns below (the other columns are ignored). The rows are identified by their index labels, which must be
+unique.
+
+Columns (create_new parameters are required, the others are checked and applied if present):
+    name (str): Name of the PV system (non-empty).
+    longitude, latitude (float): Location of the PV system (in [-180, 180] and [-90, 90]).
+    pdc0 (float): Peak power of the PV system in W (>= 0).
+    orientation, inclination (float): Orientation and inclination of the PV system in degrees (>= 0).
+    altitude (float): Altitude of the PV system (>= 0).
+    power_temp_coeff (float): Temperature coefficient of the power (%/°C).
+    pv_type, module_technology, module_material, racking, module_type: Enum members, as int codes or names.
+
+Classes:
+    PVSystemValidationReport: The normalized configurations and the errors found in each row.
+
+Functions:
+    validate_pvsystems: Validates a DataFrame of PV system configurations.
+    provision_pvsystems: Creates the valid PV systems of a DataFrame on the Steadysun API.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from .models._utils import EnumIntStr
+from .models.pvsystem import ModuleMaterial, ModuleTechnology, ModuleType, PVType, Racking
+from .pvsystem import PVSystem
+from .steadysun_api import SteadysunAPI, get_default_client
+
+REQUIRED_COLUMNS = ["name", "longitude", "latitude", "pdc0", "orientation", "inclination"]
+
+# Finite float columns, with their (minimum, maximum) bounds
+FLOAT_BOUNDS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "longitude": (-180, 180),
+    "latitude": (-90, 90),
+    "pdc0": (0, None),
+    "orientation": (0, None),
+    "inclination": (0, None),
+    "altitude": (0, None),
+    "power_temp_coeff": (None, None),
+}
+
+ENUM_COLUMNS: Dict[str, Type[EnumIntStr]] = {
+    "pv_type": PVType,
+    "module_technology": ModuleTechnology,
+    "module_material": ModuleMaterial,
+    "racking": Racking,
+    "module_type": ModuleType,
+}
+
+# Optional columns set on the array of the created PV systems
+ARRAY_COLUMNS = ["power_temp_coeff", "module_technology", "module_material", "racking", "module_type"]
+
+ERROR_COLUMNS = ["row", "field", "error"]
+
+
+class PVSystemValidationReport:
+    """The result of a bulk validation.
+
+    Attributes:
+        data (pd.DataFrame): The configurations, with float columns as float64 and enum columns as int codes
+            (invalid values are NaN).
+        errors (pd.DataFrame): One row per error, with the index label of the invalid row (`row`), the invalid column
+            (`field`) and a message (`error`).
+        valid (np.ndarray): Whether each row is valid.
+    """
+
+    def __init__(self, data: pd.DataFrame, errors: pd.DataFrame):
+        """Initializes the report.
+
+        Args:
+            data (pd.DataFrame): The normalized configurations.
+            errors (pd.DataFrame): The errors found (see `ERROR_COLUMNS`).
+        """
+        self.data = data
+        self.errors = errors
+        self.valid = ~data.index.isin(errors["row"])
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether all the rows are valid."""
+        return bool(self.valid.all())
+
+    @property
+    def valid_rows(self) -> pd.DataFrame:
+        """The valid (normalized) configurations."""
+        return self.data[self.valid]
+
+    @property
+    def invalid_rows(self) -> pd.DataFrame:
+        """The invalid (normalized) configurations."""
+        return self.data[~self.valid]
+
+    def errors_by_row(self) -> pd.Series:
+        """Gets all the error messages of each invalid row.
+
+        Returns:
+            pd.Series: The "field: error" messages of each invalid row, joined with "; ".
+        """
+        messages = self.errors["field"] + ": " + self.errors["error"]
+        return messages.groupby(self.errors["row"].to_numpy(), sort=False).agg("; ".join)
+
+
+def _valid_names(names: pd.Series) -> np.ndarray:
+    """Gets the mask of the non-empty string names."""
+    if not (pd.api.types.is_object_dtype(names) or pd.api.types.is_string_dtype(names)):
+        return np.zeros(len(names), dtype=bool)
+    return (names.str.len() > 0).fillna(False).to_numpy(dtype=bool)
+
+
+def _valid_floats(values: pd.Series, minimum: Optional[float], maximum: Optional[float]) -> np.ndarray:
+    """Gets the mask of the finite values within bounds of a float64 column."""
+    array = values.to_numpy()
+    valid = np.isfinite(array)
+    if minimum is not None:
+        valid &= array >= minimum
+    if maximum is not None:
+        valid &= array <= maximum
+    return valid
+
+
+def _float_error(minimum: Optional[float], maximum: Optional[float]) -> str:
+    """Gets the error message of the invalid values of a float column."""
+    bounds = [f">= {minimum}"] if minimum is not None else []
+    bounds += [f"<= {maximum}"] if maximum is not None else []
+    message = "must be a finite number"
+    return f"{message} {' and '.join(bounds)}" if bounds else message
+
+
+def _to_enum_codes(values: pd.Series, enum_class: Type[EnumIntStr]) -> pd.Series:
+    """Converts enum names or int codes to int codes (NaN if not a member of the enum)."""
+    codes = pd.to_numeric(values, errors="coerce")
+    codes = codes.where(codes.isin([member.value for member in enum_class]))
+    by_name = values.map({member.name: member.value for member in enum_class})
+    return codes.fillna(by_name).astype(np.float64)
+
+
+def validate_pvsystems(configs: pd.DataFrame) -> PVSystemValidationReport:
+    """Validates PV system configurations in bulk, with vectorized checks on each column.
+
+    Args:
+        configs (pd.DataFrame): The configurations, one row per PV system (see the module documentation).
+
+    Returns:
+        PVSystemValidationReport: The normalized configurations and the errors of each row.
+
+    Raises:
+        ValueError: If required columns are missing, or if the index labels are not unique.
+
+    Example:
+        Check a portfolio spreadsheet and print the errors::
+
+            report = validate_pvsystems(pd.read_excel("portfolio.xlsx"))
+            if not report.is_valid:
+                print(report.errors_by_row())
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in configs.columns]
+    if missing:
+        raise ValueError(f"Missing columns in the PV system configurations: {missing}")
+    if not configs.index.is_unique:
+        duplicates = configs.index[configs.index.duplicated()].unique().tolist()
+        raise ValueError(f"The index labels of the PV system configurations must be unique (duplicated: {duplicates})")
+
+    data = configs.copy()
+    errors: List[pd.DataFrame] = []
+
+    def add_errors(field: str, valid: np.ndarray, message: str):
+        invalid_rows = data.index[~valid]
+        if len(invalid_rows):
+            errors.append(pd.DataFrame({"row": invalid_rows, "field": field, "error": message}))
+
+    add_errors("name", _valid_names(data["name"]), "must be a non-empty string")
+    for column, (minimum, maximum) in FLOAT_BOUNDS.items():
+        if column in data.columns:
+            data[column] = pd.to_numeric(data[column], errors="coerce").astype(np.float64)
+            add_errors(column, _valid_floats(data[column], minimum, maximum), _float_error(minimum, maximum))
+    for column, enum_class in ENUM_COLUMNS.items():
+        if column in data.columns:
+            data[column] = _to_enum_codes(data[column], enum_class)
+            add_errors(column, data[column].notna().to_numpy(), f"must be one of {[m.name for m in enum_class]}")
+
+    error_report = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=ERROR_COLUMNS)
+    return PVSystemValidationReport(data, error_report)
+
+
+def provision_pvsystems(
+    configs: pd.DataFrame,
+    client: Optional[SteadysunAPI] = None,
+    max_workers: int = 8,
+) -> Tuple[Dict[Hashable, PVSystem], pd.DataFrame]:
+    """Validates PV system configurations in bulk, then creates the valid ones with `PVSystem.create_new`.
+
+    The API calls are made concurrently, within the adaptive concurrency limit of the client. A failed creation
+    does not stop the others.
+
+    Args:
+        configs (pd.DataFrame): The configurations, one row per PV system (see the module documentation).
+        client (Optional[SteadysunAPI]): The API client to use (default is `get_default_client()`).
+        max_workers (int): The maximal number of concurrent API calls (default is 8).
+
+    Returns:
+        Tuple[Dict[Hashable, PVSystem], pd.DataFrame]: The created PV systems by row index label, and the errors
+            of the rows that were not created (validation errors, and API errors with the field "api").
+
+    Raises:
+        ValueError: If required columns are missing, or if the index labels are not unique.
+    """
+    report = validate_pvsystems(configs)
+    api = client or get_default_client()
+    array_columns = [column for column in ARRAY_COLUMNS if column in configs.columns]
+
+    def create(row: pd.Series) -> PVSystem:
+        array_params = {column: row[column] for column in array_columns}
+        array_params.update({column: int(array_params[column]) for column in ENUM_COLUMNS if column in array_params})
+        return PVSystem.create_new(
+            name=row["name"],
+            location=(row["longitude"], row["latitude"]),
+            pdc0=row["pdc0"],
+            orientation=row["orientation"],
+            inclination=row["inclination"],
+            client=api,
+            altitude=row["altitude"] if "altitude" in configs.columns else None,
+            pv_type=int(row["pv_type"]) if "pv_type" in configs.columns else PVType.single_axis,
+            array_params=array_params,
+        )
+
+    created: Dict[Hashable, PVSystem] = {}
+    api_errors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            label: executor.submit(api.concurrency_limiter.call, create, row)
+            for label, row in report.valid_rows.iterrows()
+        }
+        for label, future in futures.items():
+            try:
+                created[label] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                api_errors.append({"row": label, "field": "api", "error": str(error)})
+    if api_errors:
+        return created, pd.concat([report.errors, pd.DataFrame(api_errors, columns=ERROR_COLUMNS)], ignore_index=True)
+    return created, report.errors
@@ -0,0 +1,108 @@
+"""Tests _circuit_breaker.py"""
+
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from steadysun._circuit_breaker import CircuitBreaker, CircuitOpenError, is_unhealthy_error
+
+
+def _http_error(status_code: int) -> requests.exceptions.HTTPError:
+    """Build an HTTPError with a response of the given status code."""
+    response = Mock(spec=requests.Response)
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"{status_code}", response=response)
+
+
+def _failing_call(error: BaseException):
+    """A call raising the given error."""
+    raise error
+
+
+class TestIsUnhealthyError(unittest.TestCase):
+    """Tests for is_unhealthy_error"""
+
+    def test_is_unhealthy_error(self):
+        """Test the classification of the API errors."""
+        self.assertTrue(is_unhealthy_error(_http_error(500)))
+        self.assertTrue(is_unhealthy_error(requests.exceptions.ReadTimeout()))
+        self.assertTrue(is_unhealthy_error(requests.exceptions.ConnectionError()))
+        self.assertFalse(is_unhealthy_error(_http_error(404)))
+        self.assertFalse(is_unhealthy_error(_http_error(429)))
+        self.assertFalse(is_unhealthy_error(CircuitOpenError()))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for CircuitBreaker"""
+
+    def setUp(self):
+        """Create a circuit breaker opening after 3 failures, and control the clock."""
+        self.now = 1000.0
+        patcher = patch("steadysun._circuit_breaker.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+    def _fail(self, times: int):
+        """Make failing calls."""
+        for _ in range(times):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.circuit_breaker.call(_failing_call, requests.exceptions.ConnectionError())
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens after `failure_threshold` consecutive failures."""
+        self._fail(2)
+        self.assertEqual(self.circuit_breaker.call(lambda: "ok"), "ok")
+        self._fail(2)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+        self._fail(1)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+        call = Mock()
+        with self.assertRaises(CircuitOpenError):
+            self.circuit_breaker.call(call)
+        call.assert_not_called()
+
+    def test_client_errors_are_not_failures(self):
+        """Test that 4xx errors don't open the circuit."""
+        for _ in range(5):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.circuit_breaker.call(_failing_call, _http_error(404))
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_success(self):
+        """Test that a successful probe closes the circuit."""
+        self._fail(3)
+        self.now += 30
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(self.circuit_breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_failure(self):
+        """Test that a failed probe opens the circuit again, and that only one probe is made at a time."""
+        self._fail(3)
+        self.now += 30
+
+        def probe():
+            with self.assertRaises(CircuitOpenError):
+                self.circuit_breaker.call(lambda: "concurrent call")
+            raise requests.exceptions.ConnectionError()
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.circuit_breaker.call(probe)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+    def test_late_calls_during_probe(self):
+        """Test that the calls started before the circuit opened don't end the probe, nor change the state."""
+        self.assertFalse(self.circuit_breaker._before_call())  # a slow call, started while closed
+        self._fail(3)
+        self.now += 30
+        self.assertTrue(self.circuit_breaker._before_call())
+        self.circuit_breaker._after_call(failed=True, probe=False)
+        self.circuit_breaker._after_call(failed=False, probe=False)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.circuit_breaker.call(lambda: "concurrent call")
+        self.circuit_breaker._after_call(failed=False, probe=True)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
@@ -0,0 +1,99 @@
+"""Tests _coalescing.py"""
+
+import copy
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from steadysun._coalescing import SingleFlight, normalize_params
+
+
+class TestNormalizeParams(unittest.TestCase):
+    """Tests for normalize_params"""
+
+    def test_normalize_params(self):
+        """Test that equivalent parameters give the same key."""
+        self.assertEqual(normalize_params(None), ())
+        self.assertEqual(normalize_params({}), ())
+        self.assertEqual(
+            normalize_params({"horizon": 60, "fields": ["ghi", "t2m"], "time_step": None}),
+            normalize_params({"fields": ("ghi", "t2m"), "horizon": 60}),
+        )
+        self.assertNotEqual(normalize_params({"horizon": 60}), normalize_params({"horizon": 120}))
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests for SingleFlight"""
+
+    def setUp(self):
+        """Create a SingleFlight and a slow call counting its executions."""
+        self.single_flight = SingleFlight()
+        self.n_calls = 0
+        self.lock = threading.Lock()
+
+    def _slow_call(self):
+        """A slow call returning a dict."""
+        with self.lock:
+            self.n_calls += 1
+        time.sleep(0.2)
+        return {"results": [1, 2, 3]}
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that concurrent calls with the same key are executed once."""
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(self.single_flight.do, "key", self._slow_call) for _ in range(10)]
+            results = [future.result() for future in futures]
+        self.assertEqual(self.n_calls, 1)
+        self.assertTrue(all(result == {"results": [1, 2, 3]} for result in results))
+        # Each caller gets its own top level dict
+        self.assertEqual(len({id(result) for result in results}), 10)
+
+    def test_callers_can_modify_their_result(self):
+        """Test that a caller modifying its result does not affect the other callers, even if they copy it late."""
+        deepcopy = copy.deepcopy
+
+        def slow_deepcopy(value):
+            time.sleep(0.1)
+            return deepcopy(value)
+
+        def modifying_caller():
+            result = self.single_flight.do("key", self._slow_call)
+            received = deepcopy(result)
+            result.pop("results")[0] = None
+            return received
+
+        with mock.patch("steadysun._coalescing.copy.deepcopy", side_effect=slow_deepcopy):
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [executor.submit(modifying_caller) for _ in range(5)]
+                results = [future.result() for future in futures]
+        self.assertEqual(self.n_calls, 1)
+        self.assertEqual(results, [{"results": [1, 2, 3]}] * 5)
+
+    def test_different_keys_are_not_coalesced(self):
+        """Test that calls with different keys are all executed."""
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.single_flight.do, key, self._slow_call) for key in "abc"]
+            for future in futures:
+                future.result()
+        self.assertEqual(self.n_calls, 3)
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test that a finished call is not reused."""
+        self.single_flight.do("key", self._slow_call)
+        self.single_flight.do("key", self._slow_call)
+        self.assertEqual(self.n_calls, 2)
+
+    def test_errors_are_shared(self):
+        """Test that the error of the call is raised in every waiting thread."""
+
+        def failing_call():
+            time.sleep(0.2)
+            raise ValueError("failure")
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(self.single_flight.do, "key", failing_call) for _ in range(5)]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
@@ -0,0 +1,104 @@
+"""Tests _concurrency.py"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import requests
+
+from steadysun._concurrency import AdaptiveConcurrencyLimiter, is_overload_error
+
+
+def _http_error(status_code: int) -> requests.exceptions.HTTPError:
+    """Build an HTTPError with a response of the given status code."""
+    response = Mock(spec=requests.Response)
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"{status_code}", response=response)
+
+
+class TestIsOverloadError(unittest.TestCase):
+    """Tests for is_overload_error"""
+
+    def test_is_overload_error(self):
+        """Test the classification of the API errors."""
+        self.assertTrue(is_overload_error(_http_error(429)))
+        self.assertTrue(is_overload_error(_http_error(502)))
+        self.assertTrue(is_overload_error(requests.exceptions.ConnectTimeout()))
+        self.assertTrue(is_overload_error(requests.exceptions.ConnectionError()))
+        self.assertFalse(is_overload_error(_http_error(404)))
+        self.assertFalse(is_overload_error(ValueError()))
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    """Tests for AdaptiveConcurrencyLimiter"""
+
+    def test_bad_limits(self):
+        """Test inconsistent limits."""
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=5)
+
+    def test_additive_increase(self):
+        """Test that the limit grows while the latency is stable."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+        for _ in range(50):
+            limiter.release(limiter.acquire(), latency=0.1)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_multiplicative_decrease(self):
+        """Test that the limit is cut once for concurrent overload errors."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=16, max_limit=16)
+        tokens = [limiter.acquire() for _ in range(8)]
+        for token in tokens:
+            limiter.release(token, overloaded=True)
+        self.assertEqual(limiter.limit, 8)
+        limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+        for _ in range(10):
+            limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_latency_decrease(self):
+        """Test that the limit decreases when the latency rises."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=10)
+        limiter.release(limiter.acquire(), latency=0.1)
+        for _ in range(5):
+            limiter.release(limiter.acquire(), latency=1)
+        self.assertLess(limiter.limit, 10)
+
+    def test_call_respects_limit(self):
+        """Test that no more than `limit` calls run concurrently."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+        lock = threading.Lock()
+        running = []
+        max_running = []
+
+        def slow_call():
+            with lock:
+                running.append(1)
+                max_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            for future in [executor.submit(limiter.call, slow_call) for _ in range(20)]:
+                future.result()
+        self.assertLessEqual(max(max_running), 3)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_call_errors(self):
+        """Test that errors are raised and adapt the limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+
+        def failing_call(status_code):
+            raise _http_error(status_code)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            limiter.call(failing_call, 404)
+        self.assertEqual(limiter.limit, 8)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            limiter.call(failing_call, 429)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
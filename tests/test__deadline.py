@@ -0,0 +1,45 @@
+"""Tests _deadline.py"""
+
+import unittest
+from unittest.mock import patch
+
+from steadysun._deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline(unittest.TestCase):
+    """Tests for Deadline"""
+
+    def setUp(self):
+        """Control the clock."""
+        self.now = 1000.0
+        patcher = patch("steadysun._deadline.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_from_value(self):
+        """Test building deadlines from time budgets."""
+        self.assertIsNone(Deadline.from_value(None))
+        deadline = Deadline(10)
+        self.assertIs(Deadline.from_value(deadline), deadline)
+        self.assertEqual(Deadline.from_value(5).remaining(), 5)
+
+    def test_remaining(self):
+        """Test the remaining time."""
+        deadline = Deadline(10)
+        self.now += 4
+        self.assertEqual(deadline.remaining(), 6)
+        self.assertFalse(deadline.expired)
+        self.now += 10
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertTrue(deadline.expired)
+
+    def test_cap(self):
+        """Test capping request timeouts."""
+        deadline = Deadline(10)
+        self.assertEqual(deadline.cap(30), 10)
+        self.assertEqual(deadline.cap(5), 5)
+        self.assertEqual(deadline.cap(None), 10)
+        self.assertEqual(deadline.cap((3, 30)), (3, 10))
+        self.now += 10
+        with self.assertRaises(DeadlineExceeded):
+            deadline.cap(30)
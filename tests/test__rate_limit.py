@@ -0,0 +1,65 @@
+"""Tests _rate_limit.py"""
+
+import unittest
+from unittest.mock import patch
+
+from steadysun._deadline import DeadlineExceeded
+from steadysun._rate_limit import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for TokenBucket"""
+
+    def setUp(self):
+        """Control the clock (sleeping advances it)."""
+        self.now = 1000.0
+        patchers = [
+            patch("steadysun._rate_limit.time.monotonic", side_effect=lambda: self.now),
+            patch("steadysun._rate_limit.time.sleep", side_effect=self._sleep),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _sleep(self, seconds: float):
+        self.now += seconds
+
+    def test_invalid_rate(self):
+        """Test that the rate must be positive."""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_burst_then_refill(self):
+        """Test that the bucket allows a burst, then refills at its rate."""
+        bucket = TokenBucket(rate=2, capacity=3)
+        self.assertEqual([bucket.try_acquire() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+        self.now += 0.5
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.now += 100
+        self.assertEqual(bucket.tokens, 3)
+
+    def test_acquire_waits(self):
+        """Test that acquire waits for the tokens."""
+        bucket = TokenBucket(rate=1)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(self.now, 1001.0)
+
+    def test_acquire_timeout(self):
+        """Test that acquire gives up if the wait exceeds the timeout."""
+        bucket = TokenBucket(rate=1)
+        bucket.acquire()
+        with self.assertRaises(DeadlineExceeded):
+            bucket.acquire(timeout=0.5)
+        self.assertEqual(self.now, 1000.0)
+        bucket.acquire(timeout=1)
+
+    def test_reserve(self):
+        """Test that the reserved tokens are left in the bucket, and that a full bucket always allows a call."""
+        bucket = TokenBucket(rate=1, capacity=4)
+        self.assertEqual([bucket.try_acquire(reserve=2) for _ in range(2)], [0, 0])
+        self.assertAlmostEqual(bucket.try_acquire(reserve=2), 1.0)
+        self.assertEqual([bucket.try_acquire() for _ in range(2)], [0, 0])
+        self.now += 100
+        self.assertEqual(bucket.try_acquire(reserve=10), 0)
@@ -0,0 +1,65 @@
+"""Tests _scheduling.py"""
+
+import threading
+import time
+import unittest
+
+from steadysun._deadline import DeadlineExceeded
+from steadysun._scheduling import BATCH, INTERACTIVE, PriorityScheduler
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    """Tests for PriorityScheduler"""
+
+    def test_invalid_limits(self):
+        """Test that the limits must be consistent."""
+        with self.assertRaises(ValueError):
+            PriorityScheduler(max_concurrency=4, reserved_concurrency=4)
+        with self.assertRaises(ValueError):
+            PriorityScheduler(reserved_rate_share=1)
+        with self.assertRaises(ValueError):
+            PriorityScheduler().acquire("urgent")
+
+    def test_reserved_concurrency(self):
+        """Test that the batch calls can't use the reserved slots, and the interactive calls can."""
+        scheduler = PriorityScheduler(max_concurrency=3, reserved_concurrency=1)
+        scheduler.acquire(BATCH)
+        scheduler.acquire(BATCH)
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.acquire(BATCH, timeout=0.01)
+        scheduler.acquire(INTERACTIVE)
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.acquire(INTERACTIVE, timeout=0.01)
+        self.assertEqual(scheduler.in_flight, {INTERACTIVE: 1, BATCH: 2})
+        self.assertEqual(scheduler.waiting, {INTERACTIVE: 0, BATCH: 0})
+        scheduler.release(BATCH)
+        scheduler.acquire(BATCH, timeout=0.01)
+        self.assertEqual(scheduler.rate_reserve(BATCH, 8), 2)
+        self.assertEqual(scheduler.rate_reserve(INTERACTIVE, 8), 0)
+
+    def test_interactive_first(self):
+        """Test that a queued interactive call starts before the batch calls queued earlier."""
+        scheduler = PriorityScheduler(max_concurrency=2, reserved_concurrency=0)
+        scheduler.acquire(BATCH)
+        scheduler.acquire(BATCH)
+        started = []
+
+        def call(priority):
+            scheduler.acquire(priority)
+            started.append(priority)
+
+        threads = [threading.Thread(target=call, args=(BATCH,)) for _ in range(2)]
+        threads.append(threading.Thread(target=call, args=(INTERACTIVE,)))
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        self.assertEqual(scheduler.waiting, {INTERACTIVE: 1, BATCH: 2})
+        scheduler.release(BATCH)
+        threads[2].join(timeout=1)
+        time.sleep(0.02)
+        self.assertEqual(started, [INTERACTIVE])
+        scheduler.release(BATCH)
+        scheduler.release(INTERACTIVE)
+        for thread in threads:
+            thread.join(timeout=1)
+        self.assertEqual(started, [INTERACTIVE, BATCH, BATCH])
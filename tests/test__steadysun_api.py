@@ -1,7 +1,29 @@
 import os
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN, SteadysunAPI
+import requests
+
+from steadysun._deadline import Deadline, DeadlineExceeded
+from steadysun._scheduling import BATCH, INTERACTIVE, PriorityScheduler
+from steadysun.steadysun_api import (
+    ENV_STEADYSUN_API_TOKEN,
+    SteadysunAPI,
+    SteadysunAPIPool,
+    get_default_client,
+    set_default_client,
+)
+
+
+def _mock_response(json_data: dict, status_code: int = 200) -> mock.Mock:
+    """Build a mock requests.Response"""
+    response = mock.Mock(spec=requests.Response)
+    response.status_code = status_code
+    response.text = str(json_data)
+    response.json.return_value = json_data
+    return response
 
 
 class TestSteadysunApi(unittest.TestCase):
@@ -50,3 +72,223 @@ class TestSteadysunApi(unittest.TestCase):
 
         SteadysunAPI.set_api_token("a" * 40)
         self.assertEqual(os.getenv(ENV_STEADYSUN_API_TOKEN), "a" * 40)
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestSteadysunApiCoalescing(unittest.TestCase):
+    """Tests of the GET requests coalescing (without calling the API)"""
+
+    @staticmethod
+    def _slow_request(**_):
+        """A slow API call"""
+        time.sleep(0.2)
+        return _mock_response({"uuid": "uuid"})
+
+    def test_concurrent_identical_gets_are_coalesced(self):
+        """Test that concurrent identical GET requests make only one API call"""
+        with mock.patch("requests.Session.request", side_effect=self._slow_request) as request:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(SteadysunAPI().get, "pvsystem/uuid/", {"a": 1, "b": None}) for _ in range(8)]
+                results = [future.result() for future in futures]
+        self.assertEqual(request.call_count, 1)
+        self.assertTrue(all(result == {"uuid": "uuid"} for result in results))
+
+    def test_different_gets_are_not_coalesced(self):
+        """Test that GET requests with different parameters or disabled coalescing are all made"""
+        with mock.patch("requests.Session.request", side_effect=self._slow_request) as request:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(SteadysunAPI().get, "pvsystem/uuid/", {"a": 1}),
+                    executor.submit(SteadysunAPI().get, "pvsystem/uuid/", {"a": 2}),
+                    executor.submit(SteadysunAPI(coalesce_requests=False).get, "pvsystem/uuid/", {"a": 1}),
+                    executor.submit(SteadysunAPI(coalesce_requests=False).get, "pvsystem/uuid/", {"a": 1}),
+                ]
+                for future in futures:
+                    future.result()
+        self.assertEqual(request.call_count, 4)
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestSteadysunApiTimeouts(unittest.TestCase):
+    """Tests of the timeouts and deadlines (without calling the API)"""
+
+    def test_timeouts(self):
+        """Test the connect/read timeouts and the endpoint overrides"""
+        self.assertEqual(SteadysunAPI().get_timeout("pvsystem/"), 30)
+        api = SteadysunAPI(
+            timeout=10,
+            connect_timeout=2,
+            endpoint_timeouts={"forecast/": (2, 120), "forecast/pvsystem/fast/": 1},
+        )
+        self.assertEqual(api.get_timeout("pvsystem/uuid/"), (2, 10))
+        self.assertEqual(api.get_timeout("forecast/pvsystem/uuid/"), (2, 120))
+        self.assertEqual(api.get_timeout("forecast/pvsystem/fast/"), 1)
+
+        with mock.patch("requests.Session.request", return_value=_mock_response({})) as request:
+            api.get("forecast/pvsystem/uuid/")
+        self.assertEqual(request.call_args.kwargs["timeout"], (2, 120))
+
+    def test_get_list_deadline(self):
+        """Test that the deadline is shared by all the page requests"""
+        clock = {"now": 1000.0}
+
+        def slow_page(**_):
+            clock["now"] += 40
+            return _mock_response({"results": [1], "next": "next_page", "previous": None})
+
+        with mock.patch("steadysun._deadline.time.monotonic", side_effect=lambda: clock["now"]):
+            with mock.patch("requests.Session.request", side_effect=slow_page) as request:
+                with self.assertRaises(DeadlineExceeded):
+                    SteadysunAPI().get_list("pvsystem/", get_all_pages=True, deadline=60)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual([call.kwargs["timeout"] for call in request.call_args_list], [30, 20])
+
+    def test_timeout_after_deadline(self):
+        """Test that a request timeout caused by the deadline raises DeadlineExceeded (not counted as failure)"""
+        api = SteadysunAPI()
+        deadline = Deadline(0.01)
+        with mock.patch("requests.Session.request", side_effect=requests.exceptions.ReadTimeout):
+            with mock.patch.object(Deadline, "expired", new_callable=mock.PropertyMock, return_value=True):
+                with self.assertRaises(DeadlineExceeded):
+                    api.get("pvsystem/uuid/", deadline=deadline)
+        self.assertEqual(api.circuit_breaker.state, "closed")
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestSteadysunApiPriorities(unittest.TestCase):
+    """Tests of the priority scheduling (without calling the API)"""
+
+    def test_priorities(self):
+        """Test that the calls are dispatched in the lane of their priority, full listings in the batch lane"""
+        api = SteadysunAPI(scheduler=PriorityScheduler(max_concurrency=2, reserved_concurrency=1))
+        lanes = []
+
+        def request(**_):
+            lanes.append(api.scheduler.in_flight)
+            return _mock_response({"results": [1], "next": None, "previous": None})
+
+        with mock.patch("requests.Session.request", side_effect=request):
+            api.get("pvsystem/uuid/")
+            api.get_list("pvsystem/", get_all_pages=True)
+            api.post("pvsystem/", {}, priority=BATCH)
+        self.assertEqual([lane[BATCH] for lane in lanes], [0, 1, 1])
+        self.assertEqual([lane[INTERACTIVE] for lane in lanes], [1, 0, 0])
+        self.assertEqual(api.scheduler.in_flight, {INTERACTIVE: 0, BATCH: 0})
+
+    def test_reserved_quota(self):
+        """Test that the batch calls leave the reserved share of the rate limit to the interactive calls"""
+        api = SteadysunAPI(rate_limit=4, scheduler=PriorityScheduler(reserved_rate_share=0.5))
+        with mock.patch("requests.Session.request", return_value=_mock_response({})):
+            api.get("pvsystem/1/", priority=BATCH)
+            api.get("pvsystem/2/", priority=BATCH)
+            with self.assertRaises(DeadlineExceeded):
+                api.get("pvsystem/3/", priority=BATCH, deadline=0.01)
+            api.get("pvsystem/4/", deadline=0.01)
+            api.get("pvsystem/5/", deadline=0.01)
+        self.assertEqual(api.scheduler.in_flight, {INTERACTIVE: 0, BATCH: 0})
+
+    def test_queued_batch_calls_keep_the_quota(self):
+        """Test that batch calls waiting for a slot don't take rate limit tokens"""
+        api = SteadysunAPI(
+            rate_limit=2, scheduler=PriorityScheduler(max_concurrency=2, reserved_concurrency=1, reserved_rate_share=0)
+        )
+        api.scheduler.acquire(BATCH)  # the batch lane is full
+        with mock.patch("requests.Session.request", return_value=_mock_response({})):
+            for endpoint in ["pvsystem/1/", "pvsystem/2/"]:
+                with self.assertRaises(DeadlineExceeded):
+                    api.get(endpoint, priority=BATCH, deadline=0.01)
+            self.assertEqual(api.rate_limiter.tokens, 2)
+            api.get("pvsystem/3/", deadline=0.01)
+        self.assertEqual(api.scheduler.in_flight, {INTERACTIVE: 0, BATCH: 1})
+
+
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestSteadysunApiPool(unittest.TestCase):
+    """Tests of the per-account clients and the client pool (without calling the API)"""
+
+    def test_explicit_token(self):
+        """Test that a client can use its own token and base URL instead of the environment ones"""
+        with mock.patch.dict(os.environ, {}, clear=True):
+            api = SteadysunAPI(token="b" * 40, base_url="https://example.com/api/")
+        self.assertEqual(api.headers["Authorization"], "Token " + "b" * 40)
+        self.assertEqual(api.base_url, "https://example.com/api/")
+        with self.assertRaises(ValueError):
+            SteadysunAPI(token="12345")
+
+    def test_pool_map(self):
+        """Test that each account uses its own token"""
+        pool = SteadysunAPIPool()
+        pool.add("a", token="a" * 40)
+        pool.add("b", token="b" * 40, rate_limit=10)
+        self.assertIn("a", pool)
+        self.assertEqual(list(pool), ["a", "b"])
+        self.assertIsNotNone(pool["b"].rate_limiter)
+        with self.assertRaises(ValueError):
+            pool.add("a", token="c" * 40)
+
+        def echo_token(*args, headers, **kwargs):
+            return _mock_response({"token": headers["Authorization"]})
+
+        with mock.patch("requests.Session.request", side_effect=echo_token):
+            results = pool.map(lambda client: client.get("account/"))
+        self.assertEqual(results, {"a": {"token": "Token " + "a" * 40}, "b": {"token": "Token " + "b" * 40}})
+        self.assertEqual(list(pool.map(lambda client: client.token, accounts=["b"])), ["b"])
+        pool.remove("a")
+        self.assertEqual(len(pool), 1)
+        pool.close()
+
+    def test_rate_limit_deadline(self):
+        """Test that an exhausted request quota raises DeadlineExceeded before the deadline"""
+        api = SteadysunAPI(token="a" * 40, rate_limit=1)
+        with mock.patch("requests.Session.request", return_value=_mock_response({})) as request:
+            api.get("pvsystem/uuid/", deadline=0.5)
+            with self.assertRaises(DeadlineExceeded):
+                api.get("pvsystem/other/", deadline=0.5)
+        self.assertEqual(request.call_count, 1)
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestDefaultClient(unittest.TestCase):
+    """Tests of the process-wide default client"""
+
+    def tearDown(self) -> None:
+        set_default_client(None)
+        return super().tearDown()
+
+    def test_reused(self):
+        """Test that the default client is created once"""
+        client = get_default_client()
+        self.assertIs(get_default_client(), client)
+        self.assertEqual(client.token, "a" * 40)
+
+    def test_token_change(self):
+        """Test that the default client follows the environment token"""
+        client = get_default_client()
+        SteadysunAPI.set_api_token("b" * 40)
+        self.assertIsNot(get_default_client(), client)
+        self.assertEqual(get_default_client().token, "b" * 40)
+
+    def test_override(self):
+        """Test that a custom default client is used whatever the environment"""
+        client = SteadysunAPI(token="c" * 40)
+        set_default_client(client)
+        SteadysunAPI.set_api_token("b" * 40)
+        self.assertIs(get_default_client(), client)
+        set_default_client(None)
+        self.assertEqual(get_default_client().token, "b" * 40)
+
+    def test_new_process(self):
+        """Test that a forked process does not reuse the HTTP session of its parent"""
+        client = get_default_client()
+        session = client.session
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIs(get_default_client(), client)
+        self.assertIsNot(client.session, session)
@@ -0,0 +1,113 @@
+"""Tests _transport.py"""
+
+import unittest
+from unittest import mock
+
+import requests
+
+from steadysun import _transport
+from steadysun._transport import HTTPXTransport, RequestsTransport, Transport, create_transport
+from steadysun.steadysun_api import SteadysunAPI
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class _RecordingTransport(Transport):
+    """A transport answering every request with a fixed status code"""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.calls = []
+
+    def request(self, method, url, params, json, headers, timeout):
+        self.calls.append((method, url, params, json, headers, timeout))
+        response = requests.Response()
+        response.status_code = self.status_code
+        response._content = b'{"ok": true}'
+        return response
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    """Tests for the transport selection, and the client with a custom transport"""
+
+    def test_create_transport(self):
+        """Test the transports by name."""
+        self.assertIsInstance(create_transport(), RequestsTransport)
+        self.assertIsInstance(create_transport("requests"), RequestsTransport)
+        transport = _RecordingTransport(200)
+        self.assertIs(create_transport(transport), transport)
+        with self.assertRaises(ValueError):
+            create_transport("carrier_pigeon")
+
+    @unittest.skipIf(httpx is not None, "httpx is installed")
+    def test_http2_not_installed(self):
+        """Test the error if the HTTP/2 dependencies are not installed."""
+        with self.assertRaisesRegex(ImportError, "steadysun\\[http2\\]"):
+            SteadysunAPI(token="a" * 40, transport="http2")
+
+    def test_client(self):
+        """Test that the client sends its requests, and handles the errors, through its transport."""
+        transport = _RecordingTransport(200)
+        client = SteadysunAPI(token="a" * 40, transport=transport, base_url="https://api/", coalesce_requests=False)
+        self.assertIsNone(client.session)
+        self.assertEqual(client.get("pvsystem/", params={"page": 2}), {"ok": True})
+        method, url, params, _, headers, _ = transport.calls[0]
+        self.assertEqual((method, url, params), ("GET", "https://api/pvsystem/", {"page": 2}))
+        self.assertEqual(headers["Authorization"], "Token " + "a" * 40)
+
+        transport.status_code = 404
+        with self.assertRaisesRegex(requests.exceptions.HTTPError, "NotFoundError"):
+            client.get("pvsystem/UNKNOWN/")
+
+    def test_abstract(self):
+        """Test that a transport must implement all the methods."""
+        with self.assertRaises(TypeError):
+            Transport()  # pylint: disable=abstract-class-instantiated
+
+    def test_requests_transport(self):
+        """Test that the default transport uses a requests session, replaced by reset."""
+        client = SteadysunAPI(token="a" * 40)
+        session = client.session
+        self.assertIsInstance(session, requests.Session)
+        client.transport.reset()
+        self.assertIsNot(client.session, session)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestHTTPXTransport(unittest.TestCase):
+    """Tests for HTTPXTransport (with a mocked network)"""
+
+    def test_request(self):
+        """Test the conversion of the requests and responses."""
+
+        def handler(request):
+            self.assertEqual(request.url.params.get("page"), "2")
+            self.assertNotIn("fields", request.url.params)
+            return httpx.Response(201, json={"ok": True}, headers={"Content-Type": "application/json"})
+
+        transport = HTTPXTransport(transport=httpx.MockTransport(handler))
+        response = transport.request("GET", "https://api/x/", {"page": 2, "fields": None}, None, {}, (3, 30))
+        self.assertIsInstance(response, requests.Response)
+        self.assertEqual((response.status_code, response.json()), (201, {"ok": True}))
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+    def test_exceptions(self):
+        """Test that the httpx exceptions are converted to requests exceptions."""
+        for error, expected in [
+            (httpx.ConnectTimeout("timeout"), requests.exceptions.ConnectTimeout),
+            (httpx.ReadTimeout("timeout"), requests.exceptions.ReadTimeout),
+            (httpx.ConnectError("refused"), requests.exceptions.ConnectionError),
+        ]:
+            transport = HTTPXTransport(transport=httpx.MockTransport(mock.Mock(side_effect=error)))
+            with self.assertRaises(expected):
+                transport.request("GET", "https://api/x/", None, None, {}, 30)
+        self.assertIsInstance(_transport._to_httpx_timeout((3, 30)), httpx.Timeout)
@@ -0,0 +1,118 @@
+"""Tests archive.py"""
+
+import json
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from steadysun.archive import ForecastArchive
+
+
+def _forecast(issue: pd.Timestamp, n_rows: int = 96, seed: int = 0) -> pd.DataFrame:
+    """A forecast of 2 fields with 2 decimal places, every 15 minutes after its issue time"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(issue, periods=n_rows, freq="15min")
+    hours = index.hour.to_numpy() + index.minute.to_numpy() / 60
+    return pd.DataFrame(
+        {
+            "ghi": np.round(np.clip(800 * np.sin((hours - 6) / 12 * np.pi), 0, None) + rng.normal(0, 1, n_rows), 2),
+            "t2m": np.round(15 + 5 * np.sin(hours / 24 * np.pi) + rng.normal(0, 0.1, n_rows), 2),
+        },
+        index=index.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+
+
+class TestForecastArchive(unittest.TestCase):
+    """Tests for ForecastArchive"""
+
+    def setUp(self):
+        """Create an archive in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.archive = ForecastArchive(self.tmp_dir.name, keyframe_interval=4)
+        self.issues = pd.date_range("2025-01-01", periods=10, freq="1h", tz="UTC")
+        self.forecasts = [_forecast(issue, seed=i) for i, issue in enumerate(self.issues)]
+
+    def append_all(self, archive=None) -> int:
+        """Append all the forecasts, return the archive size."""
+        return sum(
+            (archive or self.archive).append("site", df, 2, issue) for df, issue in zip(self.forecasts, self.issues)
+        )
+
+    def assert_forecast_equal(self, archived_df: pd.DataFrame, forecast_df: pd.DataFrame):
+        """Check that an archived forecast is equal to the original one."""
+        self.assertEqual(
+            archived_df.index.get_level_values("target_time").tolist(), pd.to_datetime(forecast_df.index).tolist()
+        )
+        np.testing.assert_array_equal(archived_df.to_numpy(), forecast_df.to_numpy())
+
+    def test_round_trip(self):
+        """Test that the forecasts are archived without loss, and the compression."""
+        size = self.append_all()
+        self.assertLess(size * 3, sum(df.to_numpy().nbytes for df in self.forecasts))
+        self.assertEqual(self.archive.sites(), ["site"])
+        self.assertEqual(self.archive.issue_times("site").tolist(), self.issues.tolist())
+
+        history_df = self.archive.read("site")
+        self.assertEqual(len(history_df), 960)
+        for issue, forecast_df in zip(self.issues, self.forecasts):
+            self.assert_forecast_equal(history_df.xs(issue, level="issue_time", drop_level=False), forecast_df)
+
+    def test_read_range(self):
+        """Test reading an issue time range (decoded from the previous keyframe), from another instance."""
+        self.append_all()
+        history_df = ForecastArchive(self.tmp_dir.name).read("site", self.issues[5], self.issues[7], fields=["t2m"])
+        self.assertEqual(history_df.index.get_level_values("issue_time").unique().tolist(), self.issues[5:7].tolist())
+        self.assertEqual(list(history_df.columns), ["t2m"])
+        self.assert_forecast_equal(history_df.loc[self.issues[6]], self.forecasts[6][["t2m"]])
+        self.assertEqual(len(self.archive.read("site", "2030-01-01")), 0)
+        self.assertEqual(len(self.archive.read("unknown")), 0)
+
+    def test_column_dtypes(self):
+        """Test that the integer dtype of each column is chosen independently, and the missing values."""
+        forecast_df = self.forecasts[0].assign(energy=np.round(1e6 * self.forecasts[0]["ghi"]))
+        forecast_df.iloc[5, 1] = np.nan
+        self.archive.append("site", forecast_df, 2, self.issues[0])
+        header_size = struct.calcsize("<4sqIB")
+        payload = zlib.decompress((Path(self.tmp_dir.name) / "site.fca").read_bytes()[header_size:])
+        (meta_length,) = struct.unpack_from("<I", payload)
+        meta = json.loads(payload[4:][:meta_length])
+        self.assertEqual(meta["dtypes"], ["<i4", "<i2", "<i8"])
+        self.assert_forecast_equal(self.archive.read("site"), forecast_df)
+
+    def test_missing_values_and_fields(self):
+        """Test missing values, new fields and precision changes."""
+        self.forecasts[1].iloc[3, 0] = np.nan
+        self.forecasts[2]["wind"] = 3.5
+        self.forecasts[3] = self.forecasts[3].drop(columns="ghi")
+        self.archive.append("site", self.forecasts[0], 2, self.issues[0])
+        self.archive.append("site", self.forecasts[1], 2, self.issues[1])
+        self.archive.append("site", self.forecasts[2], 2, self.issues[2])
+        self.archive.append("site", self.forecasts[3], 1, self.issues[3])
+        history_df = self.archive.read("site")
+        self.assertTrue(np.isnan(history_df.loc[(self.issues[1], slice(None)), "ghi"].iloc[3]))
+        self.assertTrue(history_df.loc[self.issues[0], "wind"].isna().all())
+        self.assertTrue((history_df.loc[self.issues[2], "wind"] == 3.5).all())
+        np.testing.assert_array_equal(
+            history_df.loc[self.issues[3], "t2m"].to_numpy(), np.round(self.forecasts[3]["t2m"].to_numpy(), 1)
+        )
+
+    def test_errors(self):
+        """Test the issue time order, infinite values, and recovery of an interrupted append."""
+        self.archive.append("site", self.forecasts[1], 2, self.issues[1])
+        with self.assertRaises(ValueError):
+            self.archive.append("site", self.forecasts[0], 2, self.issues[0])
+        with self.assertRaises(ValueError):
+            self.archive.append("site", self.forecasts[2].replace(15.0, np.inf).assign(ghi=np.inf), 2, self.issues[2])
+
+        with open(Path(self.tmp_dir.name) / "site.fca", "ab") as file:
+            file.write(b"FCA1 partial frame")
+        archive = ForecastArchive(self.tmp_dir.name)
+        self.assertEqual(len(archive.issue_times("site")), 1)
+        archive.append("site", self.forecasts[2], 2, self.issues[2])
+        self.assertEqual(len(ForecastArchive(self.tmp_dir.name).read("site")), 192)
@@ -0,0 +1,65 @@
+"""Tests dask_forecast.py"""
+
+import os
+import threading
+import unittest
+from unittest import mock
+
+from steadysun.dask_forecast import SITE_UUID_COLUMN, _ForecastBatchLoader, _get_worker_client, read_forecasts
+from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN, get_default_client
+from tests.test_forecast import SPLIT_FORECAST, _mock_forecast_request
+
+try:
+    import dask
+except ImportError:
+    dask = None
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+@mock.patch.dict("steadysun.dask_forecast._WORKER_CLIENTS", clear=True)
+class TestReadForecasts(unittest.TestCase):
+    """Tests for read_forecasts and its partitions (without calling the API)"""
+
+    def test_worker_clients(self):
+        """Test that the clients of a worker process are pooled by client parameters."""
+        self.assertIs(_get_worker_client(None), get_default_client())
+        client = _get_worker_client({"token": "b" * 40, "rate_limit": 5})
+        self.assertIs(_get_worker_client({"rate_limit": 5, "token": "b" * 40}), client)
+        self.assertIsNot(_get_worker_client({"token": "b" * 40}), client)
+        self.assertEqual(client.rate_limiter.rate, 5)
+
+    def test_partition(self):
+        """Test that a partition concatenates the forecasts of its sites, within the cluster-wide limit."""
+        semaphore = mock.MagicMock(wraps=threading.Semaphore(1))
+        loader = _ForecastBatchLoader({"fields": "ghi"}, "site", "json", 4, {"token": "b" * 40}, semaphore)
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request) as request:
+            partition_df = loader(["uuid_1", "uuid_2"])
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(request.call_args.kwargs["headers"]["Authorization"], "Token " + "b" * 40)
+        self.assertEqual(list(partition_df.columns), [SITE_UUID_COLUMN] + SPLIT_FORECAST["columns"])
+        self.assertEqual(partition_df[SITE_UUID_COLUMN].tolist(), ["uuid_1", "uuid_1", "uuid_2", "uuid_2"])
+        self.assertEqual(partition_df.index.tolist(), SPLIT_FORECAST["index"] * 2)
+        self.assertEqual(semaphore.__enter__.call_count, 2)
+
+    @unittest.skipIf(dask is not None, "dask is installed")
+    def test_dask_not_installed(self):
+        """Test the error if dask is not installed."""
+        with self.assertRaisesRegex(ImportError, "steadysun\\[dask\\]"):
+            read_forecasts(["uuid_1"])
+
+    @unittest.skipIf(dask is None, "dask is not installed")
+    def test_read_forecasts(self):
+        """Test that the forecasts are fetched lazily, one partition per batch of sites."""
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request) as request:
+            forecasts_ddf = read_forecasts(
+                ["uuid_1", "uuid_2", "uuid_3", "uuid_1"], fields=SPLIT_FORECAST["columns"], batch_size=2
+            )
+            self.assertEqual(request.call_count, 0)
+            self.assertEqual(forecasts_ddf.npartitions, 2)
+            forecasts_df = forecasts_ddf.compute(scheduler="sync")
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(sorted(set(forecasts_df[SITE_UUID_COLUMN])), ["uuid_1", "uuid_2", "uuid_3"])
+        with self.assertRaises(ValueError):
+            read_forecasts(["uuid_1"], batch_size=0)
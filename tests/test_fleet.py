@@ -0,0 +1,101 @@
+"""Tests fleet.py"""
+
+import unittest
+
+import numpy as np
+
+from steadysun.fleet import PVFleet
+from steadysun.models.pvsystem import Racking
+from steadysun.pvsystem import PVSystem
+from tests.test_pvsystem import _steadyweb_config
+
+
+def _pvsystem(index: int, n_arrays: int = 1, tracker: bool = True, **expert_params) -> PVSystem:
+    """Build a PV system with `n_arrays` arrays"""
+    config = _steadyweb_config(f"00000000-0000-0000-0000-{index:012d}")
+    config["name"] = f"site_{index}"
+    config["location"]["coordinates"] = [float(index), 45.0 + index]
+    config["arrays"] = [
+        {**config["arrays"][0], "id": array_id, "pvmodules_pdc0": 1000.0 * (array_id + 1), "orientation": 90 * array_id}
+        for array_id in range(n_arrays)
+    ]
+    if not tracker:
+        config["tracker_config"] = None
+    config.update(expert_params)
+    return PVSystem._from_steadyweb_config(config)
+
+
+class TestPVFleet(unittest.TestCase):
+    """Tests for PVFleet"""
+
+    def setUp(self):
+        """Build a fleet of 4 systems with 1 to 3 arrays."""
+        self.pvsystems = [_pvsystem(0, 1), _pvsystem(1, 3), _pvsystem(2, 2, tracker=False), _pvsystem(3, 1)]
+        self.fleet = PVFleet.from_pvsystems(self.pvsystems, keep_extras=True)
+
+    def test_structure(self):
+        """Test the structured arrays."""
+        self.assertEqual(len(self.fleet), 4)
+        self.assertEqual(len(self.fleet.arrays), 7)
+        self.assertEqual(self.fleet.arrays["system"].tolist(), [0, 1, 1, 1, 2, 2, 3])
+        self.assertEqual(self.fleet.systems["lat"].tolist(), [45.0, 46.0, 47.0, 48.0])
+        self.assertEqual(self.fleet.systems["has_tracker"].tolist(), [True, True, False, True])
+        self.assertTrue(np.isnan(self.fleet.systems["tracker_gcr"][2]))
+        self.assertEqual(self.fleet.arrays["racking"].dtype, np.int8)
+        self.assertTrue(np.all(self.fleet.arrays["racking"] == Racking.open_rack.value))
+        self.assertEqual(self.fleet.pdc0.tolist(), [1000.0, 6000.0, 3000.0, 1000.0])
+        with self.assertRaises(ValueError):
+            self.fleet.systems["lat"][0] = 0
+
+    def test_round_trip(self):
+        """Test the conversion back to PV systems."""
+        self.assertEqual(self.fleet.to_pvsystems(), self.pvsystems)
+        pvsystem = PVFleet.from_pvsystems(self.pvsystems).to_pvsystems()[2]
+        self.assertEqual(pvsystem.expert_params.arrays, self.pvsystems[2].expert_params.arrays)
+        self.assertIsNone(pvsystem.expert_params.tracker_config)
+        self.assertEqual(pvsystem.title, "site_2")
+
+    def test_simulation_parameters(self):
+        """Test that the parameters of the local simulations are stored without extras."""
+        irradiances = {
+            "timestamp_interval": 1,
+            "decomposition_model": 1,
+            "transposition_model": 1,
+            "spectral_model": 1,
+            "aoi_model": 1,
+            "albedo": 0.3,
+            "self_shading": False,
+        }
+        losses = dict.fromkeys(["wiring", "lid", "nameplate_rating", "mismatch", "snow", "shading"], 0)
+        losses.update(availability=0, connections=0, age=2, aging=0.5, aging_auto_compute=False, soiling=10)
+        fleet = PVFleet.from_pvsystems([_pvsystem(0, irradiances=irradiances, losses_parameters=losses), _pvsystem(1)])
+        self.assertIsNone(fleet.extras)
+        np.testing.assert_allclose(fleet.systems["albedo"], [0.3, np.nan])
+        self.assertEqual(fleet.systems["timestamp_interval"].tolist(), [1, 3])
+        np.testing.assert_allclose(fleet.systems["losses_factor"], [0.9 * 0.99, 1.0])
+
+    def test_filter(self):
+        """Test the vectorized selection of sub-fleets."""
+        east = self.fleet.arrays["orientation"] == 90
+        selection = self.fleet[self.fleet.systems_with(east)]
+        self.assertEqual(selection.names.tolist(), ["site_1", "site_2"])
+        self.assertEqual(selection.arrays["system"].tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(selection.to_pvsystems(), self.pvsystems[1:3])
+
+        reordered = self.fleet[[3, 1]]
+        self.assertEqual(reordered.arrays["system"].tolist(), [0, 1, 1, 1])
+        self.assertEqual(reordered.to_pvsystems(), [self.pvsystems[3], self.pvsystems[1]])
+        self.assertEqual(len(self.fleet[2]), 1)
+        self.assertEqual(len(self.fleet[self.fleet.pdc0 > 1e6]), 0)
+        with self.assertRaises(ValueError):
+            self.fleet[[1, 1]]
+
+    def test_index_of(self):
+        """Test finding systems by UUID."""
+        uuids = self.fleet.uuids[[2, 0]]
+        self.assertEqual(self.fleet.index_of(uuids).tolist(), [2, 0])
+        self.assertEqual(self.fleet.index_of(uuids[0]).tolist(), [2])
+        with self.assertRaises(KeyError):
+            self.fleet.index_of(["unknown"])
+        with self.assertRaises(KeyError):
+            self.fleet[[]].index_of(uuids)
@@ -1,10 +1,53 @@
 import os
 import unittest
+from unittest import mock
 
+import numpy as np
+import pandas as pd
+import requests
 from requests.exceptions import HTTPError
 
-from steadysun.forecast import _ForecastParameters, get_forecast
-from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN
+from steadysun._circuit_breaker import CircuitBreaker
+from steadysun.forecast import (
+    _ForecastParameters,
+    _get_forecast_parameters,
+    _split_json_to_dataframe,
+    get_forecast,
+    get_forecasts,
+)
+from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN, SteadysunAPI
+
+SPLIT_FORECAST = {
+    "columns": ["all_sky_global_horizontal_irradiance", "2m_temperature"],
+    "index": ["2025-01-01T00:00:00Z", "2025-01-01T00:30:00Z"],
+    "data": [[0.0, 10.0], [12.5, 10.5]],
+}
+
+
+def _mock_forecast_request(method, url, **_):
+    """Mock of requests.Session.request answering forecast calls, or 404 for unknown uuids"""
+    response = mock.Mock(spec=requests.Response)
+    response.status_code = 404 if "unknown" in url else 200
+    response.text = url
+    response.json.return_value = SPLIT_FORECAST
+    response.headers = {"Content-Type": "application/json"}
+    if response.status_code == 404:
+        response.raise_for_status.side_effect = HTTPError
+    return response
+
+
+def _mock_csv_forecast_request(method, url, headers, **_):
+    """Mock of requests.Session.request answering forecast calls in CSV if accepted"""
+    if not headers.get("Accept", "").startswith("text/csv"):
+        return _mock_forecast_request(method, url)
+    response = mock.Mock(spec=requests.Response)
+    response.status_code = 200
+    response.headers = {"Content-Type": "text/csv; charset=utf-8"}
+    response.content = (
+        b"date,all_sky_global_horizontal_irradiance,2m_temperature\n"
+        b"2025-01-01T00:00:00Z,0.0,10.0\n2025-01-01T00:30:00Z,12.5,10.5\n"
+    )
+    return response
 
 
 class TestForecastParameters(unittest.TestCase):
@@ -43,6 +86,29 @@ class TestForecastParameters(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ForecastParameters(horizon=1, fields=type("RandomClass", (object,), {"content": {}})())
 
+    def test_parameters_are_immutable(self):
+        """Test that the parameters can't be changed once validated."""
+        params = _ForecastParameters(horizon=1)
+        with self.assertRaises(ValueError):
+            params.horizon = 2
+        params.to_dict()["horizon"] = 2
+        self.assertEqual(params.to_dict(), {"horizon": 1})
+
+    def test_parameters_key(self):
+        """Test the query string and stable key of the parameters."""
+        params = _ForecastParameters(horizon=1, fields=["ghi", "t2m"])
+        self.assertEqual(params.query_string, "fields=ghi%2Ct2m&horizon=1")
+        self.assertEqual(params.key, _ForecastParameters(fields="ghi,t2m", horizon=1).key)
+        self.assertNotEqual(params.key, _ForecastParameters(fields="ghi", horizon=1).key)
+
+    def test_get_forecast_parameters_memoized(self):
+        """Test that identical arguments reuse the same validated parameters."""
+        params = _get_forecast_parameters(horizon=60, fields=["ghi", "t2m"])
+        self.assertIs(_get_forecast_parameters(horizon=60, fields=["ghi", "t2m"]), params)
+        self.assertIsNot(_get_forecast_parameters(horizon=60, fields=["ghi"]), params)
+        with self.assertRaises(ValueError):
+            _get_forecast_parameters(fields=[])
+
 
 class TestForecast(unittest.TestCase):
     """Test for the forecast.py file"""
@@ -95,3 +161,126 @@ class TestForecast(unittest.TestCase):
         self.assertEqual(len(forecast_df.columns), 2)
         self.assertIn("all_sky_global_horizontal_irradiance", forecast_df.columns)
         self.assertIn("2m_temperature", forecast_df.columns)
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestGetForecasts(unittest.TestCase):
+    """Tests for get_forecasts (without calling the API)"""
+
+    def test_get_forecasts(self):
+        """Test fetching the forecast of several sites, with duplicates"""
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request) as request:
+            forecast_dfs = get_forecasts(["uuid_1", "uuid_2", "uuid_1"], fields=["ghi"], object_type="site")
+        self.assertEqual(list(forecast_dfs), ["uuid_1", "uuid_2"])
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(list(forecast_dfs["uuid_2"].columns), SPLIT_FORECAST["columns"])
+        urls = sorted(call.kwargs["url"] for call in request.call_args_list)
+        self.assertTrue(urls[0].endswith("forecast/site/uuid_1/"))
+        self.assertEqual(request.call_args.kwargs["params"], {"fields": "ghi"})
+
+    def test_get_forecasts_error(self):
+        """Test that an error on one site is raised"""
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request):
+            with self.assertRaises(HTTPError):
+                get_forecasts(["uuid_1", "unknown_uuid"])
+
+    def test_explicit_client(self):
+        """Test that the given client is used instead of the default one"""
+        client = SteadysunAPI(token="b" * 40)
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request) as request:
+            get_forecast("uuid_1", client=client)
+            get_forecasts(["uuid_2"], client=client)
+        for call in request.call_args_list:
+            self.assertEqual(call.kwargs["headers"]["Authorization"], "Token " + "b" * 40)
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestGetForecastStale(unittest.TestCase):
+    """Tests for the stale data fallback of get_forecast (without calling the API)"""
+
+    def test_stale_on_failure(self):
+        """Test that the last known forecast is returned once the circuit is open"""
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request):
+            forecast_df = get_forecast("stale_uuid", horizon=60, stale_on_failure=True)
+        self.assertNotIn("stale", forecast_df.attrs)
+
+        with mock.patch("requests.Session.request", side_effect=requests.exceptions.ConnectionError) as request:
+            for _ in range(CircuitBreaker().failure_threshold):
+                stale_df = get_forecast("stale_uuid", horizon=60, stale_on_failure=True)
+                self.assertTrue(stale_df.attrs["stale"])
+            stale_df = get_forecast("stale_uuid", horizon=60, stale_on_failure=True)
+        self.assertEqual(request.call_count, CircuitBreaker().failure_threshold)
+        self.assertTrue(stale_df.equals(forecast_df))
+
+        # Without stale data, or without the option, the error is raised
+        with self.assertRaises(requests.exceptions.RequestException):
+            get_forecast("stale_uuid", horizon=120, stale_on_failure=True)
+        with self.assertRaises(requests.exceptions.RequestException):
+            get_forecast("stale_uuid", horizon=60)
+
+    def test_stale_forecasts_are_not_shared_between_accounts(self):
+        """Test that the last known forecast of an account is not returned to another account"""
+        client_a, client_b = SteadysunAPI(token="a" * 40), SteadysunAPI(token="b" * 40)
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request):
+            get_forecast("shared_uuid", horizon=60, stale_on_failure=True, client=client_a)
+
+        with mock.patch("requests.Session.request", side_effect=requests.exceptions.ConnectionError):
+            with self.assertRaises(requests.exceptions.RequestException):
+                get_forecast("shared_uuid", horizon=60, stale_on_failure=True, client=client_b)
+            stale_df = get_forecast("shared_uuid", horizon=60, stale_on_failure=True, client=client_a)
+        self.assertTrue(stale_df.attrs["stale"])
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestForecastResponseFormat(unittest.TestCase):
+    """Tests of the response format negotiation (without calling the API)"""
+
+    def setUp(self) -> None:
+        self.expected_df = pd.DataFrame(
+            data=SPLIT_FORECAST["data"], index=SPLIT_FORECAST["index"], columns=SPLIT_FORECAST["columns"]
+        )
+        return super().setUp()
+
+    def test_split_json(self):
+        """Test the float block conversion of split JSON, with missing values and non-numeric data"""
+        pd.testing.assert_frame_equal(_split_json_to_dataframe(SPLIT_FORECAST), self.expected_df)
+        forecast_df = _split_json_to_dataframe({"columns": ["a", "b"], "index": [0, 1], "data": [[1.5, None], [2, 3]]})
+        self.assertTrue(np.isnan(forecast_df.loc[0, "b"]))
+        self.assertEqual(forecast_df["a"].dtype, np.float64)
+        forecast_df = _split_json_to_dataframe({"columns": ["a"], "index": [0], "data": [["text"]]})
+        self.assertEqual(forecast_df.loc[0, "a"], "text")
+        self.assertEqual(_split_json_to_dataframe({"columns": ["a"], "index": [], "data": []}).shape, (0, 1))
+
+    def test_split_json_integer_columns(self):
+        """Test that the integer and boolean columns keep the dtypes of the generic conversion"""
+        api_data = {"columns": ["a", "b", "c", "d"], "index": [0, 1], "data": [[1, 2.0, True, 1], [3, 4.5, False, 2.5]]}
+        forecast_df = _split_json_to_dataframe(api_data)
+        pd.testing.assert_frame_equal(forecast_df, pd.DataFrame(api_data["data"], index=[0, 1], columns=list("abcd")))
+        self.assertEqual(forecast_df.dtypes.tolist(), [np.int64, np.float64, bool, np.float64])
+        self.assertEqual(
+            _split_json_to_dataframe({"columns": ["a"], "index": [0], "data": [[2**60 + 1]]}).iloc[0, 0], 2**60 + 1
+        )
+
+    def test_csv(self):
+        """Test that CSV is requested and parsed"""
+        with mock.patch("requests.Session.request", side_effect=_mock_csv_forecast_request) as request:
+            forecast_df = get_forecast("uuid_1", response_format="csv")
+        self.assertTrue(request.call_args.kwargs["headers"]["Accept"].startswith("text/csv"))
+        pd.testing.assert_frame_equal(forecast_df, self.expected_df)
+
+    def test_csv_json_fallback(self):
+        """Test that a JSON answer to a CSV request is parsed"""
+        with mock.patch("requests.Session.request", side_effect=_mock_forecast_request):
+            forecast_dfs = get_forecasts(["uuid_1"], response_format="csv")
+        pd.testing.assert_frame_equal(forecast_dfs["uuid_1"], self.expected_df)
+
+    def test_unknown_format(self):
+        """Test that an unknown response format is refused"""
+        with self.assertRaises(ValueError):
+            get_forecast("uuid_1", response_format="xml")
@@ -0,0 +1,148 @@
+"""Tests forecast_cache.py"""
+
+import os
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import requests
+
+from steadysun.forecast import get_forecast
+from steadysun.forecast_cache import ForecastCache
+from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN
+
+ALL_FIELDS = ["ghi", "t2m", "wind"]
+
+
+class TestForecastCache(unittest.TestCase):
+    """Tests for ForecastCache"""
+
+    def setUp(self):
+        """Cache a forecast with two fields."""
+        self.cache = ForecastCache(ttl=60, max_entries=2)
+        self.forecast_df = pd.DataFrame({"ghi": [1.0, 2.0], "t2m": [10.0, 11.0]}, index=["00:00", "00:30"])
+        self.cache.put("key", self.forecast_df)
+
+    def test_projection(self):
+        """Test that a subset of the cached fields is projected."""
+        forecast_df, missing = self.cache.get("key", ["t2m"])
+        self.assertEqual(missing, [])
+        self.assertEqual(list(forecast_df.columns), ["t2m"])
+        forecast_df.iloc[0, 0] = -1
+        self.assertEqual(self.cache.get("key", ["t2m"])[0].iloc[0, 0], 10.0)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_partial(self):
+        """Test the missing fields of a partial hit, and their merge."""
+        forecast_df, missing = self.cache.get("key", ["wind", "ghi"])
+        self.assertEqual((list(forecast_df.columns), missing), (["ghi"], ["wind"]))
+        self.assertEqual(self.cache.get("key", None), (None, []))
+        self.assertIsNone(self.cache.merge("key", pd.DataFrame({"wind": [3.0]}, index=["06:00"])))
+        wind_df = pd.DataFrame({"wind": [3.0, 4.0]}, index=["00:00", "00:30"])
+        merged_df = self.cache.merge("key", wind_df, ["wind", "ghi"])
+        self.assertEqual(list(merged_df.columns), ["wind", "ghi"])
+        self.assertEqual((self.cache.hits, self.cache.partial_hits, self.cache.misses), (0, 1, 1))
+        self.assertEqual(list(self.cache.get("key", ["wind", "ghi"])[0].columns), ["wind", "ghi"])
+        self.assertEqual((self.cache.hits, self.cache.partial_hits, self.cache.misses), (1, 1, 1))
+
+    def test_complete(self):
+        """Test that a complete forecast answers all the requests."""
+        self.cache.put("key", self.forecast_df, complete=True)
+        self.assertEqual(list(self.cache.get("key", None)[0].columns), ["ghi", "t2m"])
+        self.assertEqual(self.cache.get("key", ["ghi", "unknown"])[1], [])
+
+    def test_expiry_and_eviction(self):
+        """Test the time to live and the LRU eviction."""
+        with mock.patch("steadysun.forecast_cache.time.monotonic", return_value=1e12):
+            self.assertEqual(self.cache.get("key", ["ghi"]), (None, []))
+        self.assertEqual(len(self.cache), 0)
+        for key in ["a", "b", "c"]:
+            self.cache.put(key, self.forecast_df)
+        self.assertIsNone(self.cache.get("a", ["ghi"])[0])
+        self.assertEqual(len(self.cache), 2)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_export_import(self):
+        """Test that the fresh forecasts are exported and imported with their age."""
+        self.cache.put("other", self.forecast_df, complete=True)
+        entries = self.cache.export_entries()
+        self.assertEqual([(key, complete) for key, _, complete, _ in entries], [("key", False), ("other", True)])
+
+        cache = ForecastCache(ttl=60, max_entries=1)
+        self.assertEqual(cache.import_entries([("old", self.forecast_df, True, 120.0), *entries]), 2)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(list(cache.get("other", None)[0].columns), ["ghi", "t2m"])
+        with mock.patch("steadysun.forecast_cache.time.monotonic", return_value=time.monotonic() + 61.0):
+            self.assertEqual(cache.get("other", None), (None, []))
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestGetForecastWithCache(unittest.TestCase):
+    """Tests of get_forecast with a cache (without calling the API)"""
+
+    def setUp(self):
+        """Mock the API, answering the requested fields of the current run."""
+        self.run = "2025-01-01T00:00:00Z"
+        patcher = mock.patch("requests.Session.request", side_effect=self._request)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, method, url, params, **_):
+        fields = params["fields"].split(",") if "fields" in params else ALL_FIELDS
+        response = mock.Mock(spec=requests.Response)
+        response.status_code = 200
+        response.json.return_value = {
+            "columns": fields,
+            "index": [self.run],
+            "data": [[float(ALL_FIELDS.index(field)) for field in fields]],
+        }
+        return response
+
+    def requested_fields(self):
+        """The fields requested by the last call."""
+        return self.request.call_args.kwargs["params"].get("fields")
+
+    def test_fetches_missing_fields_only(self):
+        """Test that only the missing fields are fetched, and the cached ones projected."""
+        cache = ForecastCache()
+        get_forecast("uuid", horizon=60, fields=["ghi"], cache=cache)
+        forecast_df = get_forecast("uuid", horizon=60, fields=["t2m", "ghi"], cache=cache)
+        self.assertEqual(self.requested_fields(), "t2m")
+        self.assertEqual(list(forecast_df.columns), ["t2m", "ghi"])
+        self.assertEqual(forecast_df.iloc[0].tolist(), [1.0, 0.0])
+
+        get_forecast("uuid", horizon=60, fields=["ghi"], cache=cache)
+        get_forecast("uuid", horizon=60, fields=["t2m"], cache=cache, stale_on_failure=True)
+        self.assertEqual(self.request.call_count, 2)
+
+        # Other parameters or sites are other entries
+        get_forecast("uuid", horizon=120, fields=["ghi"], cache=cache)
+        get_forecast("uuid_2", horizon=60, fields=["ghi"], cache=cache)
+        self.assertEqual(self.request.call_count, 4)
+
+        # Each request is counted once
+        self.assertEqual((cache.hits, cache.partial_hits, cache.misses), (2, 1, 3))
+
+    def test_all_fields(self):
+        """Test that a request of all the fields answers the subsets."""
+        cache = ForecastCache()
+        get_forecast("uuid", cache=cache)
+        forecast_df = get_forecast("uuid", fields=["wind"], cache=cache)
+        self.assertEqual(self.request.call_count, 1)
+        self.assertEqual(forecast_df["wind"].tolist(), [2.0])
+
+    def test_new_run(self):
+        """Test that all the requested fields are fetched again if a new run is available."""
+        cache = ForecastCache()
+        get_forecast("uuid", fields=["ghi"], cache=cache)
+        self.run = "2025-01-01T00:15:00Z"
+        forecast_df = get_forecast("uuid", fields=["ghi", "t2m"], cache=cache)
+        self.assertEqual(self.request.call_count, 3)
+        self.assertEqual(self.requested_fields(), "ghi,t2m")
+        self.assertEqual(forecast_df.index.tolist(), [self.run])
+        self.assertEqual(get_forecast("uuid", fields=["t2m"], cache=cache).index.tolist(), [self.run])
+        self.assertEqual(self.request.call_count, 3)
@@ -0,0 +1,106 @@
+"""Tests forecast_store.py"""
+
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from steadysun.forecast_store import ForecastStore
+
+SITE_UUID = "be64cdf1-22e5-4072-85d8-d6c1502c4460"
+
+
+def _forecast(issue_time: str, ghi_offset: float) -> pd.DataFrame:
+    """Build a 4 hours forecast (30 minutes time step) starting at issue_time, with iso_8601 index."""
+    index = pd.date_range(issue_time, periods=8, freq="30min", tz="UTC")
+    return pd.DataFrame(
+        {"all_sky_global_horizontal_irradiance": np.arange(8) + ghi_offset, "2m_temperature": np.full(8, 10.0)},
+        index=index.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+
+
+class TestForecastStore(unittest.TestCase):
+    """Tests for ForecastStore"""
+
+    def setUp(self):
+        """Create a store with three issues in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.store = ForecastStore(self.tmp_dir.name)
+        for hour, issue_time in enumerate(["2025-01-01 00:00", "2025-01-01 01:00", "2025-01-01 02:00"]):
+            self.store.append(SITE_UUID, _forecast(issue_time, 100 * hour), issue_time=issue_time)
+
+    def tearDown(self):
+        """Remove the temporary store."""
+        self.tmp_dir.cleanup()
+
+    def test_sites_and_fields(self):
+        """Test listing sites and fields."""
+        self.assertEqual(self.store.sites(), [SITE_UUID])
+        self.assertEqual(self.store.fields(SITE_UUID), ["2m_temperature", "all_sky_global_horizontal_irradiance"])
+
+    def test_query_all(self):
+        """Test reading the whole history."""
+        history_df = self.store.query(SITE_UUID)
+        self.assertEqual(len(history_df), 24)
+        self.assertEqual(history_df.index.names, ["issue_time", "target_time"])
+        self.assertEqual(history_df.index.get_level_values("issue_time").nunique(), 3)
+
+    def test_query_ranges(self):
+        """Test reading issue and target time ranges."""
+        history_df = self.store.query(
+            SITE_UUID,
+            fields=["all_sky_global_horizontal_irradiance"],
+            issue_start="2025-01-01 01:00",
+            target_start="2025-01-01 02:00",
+            target_end="2025-01-01 03:00",
+        )
+        self.assertEqual(list(history_df.columns), ["all_sky_global_horizontal_irradiance"])
+        # Issue 01:00 gives targets 02:00 and 02:30, issue 02:00 gives 02:00 and 02:30
+        self.assertEqual(list(history_df["all_sky_global_horizontal_irradiance"]), [102, 103, 200, 201])
+
+        history_df = self.store.query(SITE_UUID, issue_end="2025-01-01 01:00")
+        self.assertEqual(len(history_df), 8)
+
+    def test_latest(self):
+        """Test reading the last forecast."""
+        latest_df = self.store.latest(SITE_UUID)
+        self.assertEqual(len(latest_df), 8)
+        self.assertEqual(latest_df["all_sky_global_horizontal_irradiance"].iloc[0], 200)
+
+    def test_new_field_and_missing_field(self):
+        """Test appending forecasts with different fields."""
+        forecast_df = _forecast("2025-01-01 03:00", 300).rename(columns={"2m_temperature": "10m_wind_speed"})
+        self.store.append(SITE_UUID, forecast_df, issue_time="2025-01-01 03:00")
+        history_df = self.store.query(SITE_UUID)
+        self.assertEqual(history_df["10m_wind_speed"].isna().sum(), 24)
+        self.assertEqual(history_df["2m_temperature"].isna().sum(), 8)
+
+    def test_time_stamp_index(self):
+        """Test appending forecasts indexed by time stamps."""
+        forecast_df = _forecast("2025-01-01 03:00", 300)
+        forecast_df.index = (pd.to_datetime(forecast_df.index) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta("1s")
+        with self.assertRaises(ValueError):
+            self.store.append(SITE_UUID, forecast_df, issue_time="2025-01-01 03:00")
+        self.store.append(SITE_UUID, forecast_df, issue_time="2025-01-01 03:00", time_stamp_unit="s")
+        self.assertEqual(self.store.latest(SITE_UUID).index[0], pd.Timestamp("2025-01-01 03:00", tz="UTC"))
+
+    def test_append_out_of_order(self):
+        """Test that forecasts must be appended in issue order."""
+        with self.assertRaises(ValueError):
+            self.store.append(SITE_UUID, _forecast("2024-12-31 00:00", 0), issue_time="2024-12-31 00:00")
+
+    def test_same_issue_time(self):
+        """Test that a forecast issued at the same time as the last one must follow it in target time."""
+        with self.assertRaises(ValueError):
+            self.store.append(SITE_UUID, _forecast("2025-01-01 03:00", 0), issue_time="2025-01-01 02:00")
+        self.store.append(SITE_UUID, _forecast("2025-01-01 06:00", 300), issue_time="2025-01-01 02:00")
+        history_df = self.store.query(SITE_UUID, target_start="2025-01-01 03:30", target_end="2025-01-01 06:30")
+        self.assertEqual(
+            list(history_df["all_sky_global_horizontal_irradiance"]), [7, 105, 106, 107, 203, 204, 205, 206, 207, 300]
+        )
+
+    def test_bad_names(self):
+        """Test that unsafe names are refused."""
+        with self.assertRaises(ValueError):
+            self.store.append("../other", _forecast("2025-01-01 03:00", 0))
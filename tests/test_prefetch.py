@@ -0,0 +1,127 @@
+"""Tests prefetch.py"""
+
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from steadysun import forecast
+from steadysun.forecast import get_forecast
+from steadysun.prefetch import ForecastPrefetcher
+from steadysun.steadysun_api import ENV_STEADYSUN_API_TOKEN, SteadysunAPI
+from tests.test_forecast import _mock_forecast_request
+
+
+@mock.patch.dict(os.environ, {ENV_STEADYSUN_API_TOKEN: "a" * 40})
+@mock.patch.dict("steadysun.steadysun_api._CIRCUIT_BREAKERS", clear=True)
+@mock.patch("steadysun.steadysun_api._DEFAULT_CLIENT", None)
+class TestForecastPrefetcher(unittest.TestCase):
+    """Tests for ForecastPrefetcher (without calling the API)"""
+
+    def setUp(self):
+        """Mock the API."""
+        patcher = mock.patch("requests.Session.request", side_effect=_mock_forecast_request)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_next_refresh_time(self):
+        """Test the alignment of the refreshes with the run schedule."""
+        prefetcher = ForecastPrefetcher([], refresh_interval=900, run_delay=120)
+        self.assertEqual(prefetcher.next_refresh_time(now=900), 1020)
+        self.assertEqual(prefetcher.next_refresh_time(now=1020), 1920)
+        self.assertEqual(prefetcher.next_refresh_time(now=1019.5), 1020)
+        with self.assertRaises(ValueError):
+            ForecastPrefetcher([], refresh_interval=0)
+
+    def test_served_from_memory(self):
+        """Test that get_forecast is served from memory while the prefetcher is running."""
+        with ForecastPrefetcher(["uuid_1"], horizon=60) as prefetcher:
+            self.assertEqual(self.request.call_count, 1)
+            self.assertIn(prefetcher, forecast._PREFETCHERS)
+            forecast_df = get_forecast("uuid_1", horizon=60)
+            self.assertEqual(self.request.call_count, 1)
+            self.assertIn("fetched_at", forecast_df.attrs)
+            forecast_df.iloc[0, 0] = -1  # a copy is returned
+            self.assertNotEqual(prefetcher.get("uuid_1").forecast_df.iloc[0, 0], -1)
+
+            # Other parameters, sites or accounts call the API
+            get_forecast("uuid_1", horizon=120)
+            get_forecast("uuid_2", horizon=60)
+            get_forecast("uuid_1", horizon=60, client=SteadysunAPI(token="b" * 40))
+            self.assertEqual(self.request.call_count, 4)
+        self.assertNotIn(prefetcher, forecast._PREFETCHERS)
+        self.assertFalse(prefetcher.running)
+
+    def test_staleness(self):
+        """Test the staleness metadata, and that stale forecasts are not served."""
+        prefetcher = ForecastPrefetcher(["uuid_1", "unknown_uuid"], refresh_interval=60)
+        prefetcher.refresh()
+        status = prefetcher.status()
+        self.assertEqual(status.loc["uuid_1", "stale"], False)
+        self.assertIsNone(status.loc["uuid_1", "error"])
+        self.assertEqual(status.loc["unknown_uuid", "stale"], True)
+        self.assertIsNotNone(status.loc["unknown_uuid", "error"])
+
+        first_change = prefetcher.get("uuid_1").changed_at
+        prefetcher.refresh()  # same data: not a new run
+        self.assertEqual(prefetcher.get("uuid_1").changed_at, first_change)
+
+        key = ("pvsystem", "uuid_1", prefetcher._parameters.key)
+        self.assertIsNotNone(prefetcher.lookup(key, "a" * 40))
+        with mock.patch("time.time", return_value=time.time() + 121):
+            self.assertIsNone(prefetcher.lookup(key, "a" * 40))
+            self.assertTrue(prefetcher.status().loc["uuid_1", "stale"])
+
+    def test_failed_refresh_keeps_forecast(self):
+        """Test that a failed refresh keeps the previous forecast and records the error."""
+        prefetcher = ForecastPrefetcher(["uuid_1"])
+        prefetcher.refresh()
+        self.request.side_effect = requests.exceptions.ConnectionError("down")
+        prefetcher.refresh()
+        entry = prefetcher.get("uuid_1")
+        self.assertIsNotNone(entry.forecast_df)
+        self.assertIn("down", entry.error)
+
+    def test_background_refresh(self):
+        """Test that the background thread refreshes the forecasts on schedule."""
+        prefetcher = ForecastPrefetcher(["uuid_1"], refresh_interval=0.05)
+        prefetcher.start(wait=False)
+        time.sleep(0.3)
+        prefetcher.stop()
+        self.assertGreaterEqual(self.request.call_count, 3)
+        prefetcher.add_sites(["uuid_2"])
+        prefetcher.remove_sites(["uuid_1"])
+        self.assertEqual(prefetcher.site_uuids, ["uuid_2"])
+
+    def test_first_background_refresh_failure(self):
+        """Test that a failure of the first background refresh doesn't stop the background thread."""
+        prefetcher = ForecastPrefetcher(["uuid_1"], refresh_interval=0.05)
+        with mock.patch.object(
+            ForecastPrefetcher, "refresh", side_effect=[ValueError("no token")] + [None] * 100
+        ) as refresh:
+            with self.assertLogs("steadysun.prefetch", level="ERROR"):
+                prefetcher.start(wait=False)
+                time.sleep(0.2)
+            self.assertTrue(prefetcher.running)
+            prefetcher.stop()
+        self.assertGreaterEqual(refresh.call_count, 2)
+
+    def test_restart_during_slow_refresh(self):
+        """Test that a prefetcher can't be restarted while the thread of a timed out stop is still refreshing."""
+        prefetcher = ForecastPrefetcher(["uuid_1"], refresh_interval=60)
+        release = threading.Event()
+        with mock.patch.object(ForecastPrefetcher, "refresh", side_effect=lambda: release.wait(5)):
+            prefetcher.start(wait=False)
+            prefetcher.stop(timeout=0.05)
+            self.assertTrue(prefetcher.running)
+            with self.assertRaises(RuntimeError):
+                prefetcher.start(wait=False)
+            release.set()
+            prefetcher.stop()
+            self.assertFalse(prefetcher.running)
+            prefetcher.start(wait=False)
+            self.assertTrue(prefetcher.running)
+            prefetcher.stop()
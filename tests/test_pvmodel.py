@@ -0,0 +1,115 @@
+"""Tests pvmodel.py"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from steadysun.fleet import PVFleet
+from steadysun.pvmodel import (
+    GHI_FIELD,
+    TEMPERATURE_FIELD,
+    _single_axis_rotation,
+    simulate_fleet_power,
+    simulate_power,
+    solar_position,
+)
+from steadysun.pvsystem import PVSystem
+from tests.test_pvsystem import _steadyweb_config
+
+TIMES = pd.date_range("2025-06-21", periods=96, freq="15min", tz="UTC")
+
+
+def _pvsystem(index: int, pv_type: int = 1, orientation: float = 180, **expert_params) -> PVSystem:
+    """Build a 1 kW PV system at 45°N, 0°E (fixed by default)"""
+    config = _steadyweb_config(f"00000000-0000-0000-0000-{index:012d}")
+    config["location"]["coordinates"] = [0.0, 45.0]
+    config["pv_type"] = pv_type
+    config["arrays"][0].update({"pvmodules_pdc0": 1000.0, "orientation": orientation, "inclination": 30})
+    config["inverter_parameters"] = {"pdc0": 1000, "eta_inv_nom": 0.96}
+    config.update(expert_params)
+    return PVSystem._from_steadyweb_config(config)
+
+
+def _clear_sky_ghi() -> np.ndarray:
+    """A clear-sky like global horizontal irradiance at 45°N, 0°E"""
+    zenith, _ = solar_position(TIMES, 45.0, 0.0)
+    return np.clip(1000 * np.cos(np.radians(zenith[:, 0])), 0, None)
+
+
+class TestSolarPosition(unittest.TestCase):
+    """Tests for solar_position"""
+
+    def test_solar_noon(self):
+        """Test the solar position in Paris, at the solar noon of the summer solstice."""
+        zenith, azimuth = solar_position(pd.date_range("2025-06-21 11:50", periods=3, freq="1min"), 48.85, 2.35)
+        self.assertEqual(zenith.shape, (3, 1))
+        np.testing.assert_allclose(zenith[:, 0], 48.85 - 23.44, atol=0.5)
+        self.assertLess(abs(azimuth[1, 0] - 180), 2)
+
+    def test_backtracking(self):
+        """Test that backtracking reduces the rotation of trackers at low sun, not at noon."""
+        zenith, azimuth = np.array([80.0, 20.0]), np.array([90.0, 180.0])
+        ideal = _single_axis_rotation(zenith, azimuth, 180.0, 60.0, np.nan)
+        backtracked = _single_axis_rotation(zenith, azimuth, 180.0, 60.0, 0.4)
+        self.assertEqual(ideal[0], -60.0)
+        self.assertGreater(backtracked[0], -30.0)
+        self.assertAlmostEqual(backtracked[1], ideal[1])
+
+
+class TestSimulatePower(unittest.TestCase):
+    """Tests for simulate_power and simulate_fleet_power"""
+
+    def setUp(self):
+        """Build a forecast of a clear summer day."""
+        self.forecast_df = pd.DataFrame(
+            {GHI_FIELD: _clear_sky_ghi(), TEMPERATURE_FIELD: 25.0}, index=TIMES.strftime("%Y-%m-%dT%H:%M:%SZ")
+        )
+
+    def energy(self, pvsystem: PVSystem, **kwargs) -> float:
+        """The daily energy of a PV system (Wh)."""
+        return simulate_power(pvsystem, self.forecast_df, **kwargs).sum() / 4
+
+    def test_simulate_power(self):
+        """Test the power of a fixed PV system: zero at night, clipped, and plausible daily energy."""
+        power = simulate_power(_pvsystem(0), self.forecast_df)
+        self.assertEqual(power.index.tolist(), TIMES.tolist())
+        self.assertTrue((power[power.index.hour < 3] == 0).all())
+        self.assertLessEqual(power.max(), 960.0 + 1e-9)
+        self.assertTrue(4000 < self.energy(_pvsystem(0)) < 9000)
+
+        self.forecast_df.iloc[48, 0] = np.nan
+        self.assertTrue(np.isnan(simulate_power(_pvsystem(0), self.forecast_df).iloc[48]))
+        with self.assertRaises(KeyError):
+            simulate_power(_pvsystem(0), self.forecast_df[[GHI_FIELD]])
+
+    def test_configurations(self):
+        """Test the effect of the configuration: orientation, trackers, temperature, inverter and losses."""
+        south = self.energy(_pvsystem(0))
+        self.assertLess(self.energy(_pvsystem(0, orientation=0)), south)
+        self.assertGreater(self.energy(_pvsystem(0, pv_type=2)), south)
+        self.assertGreater(self.energy(_pvsystem(0, pv_type=3)), self.energy(_pvsystem(0, pv_type=2)))
+        self.assertLess(
+            simulate_power(_pvsystem(0), self.forecast_df.assign(**{TEMPERATURE_FIELD: 40})).sum() / 4, south
+        )
+        self.assertLess(self.energy(_pvsystem(0, inverter_parameters={"pdc0": 300, "eta_inv_nom": 0.96})), south)
+
+        losses = dict.fromkeys(["wiring", "lid", "nameplate_rating", "mismatch", "snow", "shading"], 0)
+        losses.update(availability=0, connections=0, age=0, aging=0, aging_auto_compute=False, soiling=20)
+        self.assertLess(self.energy(_pvsystem(0, losses_parameters=losses)), 0.85 * south)
+
+    def test_fleet(self):
+        """Test that a fleet is simulated in one pass, with per-system weather."""
+        pvsystems = [_pvsystem(0), _pvsystem(1, pv_type=2), _pvsystem(2, orientation=90)]
+        fleet = PVFleet.from_pvsystems(pvsystems)
+        ghi = pd.DataFrame({str(pvsystem.uuid): self.forecast_df[GHI_FIELD].to_numpy() for pvsystem in pvsystems})
+        ghi[str(pvsystems[2].uuid)] /= 2
+
+        power_df = simulate_fleet_power(fleet, TIMES, ghi, 25.0)
+        self.assertEqual(power_df.shape, (96, 3))
+        self.assertEqual(power_df.columns.tolist(), fleet.uuids.tolist())
+        for pvsystem in pvsystems[:2]:
+            np.testing.assert_allclose(power_df[str(pvsystem.uuid)], simulate_power(pvsystem, self.forecast_df))
+        self.assertLess(power_df.iloc[:, 2].sum(), simulate_power(pvsystems[2], self.forecast_df).sum())
+        with self.assertRaises(ValueError):
+            simulate_fleet_power(fleet, TIMES, ghi.iloc[:, :2], 25.0)
@@ -2,10 +2,12 @@ import json
 import math
 import os
 import unittest
+from unittest import mock
 
 from requests import HTTPError
 
-from steadysun.pvsystem import PVSystem, get_pvsystem_uuids
+from steadysun.models.pvsystem import PVType
+from steadysun.pvsystem import PVSystem, PVSystemSummary, get_pvsystem_summaries, get_pvsystem_uuids
 from steadysun.steadysun_api import SteadysunAPI
 from tests import DATA_DIR
 
@@ -21,6 +23,18 @@ def _compare_config(a, b):
     return a == b
 
 
+def _steadyweb_config(uuid: str) -> dict:
+    """Full Steadyweb configuration of a PV system, as returned by the API"""
+    with open(os.path.join(DATA_DIR, "pvsystem_config.json"), encoding="utf-8") as f:
+        config = json.load(f)
+    config["uuid"] = uuid
+    config["arrays"][0]["id"] = 1
+    config["inverter_parameters"] = {"pdc0": 10000, "eta_inv_nom": 0.97}
+    config["irradiances"] = None
+    config["losses_parameters"] = None
+    return config
+
+
 class TestPvsystem(unittest.TestCase):
     """Test for the pvsystem.py file"""
 
@@ -84,3 +98,41 @@ class TestPvsystem(unittest.TestCase):
         same_pvsystem.delete()
         with self.assertRaises(HTTPError):
             PVSystem.from_uuid(pvsystem.uuid)
+
+
+class TestPVSystemSummary(unittest.TestCase):
+    """Tests for PVSystemSummary (without calling the API)"""
+
+    def setUp(self) -> None:
+        self.uuids = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+        self.client = mock.Mock(spec=SteadysunAPI)
+        self.client.get_list.return_value = {"results": [_steadyweb_config(uuid) for uuid in self.uuids]}
+        self.client.get.side_effect = lambda endpoint: _steadyweb_config(endpoint.split("/")[1])
+        return super().setUp()
+
+    def test_list_without_expert_params(self):
+        """Test that listing the summaries does not fetch nor validate the expert parameters"""
+        summaries = get_pvsystem_summaries(client=self.client)
+        self.assertEqual([str(summary.uuid) for summary in summaries], self.uuids)
+        self.assertEqual(summaries[0].name, "CI_test_site")
+        self.assertEqual(summaries[0].pv_type, PVType.single_axis)
+        self.assertFalse(summaries[0].expert_params_loaded)
+        self.assertNotIn("arrays", summaries[0].model_dump())
+        self.client.get.assert_not_called()
+
+    def test_lazy_expert_params(self):
+        """Test that the expert parameters are fetched once, on access"""
+        summary = PVSystemSummary.from_steadyweb_config({"uuid": self.uuids[0], "name": "site"}, client=self.client)
+        self.assertEqual(summary.expert_params.arrays[0].pvmodules_pdc0, 10000)
+        self.assertEqual(summary.expert_params.tracker_config.gcr, 0.34)
+        self.assertTrue(summary.expert_params_loaded)
+        self.client.get.assert_called_once_with(f"pvsystem/{self.uuids[0]}/")
+
+    def test_to_pvsystem(self):
+        """Test the conversion to a full PVSystem"""
+        summary = PVSystemSummary.from_steadyweb_config({"uuid": self.uuids[1], "name": "site"}, client=self.client)
+        pvsystem = summary.to_pvsystem()
+        self.assertIsInstance(pvsystem, PVSystem)
+        self.assertEqual(pvsystem.uuid, summary.uuid)
+        self.assertIs(summary.expert_params, pvsystem.expert_params)
+        self.assertEqual(self.client.get.call_count, 1)
@@ -0,0 +1,60 @@
+"""Tests shared_forecast.py"""
+
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from steadysun.shared_forecast import SharedForecast
+
+
+def _sum_shared_forecast(descriptor):
+    """Attach a shared forecast from another process and sum its columns."""
+    with SharedForecast.attach(descriptor) as shared:
+        forecast_df = shared.to_dataframe()
+        result = forecast_df.sum().to_dict()
+        del forecast_df
+    return result
+
+
+class TestSharedForecast(unittest.TestCase):
+    """Tests for SharedForecast"""
+
+    def setUp(self):
+        """Build a small forecast DataFrame."""
+        self.forecast_df = pd.DataFrame(
+            {"all_sky_global_horizontal_irradiance": [0.0, 150.5, 420.25], "2m_temperature": [10.0, 12.5, 15]},
+            index=[1704067200, 1704069000, 1704070800],
+        )
+
+    def test_round_trip(self):
+        """Test that an attached forecast is equal to the original one and is not a copy."""
+        with SharedForecast.from_dataframe(self.forecast_df) as owner:
+            descriptor = pickle.loads(pickle.dumps(owner.descriptor))
+            with SharedForecast.attach(descriptor) as shared:
+                forecast_df = shared.to_dataframe()
+                pd.testing.assert_frame_equal(forecast_df, self.forecast_df)
+                self.assertTrue(np.shares_memory(forecast_df[forecast_df.columns[0]].to_numpy(), shared.shm.buf))
+                del forecast_df
+
+    def test_string_index(self):
+        """Test that iso_8601 string indexes are supported."""
+        self.forecast_df.index = ["2024-01-01T00:00:00Z", "2024-01-01T00:30:00Z", "2024-01-01T01:00:00Z"]
+        with SharedForecast.from_dataframe(self.forecast_df) as owner:
+            forecast_df = owner.to_dataframe()
+            self.assertEqual(list(forecast_df.index), list(self.forecast_df.index))
+            del forecast_df
+
+    def test_non_numeric_forecast(self):
+        """Test that non numeric forecasts are refused."""
+        with self.assertRaises(ValueError):
+            SharedForecast.from_dataframe(pd.DataFrame({"a": ["x", "y"]}))
+
+    def test_other_process(self):
+        """Test attaching the forecast from a worker process."""
+        with SharedForecast.from_dataframe(self.forecast_df) as owner:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(_sum_shared_forecast, owner.descriptor).result()
+        self.assertEqual(result, self.forecast_df.sum().to_dict())
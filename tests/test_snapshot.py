@@ -0,0 +1,114 @@
+"""Tests snapshot.py"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from pydantic_geojson._base import Coordinates
+
+from steadysun.forecast_cache import ForecastCache
+from steadysun.models.pvsystem import ModuleMaterial
+from steadysun.pvsystem import PVSystem
+from steadysun.snapshot import Snapshot
+from steadysun.steadysun_api import SteadysunAPI
+from tests.test_pvsystem import _steadyweb_config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+UUIDS = [f"00000000-0000-0000-0000-{index:012d}" for index in range(3)]
+
+
+def _list_items(names):
+    """Items of the PV system list (full configurations)"""
+    return [{**_steadyweb_config(uuid), "name": name} for uuid, name in zip(UUIDS, names)]
+
+
+class TestSnapshot(unittest.TestCase):
+    """Tests for Snapshot (the file tests need msgpack)"""
+
+    def setUp(self):
+        """Create clients of two accounts."""
+        self.client = SteadysunAPI(token="a" * 40)
+        self.other_client = SteadysunAPI(token="b" * 40)
+
+    def refresh(self, snapshot, items):
+        """Refresh a snapshot from a mocked PV system list."""
+        with mock.patch.object(self.client, "get_list", return_value={"results": items}):
+            with mock.patch.object(self.client, "get", side_effect=lambda endpoint: _steadyweb_config(UUIDS[2])):
+                return snapshot.refresh_pvsystems(client=self.client)
+
+    def test_payload_round_trip(self):
+        """Test that the PV systems are rebuilt without validation, equal to the validated ones."""
+        snapshot = Snapshot()
+        self.refresh(snapshot, _list_items(["a", "b", "c"]))
+        restored = Snapshot._from_payload(snapshot._to_payload())
+        self.assertEqual(len(restored), 3)
+        self.assertEqual(restored.pvsystems, snapshot.pvsystems)
+        pvsystem = restored.pvsystems[0]
+        self.assertIsInstance(pvsystem, PVSystem)
+        self.assertIsInstance(pvsystem.location.coordinates, Coordinates)
+        self.assertIs(pvsystem.expert_params.arrays[0].module_material, ModuleMaterial.monosi)
+
+        with self.assertRaisesRegex(ValueError, "schema version"):
+            Snapshot._from_payload({**snapshot._to_payload(), "schema_version": 0})
+
+    def test_refresh_pvsystems(self):
+        """Test that only the new and changed PV systems are validated (or fetched), and deleted ones removed."""
+        snapshot = Snapshot()
+        self.assertEqual(self.refresh(snapshot, _list_items(["a", "b"])), UUIDS[:2])
+        first = snapshot.pvsystems[0]
+        snapshot = Snapshot._from_payload(snapshot._to_payload())
+
+        items = _list_items(["a", "renamed", "c"])
+        items[2] = {"uuid": UUIDS[2], "name": "c"}  # without the expert parameters: fetched
+        self.assertEqual(self.refresh(snapshot, items), UUIDS[1:])
+        self.assertEqual([pvsystem.name for pvsystem in snapshot.pvsystems], ["a", "renamed", "CI_test_site"])
+        self.assertEqual(snapshot.pvsystems[0], first)
+
+        self.assertEqual(self.refresh(snapshot, items[1:]), [])
+        self.assertEqual(len(snapshot), 2)
+
+    def test_cache(self):
+        """Test that the forecasts of an account are captured without the token, and restored for another."""
+        forecast_df = pd.DataFrame({"ghi": [1.0, 2.5]}, index=["2025-01-01T00:00:00Z", "2025-01-01T00:15:00Z"])
+        cache = ForecastCache(ttl=300)
+        cache.put(("a" * 40, "pvsystem", UUIDS[0], "params"), forecast_df, complete=True)
+        cache.put(("c" * 40, "pvsystem", UUIDS[1], "params"), forecast_df)
+
+        snapshot = Snapshot()
+        snapshot.capture_cache(cache, client=self.client)
+        payload = snapshot._to_payload()
+        self.assertNotIn("a" * 40, repr(payload))
+        self.assertEqual(len(payload["forecasts"]), 1)
+
+        restored_cache = ForecastCache(ttl=300)
+        restored = Snapshot._from_payload({**payload, "saved_at": 0.0})
+        self.assertEqual(restored.restore_cache(restored_cache, client=self.other_client), 0)  # expired
+        restored = Snapshot._from_payload(payload)
+        self.assertEqual(restored.restore_cache(restored_cache, client=self.other_client), 1)
+        cached_df, missing = restored_cache.get(("b" * 40, "pvsystem", UUIDS[0], "params"), None)
+        pd.testing.assert_frame_equal(cached_df, forecast_df)
+        self.assertEqual(missing, [])
+
+    @unittest.skipIf(msgpack is not None, "msgpack is installed")
+    def test_msgpack_not_installed(self):
+        """Test the error if msgpack is not installed."""
+        with self.assertRaisesRegex(ImportError, "steadysun\\[snapshot\\]"):
+            Snapshot().save("state.snapshot")
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_file(self):
+        """Test saving and loading a snapshot file."""
+        snapshot = Snapshot()
+        self.refresh(snapshot, _list_items(["a", "b", "c"]))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "state.snapshot"
+            snapshot.save(path)
+            restored = Snapshot.load(path)
+        self.assertEqual(restored.pvsystems, snapshot.pvsystems)
+        self.assertEqual(restored.saved_at, snapshot.saved_at)
@@ -0,0 +1,76 @@
+"""Tests sweep.py"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from steadysun.pvmodel import GHI_FIELD, TEMPERATURE_FIELD, simulate_power
+from steadysun.sweep import parameter_grid, sweep_pvsystem
+from tests.test_pvmodel import TIMES, _clear_sky_ghi, _pvsystem
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for sweep_pvsystem"""
+
+    def setUp(self):
+        """Build a forecast of a clear summer day and a base PV system."""
+        self.forecast_df = pd.DataFrame(
+            {GHI_FIELD: _clear_sky_ghi(), TEMPERATURE_FIELD: 25.0}, index=TIMES.strftime("%Y-%m-%dT%H:%M:%SZ")
+        )
+        self.pvsystem = _pvsystem(0)
+
+    def test_parameter_grid(self):
+        """Test the combinations of parameter values."""
+        grid = parameter_grid(inclination=[10, 20, 30], racking=["open_rack", "close_mount"])
+        self.assertEqual(grid.shape, (6, 2))
+        self.assertEqual(grid.iloc[1].tolist(), [10, "close_mount"])
+
+    def test_sweep(self):
+        """Test that each variant matches the simulation of the equivalent PV system."""
+        grid = {"inclination": [0, 30, 60], "pvmodules_pdc0": [1000, 2000], "soiling": [0, 5]}
+        results_df = sweep_pvsystem(self.pvsystem, self.forecast_df, grid, chunk_size=5, max_workers=1)
+        self.assertEqual(len(results_df), 12)
+        self.assertEqual(list(results_df.columns), list(grid) + ["energy", "peak_power", "specific_yield"])
+
+        variant = results_df.iloc[5]
+        pvsystem = self.pvsystem.model_copy(deep=True)
+        pvsystem.expert_params.arrays[0].inclination = 30
+        expected = simulate_power(pvsystem, self.forecast_df)
+        self.assertEqual((variant["inclination"], variant["pvmodules_pdc0"], variant["soiling"]), (30, 1000, 5))
+        self.assertLess(variant["energy"], expected.sum() / 4)
+        np.testing.assert_allclose(results_df.iloc[4]["energy"], expected.sum() / 4)
+        np.testing.assert_allclose(results_df.iloc[4]["peak_power"], expected.max())
+        np.testing.assert_allclose(results_df.iloc[4]["specific_yield"], expected.sum() / 4 / 1000)
+        # The inverter (1 kW) clips the 2 kW variants
+        self.assertTrue((results_df[results_df["pvmodules_pdc0"] == 2000]["peak_power"] <= 960 + 1e-9).all())
+
+    def test_process_pool(self):
+        """Test that the chunks evaluated in worker processes give the same results."""
+        grid = parameter_grid(orientation=[90, 180, 270], inverter_pdc0=[500, 1000], pv_type=["fixed", "single_axis"])
+        in_process_df = sweep_pvsystem(self.pvsystem, self.forecast_df, grid, chunk_size=4, max_workers=1)
+        pool_df = sweep_pvsystem(self.pvsystem, self.forecast_df, grid, chunk_size=4, max_workers=2)
+        pd.testing.assert_frame_equal(in_process_df, pool_df)
+        south_df = in_process_df[(in_process_df["orientation"] == 180) & (in_process_df["inverter_pdc0"] == 1000)]
+        self.assertGreater(south_df["energy"].iloc[1], south_df["energy"].iloc[0])  # single axis > fixed
+
+    def test_empty_grid(self):
+        """Test that an empty grid gives an empty result."""
+        results_df = sweep_pvsystem(self.pvsystem, self.forecast_df, {"inclination": [], "soiling": [0, 5]})
+        self.assertEqual(len(results_df), 0)
+        self.assertEqual(list(results_df.columns), ["inclination", "soiling", "energy", "peak_power", "specific_yield"])
+
+    def test_gcr_with_backtracking(self):
+        """Test that the ground coverage ratio only has an effect with backtracking."""
+        pvsystem = _pvsystem(0, pv_type=2, orientation=0)
+        grid = parameter_grid(backtrack=[False, True], gcr=[0.2, 0.6])
+        energy = sweep_pvsystem(pvsystem, self.forecast_df, grid, max_workers=1)["energy"].to_numpy()
+        self.assertAlmostEqual(energy[0], energy[1])
+        self.assertNotAlmostEqual(energy[2], energy[3])
+
+    def test_errors(self):
+        """Test the unsupported parameters and missing fields."""
+        with self.assertRaises(ValueError):
+            sweep_pvsystem(self.pvsystem, self.forecast_df, {"color": ["red"]})
+        with self.assertRaises(KeyError):
+            sweep_pvsystem(self.pvsystem, self.forecast_df[[GHI_FIELD]], {"inclination": [10]})
@@ -0,0 +1,109 @@
+"""Tests validation.py"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from requests.exceptions import HTTPError
+
+from steadysun.models.pvsystem import ModuleMaterial
+from steadysun.pvsystem import PVSystem
+from steadysun.steadysun_api import SteadysunAPI
+from steadysun.validation import provision_pvsystems, validate_pvsystems
+from tests.test_pvsystem import _steadyweb_config
+
+CONFIGS = pd.DataFrame(
+    {
+        "name": ["ok", "", "bad_location", "ok_too", None],
+        "longitude": [9.4, 9.4, 200, "2.35", 1],
+        "latitude": [42.1, 42.1, 42.1, 48.85, 1],
+        "pdc0": [1000, 1000, 1000, 1000, -5],
+        "orientation": [180, 180, 180, 180, 180],
+        "inclination": [30, 30, 30, 30, np.nan],
+        "module_material": [1, "cigs", 1, "monosi", "wood"],
+    },
+    index=["a", "b", "c", "d", "e"],
+)
+
+
+class TestValidatePVSystems(unittest.TestCase):
+    """Tests for validate_pvsystems"""
+
+    def test_missing_columns(self):
+        """Test that required columns must be present."""
+        with self.assertRaises(ValueError):
+            validate_pvsystems(CONFIGS.drop(columns="pdc0"))
+
+    def test_report(self):
+        """Test the per-row error report."""
+        report = validate_pvsystems(CONFIGS)
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.valid.tolist(), [True, False, False, True, False])
+        self.assertEqual(report.valid_rows.index.tolist(), ["a", "d"])
+        self.assertEqual(report.valid_rows["longitude"].tolist(), [9.4, 2.35])
+        self.assertEqual(report.data["module_material"].tolist()[:4], [1, ModuleMaterial.cigs.value, 1, 1])
+
+        errors = report.errors_by_row()
+        self.assertEqual(errors.index.tolist(), ["b", "e", "c"])
+        self.assertEqual(errors["b"], "name: must be a non-empty string")
+        self.assertEqual(errors["c"], "longitude: must be a finite number >= -180 and <= 180")
+        self.assertEqual(
+            sorted(report.errors[report.errors["row"] == "e"]["field"]),
+            ["inclination", "module_material", "name", "pdc0"],
+        )
+
+    def test_duplicated_index(self):
+        """Test that the index labels must be unique."""
+        with self.assertRaisesRegex(ValueError, "unique"):
+            validate_pvsystems(CONFIGS.loc[["a", "d", "a"]])
+
+    def test_valid(self):
+        """Test a fully valid DataFrame."""
+        report = validate_pvsystems(CONFIGS.loc[["a", "d"]])
+        self.assertTrue(report.is_valid)
+        self.assertEqual(len(report.errors), 0)
+        self.assertEqual(len(report.errors_by_row()), 0)
+
+
+class TestProvisionPVSystems(unittest.TestCase):
+    """Tests for provision_pvsystems (without calling the API)"""
+
+    def test_provision(self):
+        """Test that the valid rows are created, and the API errors reported."""
+        client = SteadysunAPI(token="a" * 40)
+
+        def post(endpoint, data):
+            if data["name"] == "ok_too":
+                raise HTTPError("400 BadRequestError")
+            return {**_steadyweb_config("00000000-0000-0000-0000-000000000001"), "name": data["name"]}
+
+        with mock.patch.object(client, "post", side_effect=post) as client_post:
+            created, errors = provision_pvsystems(CONFIGS, client=client)
+        self.assertEqual(client_post.call_count, 2)
+        self.assertEqual(list(created), ["a"])
+        self.assertIsInstance(created["a"], PVSystem)
+        self.assertEqual(created["a"].name, "ok")
+        data = client_post.call_args_list[0].kwargs["data"]
+        self.assertEqual(data["location"]["coordinates"], [9.4, 42.1])
+        self.assertEqual((data["pv_type"], "altitude" in data), (2, False))
+        self.assertEqual(data["arrays"][0]["module_material"], 1)
+        self.assertIsInstance(data["arrays"][0]["module_material"], int)
+        self.assertEqual(errors[errors["field"] == "api"]["row"].tolist(), ["d"])
+        self.assertEqual(sorted(errors["row"].unique()), ["b", "c", "d", "e"])
+
+    def test_provision_optional_columns(self):
+        """Test that the optional columns are applied to the created PV systems."""
+        client = SteadysunAPI(token="a" * 40)
+        configs = CONFIGS.loc[["a"]].assign(altitude=120, pv_type="fixed", racking=2, power_temp_coeff=-0.4)
+        with mock.patch.object(
+            client, "post", return_value=_steadyweb_config("00000000-0000-0000-0000-000000000001")
+        ) as client_post:
+            created, errors = provision_pvsystems(configs, client=client)
+        self.assertEqual((list(created), len(errors)), (["a"], 0))
+        data = client_post.call_args.kwargs["data"]
+        self.assertEqual((data["altitude"], data["pv_type"]), (120, 1))
+        self.assertEqual(
+            {key: data["arrays"][0][key] for key in ["racking", "power_temp_coeff", "module_material"]},
+            {"racking": 2, "power_temp_coeff": -0.4, "module_material": 1},
+        )